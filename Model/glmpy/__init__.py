@@ -1,7 +1,11 @@
-from . import _version
+def __getattr__(name):
+    # Resolve the version on first access rather than at import. In a source
+    # checkout versioneer runs `git describe` in a subprocess, which every
+    # MultiSim worker and pipeline subprocess would otherwise pay for.
+    if name == "__version__":
+        from . import _version
 
-__version__ = _version.get_versions()["version"]
-
-from . import _version
-
-__version__ = _version.get_versions()["version"]
+        version = _version.get_versions()["version"]
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
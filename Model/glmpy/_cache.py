@@ -0,0 +1,14 @@
+import os
+
+
+def cache_dir(*parts: str) -> str:
+    """Path of glmpy's on-disk cache, or of a subdirectory of it.
+
+    The `GLMPY_CACHE_DIR` environment variable sets the root. Default is
+    `~/.cache/glmpy`. The directory is not created.
+    """
+    root = os.environ.get(
+        "GLMPY_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "glmpy"),
+    )
+    return os.path.join(root, *parts)
@@ -0,0 +1,47 @@
+import importlib
+
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the module on first attribute access.
+
+    Used for heavy optional dependencies (e.g., `netCDF4`, `matplotlib`,
+    `f90nml`) so that importing glmpy, including in every `MultiSim` worker,
+    does not pay for them until they are used.
+
+    Attributes
+    ----------
+    name : str
+        Fully qualified name of the module to import.
+
+    Examples
+    --------
+    >>> from glmpy._lazy import LazyModule
+    >>> netCDF4 = LazyModule("netCDF4")
+    >>> nc = netCDF4.Dataset("output.nc", "r")
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name: str):
+        if name.startswith("__") and self.__dict__["_module"] is None:
+            # Introspection (repr, pickle, doctest) should not trigger import
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "lazy"
+        return f"<LazyModule {self.__name__!r} ({state})>"
+
+    def __dir__(self):
+        return dir(self._load())
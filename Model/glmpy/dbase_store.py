@@ -0,0 +1,135 @@
+import os
+import shutil
+import hashlib
+
+from typing import Any, Dict, Tuple, Union
+
+from glmpy import _cache
+
+# Stored path of each source file, keyed by store root, source path and
+# stored name, with the (mtime_ns, size) stamp it was hashed at
+_file_index: Dict[Tuple[str, str, str], Tuple[Tuple[int, int], str]] = {}
+
+
+class DBaseStore:
+    """Content-addressed store of AED database files.
+
+    Each distinct database file is written once, to `<root>/<sha256>/<name>`,
+    and hard-linked into simulation directories. Simulations that share a
+    database therefore cost one directory entry each instead of a copy.
+    Databases held in memory as `DBaseTable`s are rendered, hashed and stored
+    the same way, so members of a sweep that perturb them only write the
+    distinct variants.
+
+    Files linked into a simulation directory share their content with the
+    store and must not be edited in place.
+
+    Attributes
+    ----------
+    root : str
+        Directory of the store. Default is None, which uses `dbase` in
+        glmpy's cache directory (see `glmpy._cache.cache_dir`). This is the
+        same layout that `.glmpy` files extract their databases to.
+    """
+
+    def __init__(self, root: Union[str, None] = None):
+        if root is None:
+            root = _cache.cache_dir("dbase")
+        self.root = os.path.abspath(root)
+
+    def add_bytes(self, name: str, data: bytes) -> str:
+        """Store file content and return its path in the store."""
+        digest = hashlib.sha256(data).hexdigest()
+        digest_dir = os.path.join(self.root, digest)
+        stored_path = os.path.join(digest_dir, name)
+        if not os.path.isfile(stored_path):
+            os.makedirs(digest_dir, exist_ok=True)
+            tmp_path = f"{stored_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, stored_path)
+        return stored_path
+
+    def add_file(self, src_path: str, name: Union[str, None] = None) -> str:
+        """Store a database file and return its path in the store.
+
+        A file is only read and hashed again once its modification time or
+        size changes.
+        """
+        if name is None:
+            name = os.path.basename(src_path)
+        src_path = os.path.abspath(src_path)
+        stat = os.stat(src_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (self.root, src_path, name)
+        entry = _file_index.get(key)
+        if entry is not None and entry[0] == stamp:
+            if os.path.isfile(entry[1]):
+                return entry[1]
+        with open(src_path, "rb") as file:
+            stored_path = self.add_bytes(name, file.read())
+        _file_index[key] = (stamp, stored_path)
+        return stored_path
+
+    def add_table(self, table: Any, name: str) -> str:
+        """Render a `DBaseTable` and return its path in the store.
+
+        The file is written as `.nml` text if `name` ends with `.nml`, and
+        as `.csv` text otherwise.
+        """
+        if name.lower().endswith(".nml"):
+            text = table.to_nml_text()
+        else:
+            text = table.to_csv_text()
+        return self.add_bytes(name, text.encode())
+
+    def add(self, dbase: Any, name: Union[str, None] = None) -> str:
+        """Store a database file path or a `DBaseTable`."""
+        if isinstance(dbase, (str, os.PathLike)):
+            return self.add_file(os.fspath(dbase), name)
+        if name is None:
+            raise ValueError(
+                "A file name is required to store a database table."
+            )
+        return self.add_table(dbase, name)
+
+    @staticmethod
+    def link(stored_path: str, dest_path: str):
+        """Hard-link a stored file to `dest_path`.
+
+        Falls back to copying where hard links are not supported, e.g.,
+        across file systems.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(stored_path, dest_path)
+        except OSError:
+            shutil.copyfile(stored_path, dest_path)
+
+    def materialise(
+        self, dbase: Any, dest_path: str, name: Union[str, None] = None
+    ) -> str:
+        """Store a database and link it to `dest_path`.
+
+        Parameters
+        ----------
+        dbase : Union[str, DBaseTable]
+            Path of the database file or the database table.
+        dest_path : str
+            Path of the database in the simulation directory.
+        name : Union[str, None]
+            File name in the store. Default is None, which uses the
+            basename of `dest_path`.
+
+        Returns
+        -------
+        str
+            Path of the database in the store.
+        """
+        if name is None:
+            name = os.path.basename(dest_path)
+        stored_path = self.add(dbase, name)
+        self.link(stored_path, dest_path)
+        return stored_path
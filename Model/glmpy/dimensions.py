@@ -2,7 +2,35 @@ import math
 import warnings
 import numpy as np
 
-from typing import Union
+from typing import List, Tuple, Union
+from glmpy.nml.glm_nml import MorphometryBlock
+
+# A dimension of one water body, or an array with one value per water body
+_Dims = Union[float, int, np.ndarray]
+
+
+def _depths(height: _Dims, num_vals: int) -> np.ndarray:
+    """`num_vals` depths from the base (0) to `height`, along the last axis."""
+    return np.linspace(
+        0, np.asarray(height, dtype=np.float64), num_vals, axis=-1
+    )
+
+
+def _per_row(*dims: _Dims) -> List[np.ndarray]:
+    """Add an axis to broadcast dimensions against `_depths()`."""
+    return [np.asarray(dim)[..., np.newaxis] for dim in dims]
+
+
+def _heights(
+    surface_elevation: _Dims, height: _Dims, num_vals: int
+) -> np.ndarray:
+    """`num_vals` elevations from the base to `surface_elevation`."""
+    heights = np.linspace(
+        0, -np.asarray(height, dtype=np.float64), num_vals, axis=-1
+    )[..., ::-1]
+    (surface_elevation,) = _per_row(surface_elevation)
+    return heights + surface_elevation
+
 
 class InvertedTruncatedPyramid:
     """
@@ -135,66 +163,63 @@ class InvertedTruncatedPyramid:
         self.base_width = base_width
         self.surface_elevation = surface_elevation
 
+    @staticmethod
     def _calc_volumes(
-        self,
-        height: Union[float, int],
-        base_length: Union[float, int],
-        base_width: Union[float, int],
-        side_slope: Union[float, int],
+        height: _Dims,
+        base_length: _Dims,
+        base_width: _Dims,
+        side_slope: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate volumes.
 
-        Private method for calculating volumes.
+        Private method for calculating volumes. Arrays of dimensions give
+        one row of volumes per water body.
         """
-        volumes = []
-        for i in np.linspace(start=0, stop=height, num=num_vals):
-            volume = (
-                (base_length * base_width * i) + 
-                ((i**2) * (base_length / side_slope)) +
-                ((i**2) * (base_width / side_slope)) +
-                ((4 * (i**3)) / (3 * (side_slope**2)))
-            )
-            volumes.append(volume)
-        return volumes
+        i = _depths(height, num_vals)
+        base_length, base_width, side_slope = _per_row(
+            base_length, base_width, side_slope
+        )
+        return (
+            (base_length * base_width * i) +
+            ((i**2) * (base_length / side_slope)) +
+            ((i**2) * (base_width / side_slope)) +
+            ((4 * (i**3)) / (3 * (side_slope**2)))
+        )
 
+    @staticmethod
     def _calc_areas(
-        self,
-        height: Union[float, int],
-        base_length: Union[float, int],
-        base_width: Union[float, int],
-        side_slope: Union[float, int],
+        height: _Dims,
+        base_length: _Dims,
+        base_width: _Dims,
+        side_slope: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate areas.
 
-        Private method for calculating areas.
+        Private method for calculating areas. Arrays of dimensions give one
+        row of areas per water body.
         """
-        areas = []
-        for i in np.linspace(start=0, stop=height, num=num_vals):
-            area = (
-                (base_length + ((2 * i) / side_slope)) *
-                (base_width + ((2 * i) / side_slope))
-            )
+        i = _depths(height, num_vals)
+        base_length, base_width, side_slope = _per_row(
+            base_length, base_width, side_slope
+        )
+        return (
+            (base_length + ((2 * i) / side_slope)) *
+            (base_width + ((2 * i) / side_slope))
+        )
 
-            areas.append(area)
-        return areas
-    
+    @staticmethod
     def _calc_heights(
-        self,
-        surface_elevation: Union[float, int], 
-        height: Union[float, int], 
+        surface_elevation: _Dims,
+        height: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate heights.
 
         Private method for calculating heights.
         """
-        heights = np.linspace(0, -height, num_vals)
-        heights = heights.tolist()
-        heights = heights[::-1]
-        heights = [height + surface_elevation for height in heights]
-        return heights
+        return _heights(surface_elevation, height, num_vals)
     
     def get_volumes(self) -> list[float]:
         """Calculates volumes.
@@ -248,7 +273,7 @@ class InvertedTruncatedPyramid:
             base_width=self.base_width,
             side_slope=self.side_slope,
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.volumes
     
     def get_surface_areas(self) -> list[float]:
@@ -301,7 +326,7 @@ class InvertedTruncatedPyramid:
             base_width=self.base_width,
             side_slope=self.side_slope,
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.areas
     
     def get_heights(self) -> list[float]:
@@ -338,7 +363,7 @@ class InvertedTruncatedPyramid:
             surface_elevation=self.surface_elevation,
             height=self.height, 
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.heights
         
 
@@ -395,59 +420,51 @@ class InvertedTruncatedSquarePyramid:
         self.base_length = base_length
         self.surface_elevation = surface_elevation
 
+    @staticmethod
     def _calc_volumes(
-        self,
-        height: Union[float, int],
-        base_length: Union[float, int],
-        side_slope: Union[float, int],
+        height: _Dims,
+        base_length: _Dims,
+        side_slope: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate volumes.
 
         Private method for calculating volumes.
         """
-        volumes = []
-        for i in np.linspace(start=0, stop=height, num=num_vals):
-            volume = (
-                ((base_length**2) * i) + 
-                (2 * (i**2) * (base_length/side_slope)) +
-                ((4 * (i**3)) / (3 * (side_slope**2)))
-            )
-            volumes.append(volume)
-        return volumes
-    
+        i = _depths(height, num_vals)
+        base_length, side_slope = _per_row(base_length, side_slope)
+        return (
+            ((base_length**2) * i) +
+            (2 * (i**2) * (base_length/side_slope)) +
+            ((4 * (i**3)) / (3 * (side_slope**2)))
+        )
+
+    @staticmethod
     def _calc_areas(
-        self,
-        height: Union[float, int],
-        base_length: Union[float, int],
-        side_slope: Union[float, int],
+        height: _Dims,
+        base_length: _Dims,
+        side_slope: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate areas.
 
         Private method for calculating areas.
         """
-        areas = []
-        for i in np.linspace(start=0, stop=height, num=num_vals):
-            area = (base_length + ((2*i)/side_slope))**2
-            areas.append(area)
-        return areas
-    
+        i = _depths(height, num_vals)
+        base_length, side_slope = _per_row(base_length, side_slope)
+        return (base_length + ((2*i)/side_slope))**2
+
+    @staticmethod
     def _calc_heights(
-        self,
-        surface_elevation: Union[float, int], 
-        height: Union[float, int], 
+        surface_elevation: _Dims,
+        height: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate heights.
 
         Private method for calculating heights.
         """
-        heights = np.linspace(0, -height, num_vals)
-        heights = heights.tolist()
-        heights = heights[::-1]
-        heights = [height + surface_elevation for height in heights]
-        return heights
+        return _heights(surface_elevation, height, num_vals)
             
     def get_volumes(self) -> list[float]:
         self.volumes = self._calc_volumes(
@@ -455,7 +472,7 @@ class InvertedTruncatedSquarePyramid:
             base_length=self.base_length,
             side_slope=self.side_slope,
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.volumes
 
     def get_surface_areas(self) -> list[float]:
@@ -464,7 +481,7 @@ class InvertedTruncatedSquarePyramid:
             base_length=self.base_length,
             side_slope=self.side_slope,
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.areas
 
     def get_heights(self) -> list[float]:
@@ -472,7 +489,7 @@ class InvertedTruncatedSquarePyramid:
             surface_elevation=self.surface_elevation,
             height=self.height, 
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.heights
 
 
@@ -582,61 +599,55 @@ class InvertedTruncatedCone:
         self.num_vals = num_vals
         self.surface_elevation = surface_elevation
     
+    @staticmethod
     def _calc_volumes(
-        self,
-        height: Union[float, int],
-        base_radius: Union[float, int],
-        side_slope: Union[float, int],
+        height: _Dims,
+        base_radius: _Dims,
+        side_slope: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate volumes.
 
-        Private method for calculating volumes.
+        Private method for calculating volumes. Arrays of dimensions give
+        one row of volumes per water body.
         """
-        volumes = []
-        for i in np.linspace(start=0, stop=height, num=num_vals):
-            volume = (
-                (1 / 3) * math.pi * i * (
-                    (3 * (base_radius ** 2)) + 
-                    ((3 * base_radius * i) / side_slope) +
-                    ((i ** 2) / (side_slope ** 2))
-                )
+        i = _depths(height, num_vals)
+        base_radius, side_slope = _per_row(base_radius, side_slope)
+        return (
+            (1 / 3) * math.pi * i * (
+                (3 * (base_radius ** 2)) +
+                ((3 * base_radius * i) / side_slope) +
+                ((i ** 2) / (side_slope ** 2))
             )
-            volumes.append(volume)
-        return volumes
-    
+        )
+
+    @staticmethod
     def _calc_areas(
-        self,
-        height: Union[float, int],
-        base_radius: Union[float, int],
-        side_slope: Union[float, int],
+        height: _Dims,
+        base_radius: _Dims,
+        side_slope: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate areas.
 
-        Private method for calculating areas.
+        Private method for calculating areas. Arrays of dimensions give one
+        row of areas per water body.
         """
-        areas = []
-        for i in np.linspace(start=0, stop=height, num=num_vals):
-            area = math.pi * ((base_radius + (i /  side_slope)) ** 2)
-            areas.append(area)
-        return areas
-    
+        i = _depths(height, num_vals)
+        base_radius, side_slope = _per_row(base_radius, side_slope)
+        return math.pi * ((base_radius + (i / side_slope)) ** 2)
+
+    @staticmethod
     def _calc_heights(
-        self,
-        surface_elevation: Union[float, int], 
-        height: Union[float, int], 
+        surface_elevation: _Dims,
+        height: _Dims,
         num_vals: int
-    ) -> list[float]:
+    ) -> np.ndarray:
         """Calculate heights.
 
         Private method for calculating heights.
         """
-        heights = np.linspace(0, -height, num_vals)
-        heights = heights.tolist()
-        heights = heights[::-1]
-        heights = [height + surface_elevation for height in heights]
-        return heights   
+        return _heights(surface_elevation, height, num_vals)
     
     def get_volumes(self) -> list[float]:
         """Calculates volumes
@@ -688,7 +699,7 @@ class InvertedTruncatedCone:
             base_radius=self.base_radius,
             side_slope=self.side_slope,
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.volumes
     
     def get_surface_areas(self) -> list[float]:
@@ -741,7 +752,7 @@ class InvertedTruncatedCone:
             base_radius=self.base_radius,
             side_slope=self.side_slope,
             num_vals=self.num_vals
-        )
+        ).tolist()
         return self.areas
     
     def get_heights(self) -> list[float]:
@@ -777,5 +788,229 @@ class InvertedTruncatedCone:
             surface_elevation=self.surface_elevation,
             height=self.height, 
             num_vals=self.num_vals
+        ).tolist()
+        return self.heights        
+
+def _batch_dims(**dims: _Dims) -> List[np.ndarray]:
+    """Broadcast dimensions to 1-D arrays with one value per water body."""
+    try:
+        arrays = np.broadcast_arrays(*(
+            np.atleast_1d(np.asarray(value, dtype=np.float64))
+            for value in dims.values()
+        ))
+    except ValueError:
+        shapes = {name: np.shape(value) for name, value in dims.items()}
+        raise ValueError(f"Dimensions must broadcast together. Got {shapes}.")
+    if arrays[0].ndim != 1:
+        raise ValueError(
+            "Dimensions must be scalars or 1-D arrays with one value per "
+            f"water body. Got shape {arrays[0].shape}."
+        )
+    for name, values in zip(dims, arrays):
+        if name == "surface_elevation":
+            continue
+        invalid = np.flatnonzero(values < 0)
+        if len(invalid):
+            raise ValueError(
+                f"{name} must be a positive value. Got {values[invalid[0]]} "
+                f"for water body {invalid[0]}."
+            )
+    return arrays
+
+
+def _check_batch_base(name: str, base: np.ndarray, formula: str):
+    invalid = np.flatnonzero(base <= 0)
+    if len(invalid):
+        raise ValueError(
+            f"The calculated {name} of water body {invalid[0]} is "
+            f"{base[invalid[0]]}. {name} is calculated by ({formula}). "
+            f"Adjust its dimensions to calculate a positive {name} value."
+        )
+
+
+def pyramid_morphometry(
+    height: _Dims,
+    surface_length: _Dims,
+    surface_width: _Dims,
+    num_vals: int,
+    side_slope: _Dims = 1/3,
+    surface_elevation: _Dims = 0.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculates the morphometry of many inverted truncated pyramids.
+
+    A batched `InvertedTruncatedPyramid`. Each dimension is a scalar or a
+    1-D array with one value per water body, broadcast together, so the
+    height-area-volume tables of a morphometry sweep are calculated at
+    once. Row `i` of each table equals `get_heights()`, 
+    `get_surface_areas()` or `get_volumes()` of an 
+    `InvertedTruncatedPyramid` with the dimensions of water body `i`.
+
+    Parameters
+    ----------
+    height : Union[float, np.ndarray]
+        Height of each water body from the base to surface in metres.
+    surface_length : Union[float, np.ndarray]
+        Surface length of each water body in metres.
+    surface_width : Union[float, np.ndarray]
+        Surface width of each water body in metres.
+    num_vals : int
+        Number of values in each table (see `bsn_vals` in
+        `MorphometryBlock`).
+    side_slope : Union[float, np.ndarray]
+        Side slope of each water body (metre/metre). Default is 1/3.
+    surface_elevation : Union[float, np.ndarray]
+        Elevation at the surface of each water body. Default is 0.0.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Heights (m), surface areas (m^2) and volumes (m^3), each an array
+        of shape (water bodies, `num_vals`) from base to surface.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from glmpy import dimensions
+    >>> heights, areas, volumes = dimensions.pyramid_morphometry(
+    ...     height=6,
+    ...     surface_length=40,
+    ...     surface_width=40,
+    ...     num_vals=7,
+    ...     side_slope=np.linspace(0.35, 1.0, 1000)
+    ... )
+    >>> areas.shape
+    (1000, 7)
+    """
+    if num_vals < 2:
+        raise ValueError(
+            "num_vals must be greater than or equal 2."
+        )
+    (
+        height, surface_length, surface_width, side_slope, surface_elevation
+    ) = _batch_dims(
+        height=height,
+        surface_length=surface_length,
+        surface_width=surface_width,
+        side_slope=side_slope,
+        surface_elevation=surface_elevation,
+    )
+    base_length = surface_length - (height / side_slope) * 2
+    base_width = surface_width - (height / side_slope) * 2
+    _check_batch_base(
+        "base_length", base_length, "surface_length-(height/side_slope)*2"
+    )
+    _check_batch_base(
+        "base_width", base_width, "surface_width-(height/side_slope)*2"
+    )
+    heights = _heights(surface_elevation, height, num_vals)
+    areas = InvertedTruncatedPyramid._calc_areas(
+        height, base_length, base_width, side_slope, num_vals
+    )
+    volumes = InvertedTruncatedPyramid._calc_volumes(
+        height, base_length, base_width, side_slope, num_vals
+    )
+    return heights, areas, volumes
+
+
+def cone_morphometry(
+    height: _Dims,
+    surface_radius: _Dims,
+    num_vals: int,
+    side_slope: _Dims = 1/3,
+    surface_elevation: _Dims = 0.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculates the morphometry of many inverted truncated cones.
+
+    A batched `InvertedTruncatedCone`. See `pyramid_morphometry()`.
+
+    Parameters
+    ----------
+    height : Union[float, np.ndarray]
+        Height of each water body from the base to surface in metres.
+    surface_radius : Union[float, np.ndarray]
+        Surface radius of each water body in metres.
+    num_vals : int
+        Number of values in each table (see `bsn_vals` in
+        `MorphometryBlock`).
+    side_slope : Union[float, np.ndarray]
+        Side slope of each water body (metre/metre). Default is 1/3.
+    surface_elevation : Union[float, np.ndarray]
+        Elevation at the surface of each water body. Default is 0.0.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Heights (m), surface areas (m^2) and volumes (m^3), each an array
+        of shape (water bodies, `num_vals`) from base to surface.
+    """
+    if num_vals < 2:
+        raise ValueError(
+            "num_vals must be greater than or equal 2."
+        )
+    height, surface_radius, side_slope, surface_elevation = _batch_dims(
+        height=height,
+        surface_radius=surface_radius,
+        side_slope=side_slope,
+        surface_elevation=surface_elevation,
+    )
+    base_radius = surface_radius - (height / side_slope)
+    _check_batch_base(
+        "base_radius", base_radius, "surface_radius - (height / side_slope)"
+    )
+    heights = _heights(surface_elevation, height, num_vals)
+    areas = InvertedTruncatedCone._calc_areas(
+        height, base_radius, side_slope, num_vals
+    )
+    volumes = InvertedTruncatedCone._calc_volumes(
+        height, base_radius, side_slope, num_vals
+    )
+    return heights, areas, volumes
+
+
+def morphometry_blocks(
+    heights: np.ndarray, areas: np.ndarray, **kwargs
+) -> List[MorphometryBlock]:
+    """Creates a `MorphometryBlock` for each row of a morphometry batch.
+
+    Parameters
+    ----------
+    heights : np.ndarray
+        Heights, of shape (water bodies, `bsn_vals`), e.g., from
+        `pyramid_morphometry()`.
+    areas : np.ndarray
+        Surface areas, of the same shape as `heights`.
+    **kwargs
+        Other parameters of every block, e.g., `lake_name` or
+        `crest_elev`.
+
+    Returns
+    -------
+    List[MorphometryBlock]
+        One block per water body, with `H`, `A` and `bsn_vals` set.
+
+    Examples
+    --------
+    >>> from glmpy import dimensions
+    >>> heights, areas, _ = dimensions.pyramid_morphometry(
+    ...     height=6,
+    ...     surface_length=40,
+    ...     surface_width=40,
+    ...     num_vals=7,
+    ...     side_slope=[1/3, 1/2],
+    ...     surface_elevation=6
+    ... )
+    >>> blocks = dimensions.morphometry_blocks(heights, areas)
+    >>> blocks[0].validate()
+    """
+    heights = np.asarray(heights, dtype=np.float64)
+    areas = np.asarray(areas, dtype=np.float64)
+    if heights.ndim != 2 or heights.shape != areas.shape:
+        raise ValueError(
+            "heights and areas must be 2-D arrays of the same shape. Got "
+            f"{heights.shape} and {areas.shape}."
         )
-        return self.heights        
\ No newline at end of file
+    bsn_vals = heights.shape[1]
+    return [
+        MorphometryBlock(H=H, A=A, bsn_vals=bsn_vals, **kwargs)
+        for H, A in zip(heights.tolist(), areas.tolist())
+    ]
@@ -0,0 +1,595 @@
+import itertools
+import numpy as np
+
+from abc import ABC, abstractmethod
+from typing import Union, List, Tuple
+
+
+def _as_2d(x, num_inputs: Union[int, None] = None) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        # A 1-D array is a column of points, which is ambiguous with a single
+        # point unless there is only one input
+        if num_inputs is not None and num_inputs > 1:
+            raise ValueError(
+                f"Expected a 2-D array of points with {num_inputs} columns. "
+                f"Got a 1-D array of {x.shape[0]} values. Use "
+                "x.reshape(1, -1) for a single point."
+            )
+        x = x[:, np.newaxis]
+    if x.ndim != 2:
+        raise ValueError(
+            f"Expected a 1-D or 2-D array of inputs. Got {x.ndim} dimensions."
+        )
+    if num_inputs is not None and x.shape[1] != num_inputs:
+        raise ValueError(
+            f"Expected points with {num_inputs} inputs. Got {x.shape[1]}."
+        )
+    return x
+
+
+class _Emulator(ABC):
+    """Base class for emulators of scalar GLM responses.
+
+    Handles the scaling of parameter vectors onto the unit hypercube and the
+    standardisation of responses that is common to all emulators.
+    """
+
+    def __init__(
+        self,
+        bounds: Union[np.ndarray, List[Tuple[float, float]], None] = None,
+    ):
+        self.bounds = None if bounds is None else _as_2d(bounds)
+        self._x = None
+        self._y = None
+
+    def _check_fitted(self):
+        if self._x is None:
+            raise AttributeError(
+                "The emulator has not been fitted. Call fit() first."
+            )
+
+    def _set_scaling(self, x: np.ndarray, y: np.ndarray):
+        if self.bounds is None:
+            lower = x.min(axis=0)
+            upper = x.max(axis=0)
+        else:
+            if self.bounds.shape != (x.shape[1], 2):
+                raise ValueError(
+                    f"bounds must have shape ({x.shape[1]}, 2). Got "
+                    f"{self.bounds.shape}."
+                )
+            lower = self.bounds[:, 0]
+            upper = self.bounds[:, 1]
+        span = upper - lower
+        span[span == 0.0] = 1.0
+        self._x_lower = lower
+        self._x_span = span
+        self._y_mean = y.mean()
+        y_std = y.std()
+        self._y_std = y_std if y_std > 0.0 else 1.0
+
+    def _scale_x(self, x: np.ndarray) -> np.ndarray:
+        return (x - self._x_lower) / self._x_span
+
+    def _validate_xy(self, x, y) -> Tuple[np.ndarray, np.ndarray]:
+        x = _as_2d(x)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if x.shape[0] != y.shape[0]:
+            raise ValueError(
+                f"x has {x.shape[0]} rows but y has {y.shape[0]} values."
+            )
+        finite = np.isfinite(y) & np.all(np.isfinite(x), axis=1)
+        if not np.all(finite):
+            x = x[finite]
+            y = y[finite]
+        if x.shape[0] < 2:
+            raise ValueError(
+                "At least two finite training points are required to fit an "
+                "emulator."
+            )
+        return x, y
+
+    @property
+    def num_inputs(self) -> int:
+        self._check_fitted()
+        return self._x.shape[1]
+
+    @abstractmethod
+    def predict(self, x, return_std: bool = False):
+        """Predict the response at parameter vectors `x`."""
+
+
+class GaussianProcessEmulator(_Emulator):
+    """Gaussian process emulator of a scalar GLM response.
+
+    Fits a Gaussian process with an anisotropic squared exponential kernel
+    to a set of GLM parameter vectors and a scalar metric calculated from the
+    outputs of each run (e.g., the RMSE of lake level or the mean summer
+    surface temperature). Inputs are scaled to the unit hypercube and the
+    response is standardised before fitting. Kernel length scales are
+    selected by maximising the log marginal likelihood with a coordinate
+    search so that only NumPy is required.
+
+    Attributes
+    ----------
+    bounds : Union[np.ndarray, List[Tuple[float, float]], None]
+        Lower and upper bound of each input parameter with shape
+        `(num_inputs, 2)`. Used to scale the inputs. If None, the range of
+        the training data is used. Default is None.
+    length_scales : Union[np.ndarray, List[float], float, None]
+        Initial kernel length scales on the unit hypercube. Default is None
+        (0.3 for every input).
+    noise : float
+        Variance of the observation noise relative to the standardised
+        response. Acts as a nugget for numerical stability. Default is 1e-6.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from glmpy import emulator
+    >>> x = np.random.default_rng(42).uniform(0.0, 1.0, size=(50, 2))
+    >>> y = np.sin(6 * x[:, 0]) + x[:, 1] ** 2
+    >>> gp = emulator.GaussianProcessEmulator(bounds=[(0, 1), (0, 1)])
+    >>> gp = gp.fit(x, y)
+    >>> mean, std = gp.predict([[0.5, 0.5]], return_std=True)
+    """
+
+    def __init__(
+        self,
+        bounds: Union[np.ndarray, List[Tuple[float, float]], None] = None,
+        length_scales: Union[np.ndarray, List[float], float, None] = None,
+        noise: float = 1e-6,
+    ):
+        super().__init__(bounds=bounds)
+        if noise < 0.0:
+            raise ValueError(f"noise must not be negative. Got {noise}.")
+        self.length_scales = length_scales
+        self.noise = noise
+
+    def _kernel(
+        self, xa: np.ndarray, xb: np.ndarray, length_scales: np.ndarray
+    ) -> np.ndarray:
+        xa = xa / length_scales
+        xb = xb / length_scales
+        sq_dist = (
+            np.sum(xa**2, axis=1)[:, np.newaxis]
+            + np.sum(xb**2, axis=1)[np.newaxis, :]
+            - 2.0 * (xa @ xb.T)
+        )
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        return np.exp(-0.5 * sq_dist)
+
+    def _factorise(self, x_scaled, y_std, length_scales):
+        k = self._kernel(x_scaled, x_scaled, length_scales)
+        k[np.diag_indices_from(k)] += self.noise + 1e-10
+        chol = np.linalg.cholesky(k)
+        alpha = np.linalg.solve(
+            chol.T, np.linalg.solve(chol, y_std)
+        )
+        return chol, alpha
+
+    def _log_marginal_likelihood(self, x_scaled, y_std, length_scales):
+        try:
+            chol, alpha = self._factorise(x_scaled, y_std, length_scales)
+        except np.linalg.LinAlgError:
+            return -np.inf
+        return (
+            -0.5 * y_std @ alpha
+            - np.sum(np.log(np.diag(chol)))
+            - 0.5 * len(y_std) * np.log(2.0 * np.pi)
+        )
+
+    def _optimise_length_scales(
+        self, x_scaled, y_std, length_scales, num_sweeps: int = 3
+    ) -> np.ndarray:
+        multipliers = np.array([0.25, 0.5, 1.0, 2.0, 4.0])
+        best = self._log_marginal_likelihood(x_scaled, y_std, length_scales)
+        for _ in range(num_sweeps):
+            improved = False
+            for i in range(len(length_scales)):
+                for multiplier in multipliers:
+                    if multiplier == 1.0:
+                        continue
+                    trial = length_scales.copy()
+                    trial[i] = np.clip(trial[i] * multiplier, 1e-3, 1e3)
+                    lml = self._log_marginal_likelihood(
+                        x_scaled, y_std, trial
+                    )
+                    if lml > best:
+                        best = lml
+                        length_scales = trial
+                        improved = True
+            if not improved:
+                multipliers = np.sqrt(multipliers)
+        return length_scales
+
+    def fit(self, x, y, optimise: bool = True) -> "GaussianProcessEmulator":
+        """Fit the emulator to GLM parameter vectors and responses.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Parameter vectors with shape `(num_runs, num_inputs)`.
+        y : np.ndarray
+            Scalar response of each run with shape `(num_runs,)`. Runs with
+            non-finite responses (e.g., failed simulations) are dropped.
+        optimise : bool
+            Select the kernel length scales by maximising the log marginal
+            likelihood. Default is True.
+
+        Returns
+        -------
+        GaussianProcessEmulator
+            The fitted emulator.
+        """
+        x, y = self._validate_xy(x, y)
+        self._set_scaling(x, y)
+        x_scaled = self._scale_x(x)
+        y_std = (y - self._y_mean) / self._y_std
+        if self.length_scales is None:
+            length_scales = np.full(x.shape[1], 0.3)
+        else:
+            length_scales = np.broadcast_to(
+                np.asarray(self.length_scales, dtype=np.float64),
+                (x.shape[1],)
+            ).copy()
+        if optimise:
+            length_scales = self._optimise_length_scales(
+                x_scaled, y_std, length_scales
+            )
+        self._length_scales = length_scales
+        self._chol, self._alpha = self._factorise(
+            x_scaled, y_std, length_scales
+        )
+        self._x = x
+        self._y = y
+        self._x_scaled = x_scaled
+        return self
+
+    def predict(self, x, return_std: bool = False):
+        """Predict the response at new parameter vectors.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Parameter vectors with shape `(num_points, num_inputs)`.
+        return_std : bool
+            Also return the standard deviation of the prediction. Default is
+            False.
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+            The predicted mean and, if `return_std` is True, the predicted
+            standard deviation.
+        """
+        self._check_fitted()
+        x_scaled = self._scale_x(_as_2d(x, self.num_inputs))
+        k_star = self._kernel(x_scaled, self._x_scaled, self._length_scales)
+        mean = k_star @ self._alpha * self._y_std + self._y_mean
+        if not return_std:
+            return mean
+        v = np.linalg.solve(self._chol, k_star.T)
+        var = 1.0 + self.noise - np.sum(v**2, axis=0)
+        np.maximum(var, 0.0, out=var)
+        return mean, np.sqrt(var) * self._y_std
+
+    def get_length_scales(self) -> np.ndarray:
+        """Get the fitted kernel length scales on the unit hypercube."""
+        self._check_fitted()
+        return self._length_scales.copy()
+
+
+class PolynomialChaosEmulator(_Emulator):
+    """Polynomial chaos emulator of a scalar GLM response.
+
+    Fits a total-degree Legendre polynomial chaos expansion to GLM parameter
+    vectors and a scalar response by least squares. Inputs are assumed to be
+    uniformly distributed between `bounds`. First-order and total Sobol
+    sensitivity indices are available analytically from the expansion
+    coefficients.
+
+    Attributes
+    ----------
+    bounds : Union[np.ndarray, List[Tuple[float, float]]]
+        Lower and upper bound of each input parameter with shape
+        `(num_inputs, 2)`.
+    degree : int
+        Maximum total degree of the expansion. Default is 3.
+    ridge : float
+        Ridge penalty applied to the least squares fit. Default is 0.0.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from glmpy import emulator
+    >>> x = np.random.default_rng(42).uniform(0.0, 1.0, size=(100, 3))
+    >>> y = x[:, 0] + 2 * x[:, 1] ** 2
+    >>> pce = emulator.PolynomialChaosEmulator(
+    ...     bounds=[(0, 1), (0, 1), (0, 1)], degree=2
+    ... )
+    >>> pce = pce.fit(x, y)
+    >>> first_order, total = pce.sobol_indices()
+    """
+
+    def __init__(
+        self,
+        bounds: Union[np.ndarray, List[Tuple[float, float]]],
+        degree: int = 3,
+        ridge: float = 0.0,
+    ):
+        super().__init__(bounds=bounds)
+        if degree < 1:
+            raise ValueError(f"degree must be at least 1. Got {degree}.")
+        if ridge < 0.0:
+            raise ValueError(f"ridge must not be negative. Got {ridge}.")
+        self.degree = degree
+        self.ridge = ridge
+
+    def _multi_indices(self, num_inputs: int) -> np.ndarray:
+        indices = [
+            idx
+            for idx in itertools.product(
+                range(self.degree + 1), repeat=num_inputs
+            )
+            if sum(idx) <= self.degree
+        ]
+        indices.sort(key=lambda idx: (sum(idx), idx[::-1]))
+        return np.array(indices, dtype=np.int64)
+
+    def _design_matrix(self, x_scaled: np.ndarray) -> np.ndarray:
+        # Orthonormal Legendre polynomials on [-1, 1] for each input
+        z = 2.0 * x_scaled - 1.0
+        legendre = np.empty((self.degree + 1,) + z.shape)
+        legendre[0] = 1.0
+        legendre[1] = z
+        for n in range(1, self.degree):
+            legendre[n + 1] = (
+                (2 * n + 1) * z * legendre[n] - n * legendre[n - 1]
+            ) / (n + 1)
+        norms = np.sqrt(2 * np.arange(self.degree + 1) + 1)
+        legendre *= norms[:, np.newaxis, np.newaxis]
+        cols = np.arange(z.shape[1])
+        # Advanced indexing gives (num_terms, num_inputs, num_points)
+        return np.prod(legendre[self._indices, :, cols], axis=1).T
+
+    def fit(self, x, y) -> "PolynomialChaosEmulator":
+        """Fit the expansion to GLM parameter vectors and responses.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Parameter vectors with shape `(num_runs, num_inputs)`.
+        y : np.ndarray
+            Scalar response of each run with shape `(num_runs,)`.
+
+        Returns
+        -------
+        PolynomialChaosEmulator
+            The fitted emulator.
+        """
+        x, y = self._validate_xy(x, y)
+        self._set_scaling(x, y)
+        self._indices = self._multi_indices(x.shape[1])
+        if x.shape[0] < len(self._indices) and self.ridge == 0.0:
+            raise ValueError(
+                f"A degree {self.degree} expansion of {x.shape[1]} inputs "
+                f"has {len(self._indices)} terms but only {x.shape[0]} runs "
+                "were provided. Reduce the degree, add runs, or set ridge."
+            )
+        phi = self._design_matrix(self._scale_x(x))
+        y_std = (y - self._y_mean) / self._y_std
+        gram = phi.T @ phi
+        gram[np.diag_indices_from(gram)] += self.ridge
+        self._gram_inv = np.linalg.pinv(gram)
+        self._coefs = self._gram_inv @ phi.T @ y_std
+        dof = max(x.shape[0] - len(self._indices), 1)
+        self._resid_var = np.sum((phi @ self._coefs - y_std) ** 2) / dof
+        self._x = x
+        self._y = y
+        return self
+
+    def predict(self, x, return_std: bool = False):
+        """Predict the response at new parameter vectors.
+
+        The standard deviation is the least squares prediction uncertainty
+        of the expansion.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Parameter vectors with shape `(num_points, num_inputs)`.
+        return_std : bool
+            Also return the standard deviation of the prediction. Default is
+            False.
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+            The predicted mean and, if `return_std` is True, the predicted
+            standard deviation.
+        """
+        self._check_fitted()
+        phi = self._design_matrix(self._scale_x(_as_2d(x, self.num_inputs)))
+        mean = phi @ self._coefs * self._y_std + self._y_mean
+        if not return_std:
+            return mean
+        var = self._resid_var * np.einsum(
+            "ij,jk,ik->i", phi, self._gram_inv, phi
+        )
+        return mean, np.sqrt(np.maximum(var, 0.0)) * self._y_std
+
+    def sobol_indices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Analytical Sobol indices of the expansion.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            First-order and total Sobol indices of each input.
+        """
+        self._check_fitted()
+        var_terms = self._coefs[1:] ** 2
+        total_var = var_terms.sum()
+        indices = self._indices[1:]
+        if total_var == 0.0:
+            zeros = np.zeros(indices.shape[1])
+            return zeros, zeros.copy()
+        active = indices > 0
+        only = active & (active.sum(axis=1) == 1)[:, np.newaxis]
+        first_order = (var_terms[:, np.newaxis] * only).sum(axis=0)
+        total = (var_terms[:, np.newaxis] * active).sum(axis=0)
+        return first_order / total_var, total / total_var
+
+
+def sobol_indices(
+    emulator: _Emulator,
+    bounds: Union[np.ndarray, List[Tuple[float, float]]],
+    num_samples: int = 4096,
+    seed: Union[int, None] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Estimate Sobol sensitivity indices from an emulator.
+
+    Uses the Saltelli (2010) first-order and Jansen total-effect estimators
+    on `num_samples * (num_inputs + 2)` emulator evaluations. The emulator is
+    evaluated in bulk so no GLM runs are required.
+
+    Parameters
+    ----------
+    emulator : Union[GaussianProcessEmulator, PolynomialChaosEmulator]
+        A fitted emulator.
+    bounds : Union[np.ndarray, List[Tuple[float, float]]]
+        Lower and upper bound of each input parameter with shape
+        `(num_inputs, 2)`. Inputs are sampled uniformly within the bounds.
+    num_samples : int
+        Number of base samples. Default is 4096.
+    seed : Union[int, None]
+        Seed for the random number generator. Default is None.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        First-order and total Sobol indices of each input.
+    """
+    bounds = _as_2d(bounds)
+    num_inputs = bounds.shape[0]
+    rng = np.random.default_rng(seed)
+    lower = bounds[:, 0]
+    span = bounds[:, 1] - bounds[:, 0]
+    a = lower + rng.random((num_samples, num_inputs)) * span
+    b = lower + rng.random((num_samples, num_inputs)) * span
+    ab = np.repeat(a[np.newaxis], num_inputs, axis=0)
+    cols = np.arange(num_inputs)
+    ab[cols, :, cols] = b[:, cols].T
+    f_a = emulator.predict(a)
+    f_b = emulator.predict(b)
+    f_ab = emulator.predict(ab.reshape(-1, num_inputs)).reshape(
+        num_inputs, num_samples
+    )
+    var = np.var(np.concatenate([f_a, f_b]))
+    if var == 0.0:
+        zeros = np.zeros(num_inputs)
+        return zeros, zeros.copy()
+    first_order = np.mean(f_b * (f_ab - f_a), axis=1) / var
+    total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / var
+    return first_order, total
+
+
+def select_next_runs(
+    emulator: GaussianProcessEmulator,
+    candidates: np.ndarray,
+    num_runs: int = 1,
+) -> np.ndarray:
+    """Select the candidates where the emulator is least certain.
+
+    Active learning step for choosing the next GLM runs. Candidates are
+    picked greedily by predictive standard deviation. After each pick, the
+    emulator is conditioned on its own prediction at that point (the
+    "kriging believer" heuristic) so that a batch of runs is spread across
+    the uncertain regions rather than clustered at one.
+
+    Parameters
+    ----------
+    emulator : GaussianProcessEmulator
+        A fitted Gaussian process emulator.
+    candidates : np.ndarray
+        Candidate parameter vectors with shape `(num_candidates,
+        num_inputs)`, e.g., from a space-filling sampler.
+    num_runs : int
+        Number of candidates to select. Default is 1.
+
+    Returns
+    -------
+    np.ndarray
+        Indices of the selected rows of `candidates`.
+    """
+    candidates = _as_2d(candidates, emulator.num_inputs)
+    if num_runs > len(candidates):
+        raise ValueError(
+            f"num_runs of {num_runs} exceeds the {len(candidates)} "
+            "candidates."
+        )
+    emulator._check_fitted()
+    believer = GaussianProcessEmulator(
+        bounds=np.column_stack(
+            [emulator._x_lower, emulator._x_lower + emulator._x_span]
+        ),
+        length_scales=emulator._length_scales,
+        noise=emulator.noise,
+    )
+    x = emulator._x
+    y = emulator._y
+    selected = []
+    model = emulator
+    for _ in range(num_runs):
+        _, std = model.predict(candidates, return_std=True)
+        std[selected] = -np.inf
+        idx = int(np.argmax(std))
+        selected.append(idx)
+        x = np.vstack([x, candidates[idx]])
+        y = np.append(y, model.predict(candidates[idx : idx + 1]))
+        model = believer.fit(x, y, optimise=False)
+    return np.array(selected, dtype=np.int64)
+
+
+def prescreen(
+    emulator: _Emulator,
+    proposals: np.ndarray,
+    num_keep: int,
+    minimise: bool = True,
+    kappa: float = 2.0,
+) -> np.ndarray:
+    """Rank optimiser proposals with an emulator before running GLM.
+
+    Proposals are ranked by a confidence bound on the emulated response so
+    that uncertain but promising proposals are kept alongside those with the
+    best predicted response.
+
+    Parameters
+    ----------
+    emulator : Union[GaussianProcessEmulator, PolynomialChaosEmulator]
+        A fitted emulator.
+    proposals : np.ndarray
+        Proposed parameter vectors with shape `(num_proposals, num_inputs)`.
+    num_keep : int
+        Number of proposals to keep.
+    minimise : bool
+        Whether smaller responses are better (e.g., an RMSE). Default is True.
+    kappa : float
+        Weight of the predictive standard deviation in the confidence bound.
+        Default is 2.0.
+
+    Returns
+    -------
+    np.ndarray
+        Indices of the kept rows of `proposals`, best first.
+    """
+    proposals = _as_2d(proposals, emulator.num_inputs)
+    mean, std = emulator.predict(proposals, return_std=True)
+    if minimise:
+        score = mean - kappa * std
+    else:
+        score = -(mean + kappa * std)
+    num_keep = min(num_keep, len(proposals))
+    keep = np.argpartition(score, num_keep - 1)[:num_keep]
+    return keep[np.argsort(score[keep])]
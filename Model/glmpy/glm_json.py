@@ -1,7 +1,12 @@
 import json
 import os
+import glob
+import multiprocessing
 
-from typing import List, Union
+from typing import Dict, List, Type, Union
+
+from glmpy.nml.nml import NML, NMLReader
+from glmpy.nml.aed_nml import AEDNML
 
 class JSONReader:
     """Supports the reading of GLM configuration blocks in a JSON format or
@@ -9,7 +14,9 @@ class JSONReader:
 
     Reads and parses a JSON file into a dictionary object which can be
     used to set the attributes of the corresponding NML class. Useful for
-    converting a JSON file of GLM parameters from a web application.
+    converting a JSON file of GLM parameters from a web application. The
+    file is parsed once and re-read only if it changes on disk, so the
+    dictionary returned by `read_json()` is shared between calls.
 
     Attributes
     ----------
@@ -27,15 +34,15 @@ class JSONReader:
     def __init__(
         self, json_file: Union[str, os.PathLike], nml_file: str = "sim.nml"
     ):
-        if (not isinstance(json_file, str)) and (
-            not isinstance(json_file, dict)
-        ):
+        if not isinstance(json_file, (str, os.PathLike, dict)):
             raise TypeError("Expected json_file to be a string or dict.")
         if not isinstance(nml_file, str):
             raise TypeError("Expected nml_file to be a string.")
 
         self.json_file = json_file
         self.nml_file = nml_file
+        self._json_data = None
+        self._stamp = None
 
     def read_json(self) -> dict:
         """Read a JSON file of `.nml` parameters. 
@@ -51,9 +58,13 @@ class JSONReader:
         if isinstance(self.json_file, str) or isinstance(
             self.json_file, os.PathLike
         ):
-            with open(self.json_file) as file:
-                json_data = json.load(file)
-            return json_data
+            stat = os.stat(self.json_file)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self._json_data is None or stamp != self._stamp:
+                with open(self.json_file) as file:
+                    self._json_data = json.load(file)
+                self._stamp = stamp
+            return self._json_data
         else:
             # here, we assume that json_file is in memory
             return self.json_file
@@ -99,3 +110,69 @@ class JSONReader:
         """
         json_data = self.read_json()
         return json_data[nml_block]
+
+
+def _load_json_nml(args) -> NML:
+    json_file, nml_obj, cache = args
+    try:
+        nml = NMLReader(json_file, cache=cache).to_nml_obj(nml_obj)
+        nml.validate()
+    except (ValueError, TypeError) as err:
+        raise ValueError(f"{json_file}: {err}") from err
+    return nml
+
+
+def load_json_nmls(
+    json_files: Union[str, List[str]],
+    nml_obj: Type[NML] = AEDNML,
+    cpu_count: Union[int, None] = None,
+    cache: bool = True,
+) -> Dict[str, NML]:
+    """Build and validate NML objects from many JSON files.
+
+    Files are parsed with `NMLReader`, so the parsed dictionaries are cached
+    in memory and on disk and unchanged files are not parsed again. The NML
+    objects are built and validated in a pool of worker processes.
+
+    Parameters
+    ----------
+    json_files : Union[str, List[str]]
+        A list of JSON files, or a glob pattern such as
+        `"case_studies/aed_case*.json"`.
+    nml_obj : Type[NML]
+        The NML class to build. Default is `AEDNML`.
+    cpu_count : Union[int, None]
+        Number of worker processes. Default is None, which uses the number
+        of CPUs up to the number of files. With 1, the files are loaded in
+        the current process.
+    cache : bool
+        Use the `NMLReader` parse cache. Default is True.
+
+    Returns
+    -------
+    Dict[str, NML]
+        The validated NML object of each file, keyed by path, in the order
+        of `json_files` (sorted for a glob pattern).
+
+    Examples
+    --------
+    >>> from glmpy.glm_json import load_json_nmls
+    >>> cases = load_json_nmls("case_studies/aed_case*.json")
+    >>> cases["case_studies/aed_case1.json"].blocks["aed_oxygen"]
+    """
+    if isinstance(json_files, str):
+        pattern = json_files
+        json_files = sorted(glob.glob(pattern))
+        if not json_files:
+            raise ValueError(f"No files match {pattern}.")
+    json_files = [os.fspath(json_file) for json_file in json_files]
+    if cpu_count is None:
+        cpu_count = multiprocessing.cpu_count()
+    cpu_count = max(1, min(cpu_count, len(json_files)))
+    tasks = [(json_file, nml_obj, cache) for json_file in json_files]
+    if cpu_count == 1:
+        nmls = [_load_json_nml(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes=cpu_count) as pool:
+            nmls = pool.map(_load_json_nml, tasks)
+    return dict(zip(json_files, nmls))
@@ -0,0 +1,458 @@
+import os
+import numpy as np
+
+from typing import Union, List, Callable, Tuple, Dict, Sequence
+
+from glmpy.sim import GLMSim, MultiSim
+from glmpy.metrics import ObservationSet, read_glm_csv
+from glmpy.sampling import NMLSampler
+
+
+class WeightedQuantileBands:
+    """Likelihood-weighted quantiles of an ensemble, updated incrementally.
+
+    Each member's output is added to a weighted histogram at every
+    timestep, so memory is fixed at `(num_times, num_bins)` regardless of
+    the number of members. Quantiles are interpolated linearly within the
+    bins and are therefore accurate to the bin width. Values outside
+    `[lower, upper]` are counted in the first or last bin.
+
+    Attributes
+    ----------
+    num_times : int
+        Number of timesteps of each member's output.
+    lower : float
+        Lower edge of the histogram.
+    upper : float
+        Upper edge of the histogram.
+    num_bins : int
+        Number of histogram bins. Default is 1000.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from glmpy.glue import WeightedQuantileBands
+    >>> bands = WeightedQuantileBands(num_times=3, lower=0.0, upper=10.0)
+    >>> bands.update(np.array([1.0, 2.0, 3.0]), weight=0.2)
+    >>> bands.update(np.array([2.0, 3.0, 4.0]), weight=0.8)
+    >>> bands.quantiles([0.05, 0.5, 0.95])
+    """
+
+    def __init__(
+        self, num_times: int, lower: float, upper: float, num_bins: int = 1000
+    ):
+        if not upper > lower:
+            raise ValueError(
+                f"upper must be greater than lower. Got lower={lower} and "
+                f"upper={upper}."
+            )
+        if num_bins < 1:
+            raise ValueError(f"num_bins must be at least 1. Got {num_bins}.")
+        self.num_times = num_times
+        self.lower = float(lower)
+        self.upper = float(upper)
+        self.num_bins = num_bins
+        self.edges = np.linspace(self.lower, self.upper, num_bins + 1)
+        self.hist = np.zeros((num_times, num_bins))
+        self.total_weight = 0.0
+        self.num_members = 0
+        self._rows = np.arange(num_times)
+
+    def reset(self):
+        """Remove every member."""
+        self.hist[:] = 0.0
+        self.total_weight = 0.0
+        self.num_members = 0
+
+    def update(self, values: np.ndarray, weight: float):
+        """Add a member's output.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Output with shape `(num_times,)`. NaN values are skipped.
+        weight : float
+            Likelihood weight of the member. Weights need not be
+            normalised.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (self.num_times,):
+            raise ValueError(
+                f"Expected values with shape ({self.num_times},). Got "
+                f"{values.shape}."
+            )
+        if not weight >= 0.0:
+            raise ValueError(f"weight must be non-negative. Got {weight}.")
+        valid = np.isfinite(values)
+        bins = np.floor(
+            (values[valid] - self.lower)
+            / (self.upper - self.lower)
+            * self.num_bins
+        )
+        bins = np.clip(bins, 0, self.num_bins - 1).astype(np.intp)
+        self.hist[self._rows[valid], bins] += weight
+        self.total_weight += weight
+        self.num_members += 1
+
+    def quantiles(self, q: Union[float, List[float]]) -> np.ndarray:
+        """Weighted quantiles at each timestep.
+
+        Parameters
+        ----------
+        q : Union[float, List[float]]
+            Quantiles between 0 and 1.
+
+        Returns
+        -------
+        np.ndarray
+            Array with shape `(num_times,)` for a single quantile or
+            `(len(q), num_times)` for a list. Timesteps without any weight
+            are NaN.
+        """
+        q_arr = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if np.any((q_arr < 0.0) | (q_arr > 1.0)):
+            raise ValueError(f"Quantiles must be between 0 and 1. Got {q}.")
+        cdf = np.cumsum(self.hist, axis=1)
+        totals = cdf[:, -1:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cdf = cdf / totals
+        out = np.full((len(q_arr), self.num_times), np.nan)
+        has_weight = totals[:, 0] > 0.0
+        lower_cdf = np.concatenate(
+            [np.zeros((self.num_times, 1)), cdf[:, :-1]], axis=1
+        )
+        width = self.edges[1] - self.edges[0]
+        for i, quantile in enumerate(q_arr):
+            # First bin where the cumulative weight reaches the quantile
+            bins = np.sum(cdf < quantile, axis=1)
+            bins = np.minimum(bins, self.num_bins - 1)
+            start = lower_cdf[self._rows, bins]
+            mass = cdf[self._rows, bins] - start
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frac = np.where(mass > 0.0, (quantile - start) / mass, 0.0)
+            out[i] = self.edges[bins] + np.clip(frac, 0.0, 1.0) * width
+        out[:, ~has_weight] = np.nan
+        return out[0] if np.ndim(q) == 0 else out
+
+
+class CSVLikelihood:
+    """Likelihood of a run from a column of its GLM CSV output.
+
+    Uses an informal GLUE likelihood of `max(metric, 0) ** shape`, where
+    `metric` is the NSE or KGE of the output against an `ObservationSet`.
+    Instances are picklable, so they can be evaluated in `MultiSim`
+    worker processes.
+
+    Attributes
+    ----------
+    obs : ObservationSet
+        The observations.
+    csv_name : str
+        Name of the CSV in the GLM output directory, e.g., `"lake.csv"`.
+    column : str
+        Column to compare, e.g., `"Lake Level"`.
+    metric : str
+        `"nse"` or `"kge"`. Default is `"nse"`.
+    shape : float
+        Exponent of the likelihood. Larger values concentrate the weight on
+        the best members. Default is 1.0.
+    offset : float
+        Value added to the model output before comparison. Default is 0.0.
+    out_dir : str
+        Output directory relative to the simulation directory. Default is
+        `"output"`.
+    """
+
+    def __init__(
+        self,
+        obs: ObservationSet,
+        csv_name: str,
+        column: str,
+        metric: str = "nse",
+        shape: float = 1.0,
+        offset: float = 0.0,
+        out_dir: str = "output",
+    ):
+        if metric not in ("nse", "kge"):
+            raise ValueError(f"metric must be 'nse' or 'kge'. Got {metric}.")
+        self.obs = obs
+        self.csv_name = csv_name
+        self.column = column
+        self.metric = metric
+        self.shape = shape
+        self.offset = offset
+        self.out_dir = out_dir
+
+    def csv_path(self, glm_sim: GLMSim) -> str:
+        return os.path.join(
+            glm_sim.get_sim_dir(), self.out_dir, self.csv_name
+        )
+
+    def read_output(self, glm_sim: GLMSim) -> Tuple[np.ndarray, np.ndarray]:
+        df = read_glm_csv(self.csv_path(glm_sim), self.column)
+        values = df[self.column].to_numpy(dtype=np.float64) + self.offset
+        return df["time"].to_numpy(), values
+
+    def __call__(self, glm_sim: GLMSim) -> float:
+        times, values = self.read_output(glm_sim)
+        metric = self.obs.skill(times, values)[self.metric].iloc[0]
+        if not np.isfinite(metric):
+            return 0.0
+        return float(max(metric, 0.0) ** self.shape)
+
+
+def _is_behavioural(likelihood: float, threshold: float) -> bool:
+    return bool(
+        np.isfinite(likelihood)
+        and likelihood > 0.0
+        and likelihood >= threshold
+    )
+
+
+class GLUEScorer:
+    """Scores a completed GLUE member in its `MultiSim` worker process.
+
+    Holds only what scoring needs, so that each task pickles the
+    likelihood and output callables rather than the whole `GLUE` object
+    with its sampler, design and bands.
+
+    Attributes
+    ----------
+    likelihood : Callable[[GLMSim], float]
+        Picklable callable returning the likelihood of a completed run.
+    output : Union[Callable[[GLMSim], np.ndarray], None]
+        Picklable callable returning the output of a completed run. If
+        None, `likelihood.read_output()` is used.
+    threshold : float
+        Minimum likelihood of a behavioural member.
+    keep_dirs : bool
+        Keep the simulation directories of behavioural members.
+    """
+
+    def __init__(
+        self,
+        likelihood: Callable[[GLMSim], float],
+        output: Union[Callable[[GLMSim], np.ndarray], None],
+        threshold: float,
+        keep_dirs: bool,
+    ):
+        self.likelihood = likelihood
+        self.output = output
+        self.threshold = threshold
+        self.keep_dirs = keep_dirs
+
+    def __call__(
+        self, glm_sim: GLMSim
+    ) -> Tuple[float, Union[np.ndarray, None]]:
+        try:
+            likelihood = float(self.likelihood(glm_sim))
+        except (OSError, ValueError):
+            # Failed runs leave missing or truncated outputs
+            likelihood = np.nan
+        values = None
+        if _is_behavioural(likelihood, self.threshold):
+            if self.output is None:
+                _, values = self.likelihood.read_output(glm_sim)
+            else:
+                values = np.asarray(self.output(glm_sim), dtype=np.float64)
+        if values is None or not self.keep_dirs:
+            if os.path.isdir(glm_sim.get_sim_dir()):
+                glm_sim.rm_sim_dir()
+        return likelihood, values
+
+
+class GLUE:
+    """Generalised Likelihood Uncertainty Estimation for a `GLMSim`.
+
+    Samples parameters with an `NMLSampler`, runs the members with
+    `MultiSim.run_iter()` and scores each member in its worker process as
+    soon as it completes, with a `GLUEScorer` that holds only the
+    likelihood, output, threshold and `keep_dirs`. Members with a
+    likelihood below `threshold` are non-behavioural: their simulation
+    directories are deleted immediately and only their likelihood is kept.
+    Behavioural members contribute their output to `WeightedQuantileBands`,
+    weighted by likelihood. Memory is bounded by the histogram size and disk
+    usage by the number of members in flight (plus any behavioural
+    directories kept with `keep_dirs`).
+
+    Attributes
+    ----------
+    sampler : NMLSampler
+        Sampler of the uncertain parameters.
+    likelihood : Callable[[GLMSim], float]
+        Picklable callable returning the likelihood of a completed run,
+        e.g., a `CSVLikelihood`.
+    output : Callable[[GLMSim], np.ndarray]
+        Picklable callable returning the output of a completed run to build
+        the bands from, with shape `(bands.num_times,)`. Default is None
+        (the output compared by a `CSVLikelihood`).
+    threshold : float
+        Minimum likelihood of a behavioural member. Default is 0.0 (any
+        positive likelihood).
+    bands : WeightedQuantileBands
+        Accumulator of the behavioural outputs.
+    keep_dirs : bool
+        Keep the simulation directories of behavioural members. Default is
+        False.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from glmpy import glue, metrics, sampling
+    >>> from glmpy.sim import GLMSim
+    >>> glm_sim = GLMSim.from_file("richmond.glmpy")
+    >>> sampler = sampling.NMLSampler(
+    ...     glm_sim,
+    ...     [
+    ...         sampling.SampledParam("glm", "mixing", "coef_mix_hyp", 0.2, 0.8),
+    ...         sampling.SampledParam("glm", "light", "Kw", 0.2, 1.5),
+    ...     ],
+    ... )
+    >>> field = pd.read_parquet(
+    ...     "Data/data-warehouse/parquet/level/lakelevel.parquet"
+    ... )
+    >>> likelihood = glue.CSVLikelihood(
+    ...     metrics.ObservationSet(field), "lake.csv", "Lake Level"
+    ... )
+    >>> bands = glue.WeightedQuantileBands(num_times=3653, lower=12, upper=17)
+    >>> results = glue.GLUE(
+    ...     sampler, likelihood, bands=bands, threshold=0.5
+    ... ).run(num_samples=20000, seed=42)
+    >>> results["bands"]
+    """
+
+    def __init__(
+        self,
+        sampler: NMLSampler,
+        likelihood: Callable[[GLMSim], float],
+        bands: WeightedQuantileBands,
+        output: Union[Callable[[GLMSim], np.ndarray], None] = None,
+        threshold: float = 0.0,
+        keep_dirs: bool = False,
+    ):
+        if output is None:
+            if not isinstance(likelihood, CSVLikelihood):
+                raise ValueError(
+                    "output must be provided unless likelihood is a "
+                    "CSVLikelihood."
+                )
+        self.sampler = sampler
+        self.likelihood = likelihood
+        self.output = output
+        self.threshold = threshold
+        self.bands = bands
+        self.keep_dirs = keep_dirs
+        self.design = None
+        self.likelihoods = None
+        self.behavioural = []
+
+    def _is_behavioural(self, likelihood: float) -> bool:
+        return _is_behavioural(likelihood, self.threshold)
+
+    def scorer(self) -> GLUEScorer:
+        """The `GLUEScorer` that `run()` passes to the worker processes."""
+        return GLUEScorer(
+            self.likelihood, self.output, self.threshold, self.keep_dirs
+        )
+
+    def evaluate(
+        self, glm_sim: GLMSim
+    ) -> Tuple[float, Union[np.ndarray, None]]:
+        """Score a completed run and remove its outputs if rejected.
+
+        Returns
+        -------
+        Tuple[float, Union[np.ndarray, None]]
+            The likelihood and, for behavioural members, the output.
+        """
+        return self.scorer()(glm_sim)
+
+    def run(
+        self,
+        num_samples: int,
+        seed: Union[int, None] = None,
+        method: str = "latin_hypercube",
+        sim_name_prefix: Union[str, None] = "glue",
+        cpu_count: Union[int, None] = None,
+        max_pending: Union[int, None] = None,
+        glm_path: Union[str, None] = "./glm",
+        quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    ) -> Dict[str, np.ndarray]:
+        """Sample, run and score the ensemble.
+
+        The results and `bands` of any previous run are replaced.
+
+        Parameters
+        ----------
+        num_samples : int
+            Number of members to run.
+        seed : Union[int, None]
+            Seed of the sampler. Default is None.
+        method : str
+            `"latin_hypercube"` or `"sobol"`. Default is
+            `"latin_hypercube"`.
+        sim_name_prefix : Union[str, None]
+            Prefix for the `sim_name` of each member. Default is `"glue"`.
+        cpu_count : Union[int, None]
+            Number of worker processes. Default is None (all CPUs).
+        max_pending : Union[int, None]
+            Maximum number of members in flight. Default is None. See
+            `MultiSim.run_iter()`.
+        glm_path : Union[str, None]
+            Path to the GLM binary. Default is `"./glm"`.
+        quantiles : Sequence[float]
+            Quantiles of the returned bands. Default is
+            `(0.05, 0.5, 0.95)`.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            `"design"` (`(num_samples, num_dims)`), `"likelihoods"`
+            (`(num_samples,)`, NaN for failed runs), `"behavioural"`
+            (indices of behavioural members), `"weights"` (normalised
+            weights of the behavioural members) and `"bands"`
+            (`(len(quantiles), num_times)`).
+        """
+        if method == "latin_hypercube":
+            design = self.sampler.latin_hypercube(num_samples, seed=seed)
+        elif method == "sobol":
+            design = self.sampler.sobol(num_samples, seed=seed)
+        else:
+            raise ValueError(
+                f"method must be 'latin_hypercube' or 'sobol'. Got {method}."
+            )
+        self.design = design
+        self.likelihoods = np.full(len(design), np.nan)
+        self.behavioural = []
+        self.bands.reset()
+        multi_sim = MultiSim(
+            self.sampler.get_sims(design, sim_name_prefix=sim_name_prefix)
+        )
+        for index, (likelihood, values) in multi_sim.run_iter(
+            on_sim_end=self.scorer(),
+            cpu_count=cpu_count,
+            max_pending=max_pending,
+            time_sim=False,
+            glm_path=glm_path,
+        ):
+            self.likelihoods[index] = likelihood
+            if values is not None:
+                self.bands.update(values, likelihood)
+                self.behavioural.append(index)
+        return self.results(quantiles)
+
+    def results(
+        self, quantiles: Sequence[float] = (0.05, 0.5, 0.95)
+    ) -> Dict[str, np.ndarray]:
+        """Results of the last `run()`. See `run()`."""
+        behavioural = np.sort(np.asarray(self.behavioural, dtype=np.intp))
+        weights = self.likelihoods[behavioural]
+        if weights.sum() > 0.0:
+            weights = weights / weights.sum()
+        return {
+            "design": self.design,
+            "likelihoods": self.likelihoods,
+            "behavioural": behavioural,
+            "weights": weights,
+            "bands": self.bands.quantiles(quantiles),
+        }
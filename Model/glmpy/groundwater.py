@@ -0,0 +1,652 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+from pandas.api.types import is_numeric_dtype
+from typing import Any, Dict, Iterator, List, Tuple, Union
+from glmpy import _cache
+from glmpy.inflows import write_timeseries
+
+# Digest of each workbook, keyed by path, with the (mtime_ns, size) stamp it
+# was hashed at
+_digest_index: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+# Labels of the parameters in a Darcy workbook and their names in glmpy
+_DARCY_LABELS = {
+    "K": "hydraulic_conductivity",
+    "L": "length",
+    "A": "area",
+    "width": "width",
+    "depth": "depth",
+    "dH": "head_difference",
+}
+
+_Values = Union[float, np.ndarray, pd.Series, List[float]]
+
+
+def workbook_digest(path: str) -> str:
+    """SHA-256 of a workbook file.
+
+    A file is only read and hashed again once its modification time or size
+    changes.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry = _digest_index.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    with open(path, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    _digest_index[path] = (stamp, digest)
+    return digest
+
+
+def read_workbook(
+    path: str,
+    sheet_name: str,
+    header: Union[int, None] = 0,
+    cache_root: Union[str, None] = None,
+) -> pd.DataFrame:
+    """Read a sheet of an Excel workbook, caching it as Parquet.
+
+    The first read parses the workbook with `pd.read_excel()`, which
+    requires `openpyxl`, and writes the sheet to
+    `<cache_root>/<sha256>/<sheet_name>.<header>.parquet`, where `sha256` is
+    the digest of the workbook. Later reads, in any process, read the
+    Parquet file. Editing the workbook changes its digest, so a stale sheet
+    is never read. Cell values are read, not formulas, so the workbook must
+    have been saved by Excel after its last recalculation.
+
+    Parameters
+    ----------
+    path : str
+        Path of the `.xlsx` workbook.
+    sheet_name : str
+        Name of the sheet.
+    header : Union[int, None]
+        Row of the column names, as for `pd.read_excel()`. Default is 0. If
+        None, columns are named `"0"`, `"1"`, etc.
+    cache_root : Union[str, None]
+        Directory of the cache. Default is None, which uses `bcs` in glmpy's
+        cache directory (see `glmpy._cache.cache_dir`).
+
+    Returns
+    -------
+    pd.DataFrame
+        The sheet.
+    """
+    if cache_root is None:
+        cache_root = _cache.cache_dir("bcs")
+    header_key = "none" if header is None else str(header)
+    cache_path = os.path.join(
+        cache_root, workbook_digest(path), f"{sheet_name}.{header_key}.parquet"
+    )
+    if os.path.isfile(cache_path):
+        return pd.read_parquet(cache_path)
+
+    sheet = pd.read_excel(
+        path, sheet_name=sheet_name, header=header, engine="openpyxl"
+    )
+    sheet.columns = [str(column) for column in sheet.columns]
+    # Parquet columns have one type, so numbers in columns of text are
+    # stored as text
+    for column in sheet.columns[sheet.dtypes == object]:
+        sheet[column] = sheet[column].map(
+            lambda v: v if isinstance(v, str) or pd.isna(v) else str(v)
+        )
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    sheet.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+    return sheet
+
+
+def excel_times(values: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """Convert a column of Excel dates to `datetime64[ns]`.
+
+    Columns that `pd.read_excel()` did not recognise as dates hold Excel
+    serial day numbers (days since 1899-12-30).
+    """
+    values = pd.Series(values)
+    if is_numeric_dtype(values):
+        times = pd.Timestamp("1899-12-30") + pd.to_timedelta(
+            values.to_numpy(dtype=np.float64), unit="D"
+        )
+    else:
+        times = pd.to_datetime(values)
+    return np.asarray(times, dtype="datetime64[ns]")
+
+
+def read_darcy_params(
+    path: str,
+    sheet_name: str = "Sheet1",
+    cache_root: Union[str, None] = None,
+) -> Dict[str, float]:
+    """Read the Darcy parameters of a workbook.
+
+    Each parameter is the number to the right of its label: `K` (m/day),
+    `L` (m), `A` (m^2), `width` and `depth` (m), and `dH` (m). The area is
+    `width * depth` if there is no `A`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the `.xlsx` workbook.
+    sheet_name : str
+        Name of the sheet. Default is `"Sheet1"`.
+    cache_root : Union[str, None]
+        Directory of the cache. See `read_workbook()`.
+
+    Returns
+    -------
+    Dict[str, float]
+        `hydraulic_conductivity`, `length` and `area`, and `width`, `depth`
+        and `head_difference` where present.
+    """
+    sheet = read_workbook(
+        path, sheet_name, header=None, cache_root=cache_root
+    )
+    params = {}
+    for row in sheet.to_numpy(dtype=object):
+        for label, value in zip(row[:-1], row[1:]):
+            if not isinstance(label, str):
+                continue
+            name = _DARCY_LABELS.get(label.strip())
+            if name is not None and name not in params and not pd.isna(value):
+                params[name] = float(value)
+    if "area" not in params and "width" in params and "depth" in params:
+        params["area"] = params["width"] * params["depth"]
+    missing = [
+        label for label, name in _DARCY_LABELS.items()
+        if name in ("hydraulic_conductivity", "length", "area")
+        and name not in params
+    ]
+    if missing:
+        raise ValueError(
+            f"Could not find the Darcy parameters {missing} in {path}."
+        )
+    return params
+
+
+class DarcyFlows:
+    """Groundwater exchange between an aquifer and the lake.
+
+    Calculates the flow through the lake bank by Darcy's law,
+    `Q = K * A * (head - level) / L`, for a whole series of aquifer heads
+    and lake levels at once. Flows are in m^3/s and positive into the lake.
+
+    Parameters are scalars or 1-D arrays with one value per scenario (e.g.,
+    a "hi gw" scenario with a higher conductivity or head), broadcast
+    together.
+
+    Attributes
+    ----------
+    hydraulic_conductivity : np.ndarray
+        Hydraulic conductivity (K) of the aquifer in m/day.
+    area : np.ndarray
+        Cross-sectional area (A) of the flow path in m^2.
+    length : np.ndarray
+        Length (L) of the flow path in m.
+    head_offset : np.ndarray
+        Added to the aquifer head in m. Default is 0.0.
+
+    Examples
+    --------
+    >>> from glmpy.groundwater import DarcyFlows
+    >>> darcy = DarcyFlows.from_workbook(
+    ...     "bcs/catchment/darcy.xlsx", head_offset=[0.0, 0.5]
+    ... )
+    >>> darcy.get_flows(head, level).shape
+    (2, 8921)
+    """
+    def __init__(
+        self,
+        hydraulic_conductivity: _Values,
+        area: _Values,
+        length: _Values,
+        head_offset: _Values = 0.0,
+    ):
+        try:
+            params = np.broadcast_arrays(*(
+                np.atleast_1d(np.asarray(value, dtype=np.float64))
+                for value in (hydraulic_conductivity, area, length, head_offset)
+            ))
+        except ValueError:
+            raise ValueError(
+                "Darcy parameters must broadcast together. Got shapes "
+                f"{np.shape(hydraulic_conductivity)}, {np.shape(area)}, "
+                f"{np.shape(length)} and {np.shape(head_offset)}."
+            )
+        if params[0].ndim != 1:
+            raise ValueError(
+                "Darcy parameters must be scalars or have one value per "
+                f"scenario. Got shape {params[0].shape}."
+            )
+        if np.any(params[0] < 0):
+            raise ValueError("hydraulic_conductivity must not be negative.")
+        if np.any(params[1] < 0):
+            raise ValueError("area must not be negative.")
+        if np.any(params[2] <= 0):
+            raise ValueError("length must be positive.")
+        (
+            self.hydraulic_conductivity,
+            self.area,
+            self.length,
+            self.head_offset,
+        ) = params
+
+    @classmethod
+    def from_workbook(
+        cls,
+        path: str,
+        sheet_name: str = "Sheet1",
+        cache_root: Union[str, None] = None,
+        **params: _Values,
+    ) -> "DarcyFlows":
+        """Read the parameters from a workbook (see `read_darcy_params()`).
+
+        Keyword arguments override the workbook's parameters, e.g.,
+        `hydraulic_conductivity=[50.0, 100.0]` for two scenarios.
+        """
+        workbook_params = read_darcy_params(path, sheet_name, cache_root)
+        kwargs = {
+            name: workbook_params[name]
+            for name in ("hydraulic_conductivity", "area", "length")
+        }
+        kwargs.update(params)
+        return cls(**kwargs)
+
+    @property
+    def num_scenarios(self) -> int:
+        return len(self.hydraulic_conductivity)
+
+    def get_flows(self, head: _Values, level: _Values) -> np.ndarray:
+        """Flows (m^3/s) into the lake for each scenario and timestep.
+
+        Parameters
+        ----------
+        head : Union[float, np.ndarray]
+            Aquifer head (m). A constant, one value per timestep, or an
+            array of shape (scenarios, timesteps).
+        level : Union[float, np.ndarray]
+            Lake level (m), as for `head`.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (scenarios, timesteps). Negative flows are out
+            of the lake.
+        """
+        head = np.asarray(head, dtype=np.float64)
+        level = np.asarray(level, dtype=np.float64)
+        if head.ndim > 2 or level.ndim > 2:
+            raise ValueError(
+                "head and level must have at most two dimensions "
+                "(scenarios x timesteps)."
+            )
+        try:
+            gradient = (
+                head + self.head_offset[:, np.newaxis] - level
+            ) / self.length[:, np.newaxis]
+        except ValueError:
+            raise ValueError(
+                f"Got head of shape {head.shape} and level of shape "
+                f"{level.shape} for {self.num_scenarios} scenarios."
+            )
+        conductance = (
+            self.hydraulic_conductivity[:, np.newaxis]
+            * self.area[:, np.newaxis]
+        )
+        return conductance * gradient / 86400.0
+
+
+class GroundwaterBCBuilder:
+    """Build the groundwater and urban inflow BCs of a catchment.
+
+    Generates the `gw_inflow`, `gw_outflow` and `urban_inflow` BCs of a
+    catchment for one or more scenarios. Groundwater flows are calculated
+    with `DarcyFlows` from aquifer head and lake level series, which are
+    interpolated onto the groundwater time grid, or, if no head and level
+    are given, taken from the `flow` column of `gw_columns`. The
+    temperature, salinity and tracers of the groundwater inflow, and the
+    urban inflow, are taken as given.
+
+    `outflow` sets how the flows are split between the two groundwater
+    BCs:
+
+    - `"through"`: the existing form of the Lake Richmond BCs. Groundwater
+      flows through the lake: `gw_outflow` is a copy of `gw_inflow`, with
+      every column, and both have the magnitude of the flow. The balance
+      between them is set by the `inflow_factor` and `outflow_factor` of
+      the NML. `from_workbooks(..., outflow="through")` without a head and
+      level reproduces `gw_inflow.csv` and `gw_outflow.csv`.
+    - `"split"` (default): a deliberate change to the model. The sign of
+      the Darcy flow decides the direction of the exchange: flows into the
+      lake go to `gw_inflow` and flows out of it to `gw_outflow`, which
+      has only `time` and `flow` columns. The NML factors of both
+      groundwater streams should then be 1.
+
+    `from_workbooks()` reads the BCs and parameters from the catchment
+    workbooks. Each sheet is parsed once and cached as Parquet (see
+    `read_workbook()`), so the BCs of a parameter sweep are regenerated
+    without Excel. Columns are selected by name, so `time` need not be the
+    first column of a sheet or DataFrame.
+
+    Attributes
+    ----------
+    darcy : DarcyFlows
+        Groundwater flow parameters. Its scenarios, and any rows of the
+        head and level arrays, are the scenarios of the builder.
+    gw_columns : pd.DataFrame
+        `time` of the groundwater BCs and the columns written after `flow`
+        in `gw_inflow` (e.g., `temp`, `salt` and tracers). A `flow` column
+        is kept as `gw_flow`.
+    gw_flow : Union[np.ndarray, None]
+        The `flow` column of `gw_columns`, used when no head and level are
+        given. None if `gw_columns` has no `flow` column.
+    urban_inflow : Union[pd.DataFrame, None]
+        The urban inflow BC, with `time` and `flow` columns, shared by every
+        scenario. Default is None.
+    outflow : str
+        `"split"` or `"through"`. Default is `"split"`.
+
+    Examples
+    --------
+    >>> from glmpy.groundwater import GroundwaterBCBuilder
+    >>> builder = GroundwaterBCBuilder.from_workbooks(
+    ...     groundwater_path="bcs/catchment/groundwater.xlsx",
+    ...     darcy_path="bcs/catchment/darcy.xlsx",
+    ...     urban_path="bcs/catchment/urban_catchment.xlsx",
+    ...     head_offset=[0.0, 0.5],
+    ... )
+
+    Write the BCs of the "hi gw" scenario:
+    >>> builder.write_bcs("bcs/catchment", head, level, scenario=1)
+
+    Set the BCs of one simulation per scenario:
+    >>> builder.set_sim_bcs(glm_sims, head, level)
+
+    Regenerate the existing through-flow BCs from the workbook flows:
+    >>> builder = GroundwaterBCBuilder.from_workbooks(
+    ...     groundwater_path="bcs/catchment/groundwater.xlsx",
+    ...     darcy_path="bcs/catchment/darcy.xlsx",
+    ...     urban_path="bcs/catchment/urban_catchment.xlsx",
+    ...     outflow="through",
+    ... )
+    >>> builder.write_bcs("bcs/catchment")
+    """
+    gw_inflow_name = "gw_inflow"
+    gw_outflow_name = "gw_outflow"
+    urban_inflow_name = "urban_inflow"
+
+    def __init__(
+        self,
+        darcy: DarcyFlows,
+        gw_columns: pd.DataFrame,
+        urban_inflow: Union[pd.DataFrame, None] = None,
+        outflow: str = "split",
+    ):
+        if outflow not in ("split", "through"):
+            raise ValueError(
+                f"outflow must be 'split' or 'through'. Got {outflow}."
+            )
+        if "time" not in gw_columns.columns:
+            raise ValueError("gw_columns must have a time column.")
+        if urban_inflow is not None:
+            missing = [
+                column for column in ("time", "flow")
+                if column not in urban_inflow.columns
+            ]
+            if missing:
+                raise ValueError(
+                    f"urban_inflow must have time and flow columns. Missing "
+                    f"{missing}."
+                )
+        self.darcy = darcy
+        self.gw_flow = None
+        if "flow" in gw_columns.columns:
+            self.gw_flow = gw_columns["flow"].to_numpy(dtype=np.float64)
+        self.gw_columns = gw_columns.drop(columns="flow", errors="ignore")
+        self.urban_inflow = urban_inflow
+        self.outflow = outflow
+        self._times = np.asarray(gw_columns["time"], dtype="datetime64[ns]")
+        self._other_columns = [
+            column for column in self.gw_columns.columns if column != "time"
+        ]
+
+    @classmethod
+    def from_workbooks(
+        cls,
+        groundwater_path: str,
+        darcy_path: str,
+        urban_path: Union[str, None] = None,
+        groundwater_sheet: str = "glm inflow",
+        darcy_sheet: str = "Sheet1",
+        urban_sheet: str = "glm",
+        cache_root: Union[str, None] = None,
+        outflow: str = "split",
+        **darcy_params: _Values,
+    ) -> "GroundwaterBCBuilder":
+        """Read the BC columns and Darcy parameters from workbooks.
+
+        Parameters
+        ----------
+        groundwater_path : str
+            Workbook whose `groundwater_sheet` has the groundwater inflow
+            BC (`time`, `flow`, `temp`, `salt`, ...). Its `flow` is used
+            when no head and level are given.
+        darcy_path : str
+            Workbook of Darcy parameters (see `read_darcy_params()`).
+        urban_path : Union[str, None]
+            Workbook whose `urban_sheet` has the urban inflow BC. Default is
+            None (no urban inflow).
+        groundwater_sheet, darcy_sheet, urban_sheet : str
+            Sheet names. Defaults are `"glm inflow"`, `"Sheet1"` and
+            `"glm"`.
+        cache_root : Union[str, None]
+            Directory of the cache. See `read_workbook()`.
+        outflow : str
+            `"split"` or `"through"`. Default is `"split"`.
+        **darcy_params
+            Override the workbook's Darcy parameters or add scenarios (see
+            `DarcyFlows`).
+        """
+        darcy = DarcyFlows.from_workbook(
+            darcy_path, darcy_sheet, cache_root, **darcy_params
+        )
+        gw_columns = cls._read_bc(
+            groundwater_path, groundwater_sheet, cache_root
+        )
+        urban_inflow = None
+        if urban_path is not None:
+            urban_inflow = cls._read_bc(urban_path, urban_sheet, cache_root)
+        return cls(darcy, gw_columns, urban_inflow, outflow=outflow)
+
+    @staticmethod
+    def _read_bc(
+        path: str, sheet_name: str, cache_root: Union[str, None]
+    ) -> pd.DataFrame:
+        sheet = read_workbook(path, sheet_name, cache_root=cache_root)
+        columns = [c for c in sheet.columns if not c.startswith("Unnamed:")]
+        if "time" not in columns:
+            raise ValueError(
+                f"The {sheet_name} sheet of {path} must have a time column. "
+                f"Got {columns}."
+            )
+        others = [c for c in columns if c != "time"]
+        bc = sheet[["time"] + others].dropna(subset=["time"])
+        bc = bc.astype({c: np.float64 for c in others})
+        bc["time"] = pd.DatetimeIndex(excel_times(bc["time"]))
+        return bc.reset_index(drop=True)
+
+    def _on_grid(self, values: Any, name: str) -> np.ndarray:
+        if isinstance(values, pd.Series):
+            value_times = np.asarray(values.index, dtype="datetime64[ns]")
+            if len(value_times) == 0:
+                raise ValueError(f"{name} must not be empty.")
+            return np.interp(
+                self._times.view(np.int64),
+                value_times.view(np.int64),
+                values.to_numpy(dtype=np.float64),
+            )
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim > 0 and values.shape[-1] != len(self._times):
+            raise ValueError(
+                f"{name} must be a constant, a pd.Series indexed by time, or "
+                f"have one value per timestep ({len(self._times)}). Got shape "
+                f"{values.shape}."
+            )
+        return values
+
+    def get_gw_flows(
+        self, head: Any = None, level: Any = None
+    ) -> np.ndarray:
+        """Groundwater flows (m^3/s) into the lake.
+
+        Parameters
+        ----------
+        head : Union[float, pd.Series, np.ndarray, None]
+            Aquifer head (m). A constant, a pd.Series indexed by time
+            (linearly interpolated onto the time grid and held constant
+            beyond its first and last value), or an array with one value per
+            timestep, optionally with one row per scenario. Default is None.
+        level : Union[float, pd.Series, np.ndarray, None]
+            Lake level (m), as for `head`, e.g., from
+            `glmpy.outflows.read_sim_levels()`. Default is None.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (scenarios, timesteps). Negative flows are out
+            of the lake. If neither `head` nor `level` is given, `gw_flow`
+            as a single scenario.
+        """
+        if head is None and level is None:
+            if self.gw_flow is None:
+                raise ValueError(
+                    "head and level must be given when gw_columns has no "
+                    "flow column."
+                )
+            return self.gw_flow[np.newaxis]
+        if head is None or level is None:
+            raise ValueError("Both head and level must be given, or neither.")
+        flows = self.darcy.get_flows(
+            self._on_grid(head, "head"), self._on_grid(level, "level")
+        )
+        if flows.shape[1] != len(self._times):
+            flows = np.broadcast_to(flows, (len(flows), len(self._times)))
+        return flows
+
+    def _to_bcs(self, flows: np.ndarray) -> Dict[str, pd.DataFrame]:
+        time = pd.DatetimeIndex(self._times)
+        others = {
+            column: self.gw_columns[column].to_numpy()
+            for column in self._other_columns
+        }
+        if self.outflow == "through":
+            flow = np.abs(flows)
+            gw_inflow = pd.DataFrame({"time": time, "flow": flow, **others})
+            gw_outflow = gw_inflow.copy()
+        else:
+            gw_inflow = pd.DataFrame(
+                {"time": time, "flow": np.maximum(flows, 0.0), **others}
+            )
+            gw_outflow = pd.DataFrame(
+                {"time": time, "flow": np.maximum(-flows, 0.0)}
+            )
+        bcs = {
+            self.gw_inflow_name: gw_inflow,
+            self.gw_outflow_name: gw_outflow,
+        }
+        if self.urban_inflow is not None:
+            bcs[self.urban_inflow_name] = self.urban_inflow
+        return bcs
+
+    def get_bcs(
+        self, head: Any = None, level: Any = None, scenario: int = 0
+    ) -> Dict[str, pd.DataFrame]:
+        """BCs of one scenario.
+
+        Parameters
+        ----------
+        head, level : Union[float, pd.Series, np.ndarray, None]
+            Aquifer head and lake level (m). See `get_gw_flows()`.
+        scenario : int
+            Index of the scenario. Default is 0.
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            The `gw_inflow`, `gw_outflow` and, if set, `urban_inflow` BCs.
+            `urban_inflow` is not copied.
+        """
+        return self._to_bcs(self.get_gw_flows(head, level)[scenario])
+
+    def iter_scenario_bcs(
+        self, head: Any = None, level: Any = None
+    ) -> Iterator[Dict[str, pd.DataFrame]]:
+        """Iterate over the BCs of each scenario (see `get_bcs()`).
+
+        The flows of every scenario are calculated at once.
+        """
+        for flows in self.get_gw_flows(head, level):
+            yield self._to_bcs(flows)
+
+    def set_sim_bcs(
+        self, glm_sims: List[Any], head: Any = None, level: Any = None
+    ):
+        """Set the BCs of one simulation per scenario.
+
+        As `MultiCatchmentRunoffInflows.set_sim_bcs()`, each simulation gets
+        its own copy of its `bcs` dictionary, so simulations that shared a
+        BC store keep their other BCs shared.
+
+        Parameters
+        ----------
+        glm_sims : List[GLMSim]
+            One simulation per scenario.
+        head, level : Union[float, pd.Series, np.ndarray, None]
+            Aquifer head and lake level (m). See `get_gw_flows()`.
+        """
+        flows = self.get_gw_flows(head, level)
+        if len(glm_sims) != len(flows):
+            raise ValueError(
+                f"Got {len(glm_sims)} simulations for {len(flows)} "
+                "scenarios."
+            )
+        for glm_sim, scenario_flows in zip(glm_sims, flows):
+            sim_bcs = type(glm_sim.bcs)(glm_sim.bcs)
+            sim_bcs.update(self._to_bcs(scenario_flows))
+            glm_sim.bcs = sim_bcs
+
+    def write_bcs(
+        self,
+        dir_path: str,
+        head: Any = None,
+        level: Any = None,
+        scenario: int = 0,
+    ) -> None:
+        """Write the BCs of one scenario to `<name>.csv` files.
+
+        Parameters
+        ----------
+        dir_path : str
+            Directory to write the files to.
+        head, level : Union[float, pd.Series, np.ndarray, None]
+            Aquifer head and lake level (m). See `get_gw_flows()`.
+        scenario : int
+            Index of the scenario. Default is 0.
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        bcs = self.get_bcs(head, level, scenario)
+        for name, bc in bcs.items():
+            write_timeseries(
+                os.path.join(dir_path, f"{name}.csv"),
+                bc["time"].to_numpy(),
+                {
+                    column: bc[column].to_numpy()
+                    for column in bc.columns if column != "time"
+                },
+            )
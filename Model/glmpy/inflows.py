@@ -1,7 +1,252 @@
+import os
+import numpy as np
 import pandas as pd
 
 from pandas.api.types import is_numeric_dtype
-from typing import Union
+from typing import Union, Iterator, Dict, List, Tuple, Any
+from glmpy._lazy import LazyModule
+
+pa = LazyModule("pyarrow")
+pq = LazyModule("pyarrow.parquet")
+
+
+def _time_strings(time: np.ndarray) -> np.ndarray:
+    """Format datetimes as pandas writes them to CSV.
+
+    Dates only when every time is midnight, otherwise
+    `"%Y-%m-%d %H:%M:%S"`.
+    """
+    time = np.asarray(time, dtype="datetime64[s]")
+    days = time.astype("datetime64[D]")
+    seconds = (time - days).astype(np.int64)
+    if not np.any(seconds):
+        return np.datetime_as_string(days, unit="D").astype(object)
+    # A regular timeseries has few distinct days and times of day, so each
+    # is formatted once and the strings are concatenated
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    unique_seconds, second_index = np.unique(seconds, return_inverse=True)
+    day_strings = np.datetime_as_string(unique_days, unit="D").astype(object)
+    clock_strings = np.array(
+        [
+            f" {s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+            for s in unique_seconds.tolist()
+        ],
+        dtype=object
+    )
+    return day_strings[day_index] + clock_strings[second_index]
+
+
+class TimeseriesWriter:
+    """Write a boundary condition timeseries to a CSV or Parquet file.
+
+    Rows are written in chunks with `write()`, so a timeseries can be
+    written without holding all of it in memory. CSV files match
+    `DataFrame.to_csv(index=False)` for a `time` column followed by float
+    columns, but are formatted with vectorised NumPy operations. Files
+    ending in `.parquet` are written with `pyarrow`, one row group per
+    chunk.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the `.csv` or `.parquet` file.
+
+    Examples
+    --------
+    >>> from glmpy.inflows import TimeseriesWriter
+    >>> with TimeseriesWriter("inflow.csv") as writer:
+    ...     for time, flow in chunks:
+    ...         writer.write(time, {"flow": flow})
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.is_parquet = os.fspath(file_path).endswith(".parquet")
+        self._file = None
+        self._parquet_writer = None
+        self._columns = None
+
+    def __enter__(self) -> "TimeseriesWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, time: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Write a chunk of rows.
+
+        Parameters
+        ----------
+        time : np.ndarray
+            Datetimes of the rows.
+        columns : Dict[str, np.ndarray]
+            Values of each column, in order. Every chunk must have the same
+            columns.
+        """
+        if self._columns is None:
+            self._columns = list(columns.keys())
+        elif list(columns.keys()) != self._columns:
+            raise ValueError(
+                f"Expected columns {self._columns}. Got {list(columns)}."
+            )
+        if self.is_parquet:
+            self._write_parquet(time, columns)
+        else:
+            self._write_csv(time, columns)
+
+    def _write_csv(self, time: np.ndarray, columns: Dict[str, np.ndarray]):
+        if self._file is None:
+            self._file = open(self.file_path, "w", newline="")
+            self._file.write(",".join(["time", *self._columns]) + "\n")
+        fields = [_time_strings(time).tolist()]
+        for values in columns.values():
+            values = np.asarray(values, dtype=np.float64).tolist()
+            # NaN is written as an empty field, as by pandas
+            fields.append([repr(v) if v == v else "" for v in values])
+        lines = [",".join(row) for row in zip(*fields)]
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+
+    def _write_parquet(
+        self, time: np.ndarray, columns: Dict[str, np.ndarray]
+    ):
+        table = pa.Table.from_pandas(
+            pd.DataFrame({"time": time, **columns}), preserve_index=False
+        )
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(
+                self.file_path, table.schema
+            )
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def write_timeseries(
+    file_path: str,
+    time: np.ndarray,
+    columns: Dict[str, np.ndarray],
+) -> None:
+    """Write a boundary condition timeseries to a CSV or Parquet file.
+
+    See `TimeseriesWriter`.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the `.csv` or `.parquet` file.
+    time : np.ndarray
+        Datetimes of the timeseries.
+    columns : Dict[str, np.ndarray]
+        Values of each column, in order.
+    """
+    with TimeseriesWriter(file_path) as writer:
+        writer.write(time, columns)
+
+
+def _to_datetime(datetimes: pd.Series, date_time_col: str) -> np.ndarray:
+    """Parse a datetime column to `datetime64[ns]` without modifying it."""
+    try:
+        return np.asarray(
+            pd.to_datetime(datetimes, errors="raise"),
+            dtype="datetime64[ns]"
+        )
+    except Exception as e:
+        raise ValueError(
+            f"{date_time_col} is not a valid datetime column."
+        )
+
+
+def _regular_time_diff(times: np.ndarray) -> pd.Timedelta:
+    """Return the regular, positive timestep of datetimes."""
+    if len(times) < 2:
+        raise ValueError(
+            "Precipitation data must have at least two timesteps."
+        )
+    diffs = np.diff(times)
+    if diffs[0] <= np.timedelta64(0, "ns") or np.any(diffs != diffs[0]):
+        raise ValueError(
+            "Precipitation data must have a regular timestep. "
+            "Consider resampling your data."
+        )
+    return pd.Timedelta(diffs[0])
+
+
+def _check_met_data(
+    met_data: pd.DataFrame,
+    precip_col: str,
+    date_time_col: str,
+) -> Tuple[np.ndarray, pd.Timedelta]:
+    """Validate meteorological data for runoff inflows.
+
+    Returns the parsed datetimes and the timestep.
+    """
+    if not isinstance(met_data, pd.DataFrame):
+        raise ValueError(
+             "met_data must be a pandas DataFrame. "
+             f"Got type {type(met_data)}."
+        )
+    if not isinstance(precip_col, str):
+        raise ValueError(
+            "precip_col must be a string. "
+            f"Got type {type(precip_col)}."
+        )
+    if not isinstance(date_time_col, str):
+        raise ValueError(
+            "date_time_col must be a string. "
+            f"Got type {type(date_time_col)}."
+        )
+    if precip_col not in met_data.columns:
+        raise ValueError(
+            f"{precip_col} not in DataFrame columns."
+        )
+    if date_time_col not in met_data.columns:
+        raise ValueError(
+            f"{date_time_col} not in DataFrame columns."
+        )
+    if not is_numeric_dtype(met_data[precip_col]):
+        raise ValueError(
+            f"The {precip_col} column must be numeric. "
+            f"Got type {met_data.dtypes[precip_col]}."
+        )
+    times = _to_datetime(met_data[date_time_col], date_time_col)
+    return times, _regular_time_diff(times)
+
+
+def _check_runoff_method(runoff_coef: Any, runoff_threshold: Any):
+    """Check that exactly one runoff parameter is provided."""
+    if runoff_coef is None and runoff_threshold is None:
+        raise ValueError(
+            "Either runoff_coef or runoff_threshold must be provided."
+        )
+    if runoff_coef is not None and runoff_threshold is not None:
+        raise ValueError(
+            "Only one of runoff_coef or runoff_threshold can be provided."
+        )
+
+
+def _runoff(
+    precip: np.ndarray,
+    num_seconds: float,
+    catchment_area: Union[float, int, np.ndarray],
+    runoff_coef: Union[float, int, np.ndarray, None] = None,
+    runoff_threshold: Union[float, int, np.ndarray, None] = None,
+) -> np.ndarray:
+    """Calculate runoff (m^3/s) from precipitation (m per timestep).
+
+    The catchment parameters are broadcast against `precip`.
+    """
+    if runoff_coef is not None:
+        inflow = precip * catchment_area * runoff_coef
+    else:
+        inflow = (precip - runoff_threshold / 1000) * catchment_area
+    np.maximum(inflow, 0, out=inflow, where=~np.isnan(inflow))
+    return inflow / num_seconds
 
 
 class CatchmentRunoffInflows:
@@ -9,11 +254,13 @@ class CatchmentRunoffInflows:
 
     Generates an inflows timeseries by calculating catchment runoff from
     a pandas DataFrame of precipitation data. Requires a catchment area, a
-    runoff coefficient or threshold, and a precipitation timeseries in either
-    hourly or daily timesteps. Inflows are calculated at the same timestep as
-    the precipitation data but in units of m^3/s. `CatchmentRunoffInflows`
-    provides methods to return the calculated inflows timeseries as a pandas
-    DataFrame or to write the timeseries to a CSV.
+    runoff coefficient or threshold, and a precipitation timeseries at a
+    regular timestep (e.g., hourly, 3-hourly or daily). Inflows are
+    calculated at the same timestep as the precipitation data but in units
+    of m^3/s. `CatchmentRunoffInflows` provides methods to return the
+    calculated inflows timeseries as a pandas DataFrame, to iterate over it
+    in chunks, or to write it to a CSV or Parquet file. `met_data` is not
+    modified.
 
     Attributes
     ----------
@@ -21,7 +268,8 @@ class CatchmentRunoffInflows:
         A pandas DataFrame of meteorological data.
     precip_col : str
         Name of the column in the DataFrame containing precipitation data in
-        m/day or m/hour.
+        m per timestep (e.g., m/day for daily data or m/hour for hourly
+        data).
     date_time_col : str
         Name of the column in the DataFrame containing datetime data.
     catchment_area : Union[float, int]
@@ -88,11 +336,9 @@ class CatchmentRunoffInflows:
         runoff_coef: Union[float, None] = None,
         runoff_threshold: Union[float, None] = None,
     ):
-        if not isinstance(met_data, pd.DataFrame):
-            raise ValueError(
-                 "met_data must be a pandas DataFrame. " 
-                 f"Got type {type(met_data)}."
-            )
+        times, time_diff = _check_met_data(
+            met_data, precip_col, date_time_col
+        )
         if not isinstance(catchment_area, (int, float)):
             raise ValueError(
                 "catchment_area must be a numeric value. "
@@ -108,60 +354,11 @@ class CatchmentRunoffInflows:
                 "runoff_threshold must be a numeric value. "
                 f"Got type {type(runoff_threshold)}."
             )
-        if not isinstance(precip_col, str):
-            raise ValueError(
-                "precip_col must be a string. "
-                f"Got type {type(precip_col)}."
-            )
-        if not isinstance(date_time_col, str):
-            raise ValueError(
-                "date_time_col must be a string. "
-                f"Got type {type(date_time_col)}."
-            )
-
         if catchment_area < 0:
             raise ValueError(
                 "catchment_area must be a positive value."
             )
-        if precip_col not in met_data.columns:
-            raise ValueError(
-                f"{precip_col} not in DataFrame columns."
-            )
-        if date_time_col not in met_data.columns:
-            raise ValueError(
-                f"{date_time_col} not in DataFrame columns."
-            )
-        if not is_numeric_dtype(met_data[precip_col]):
-            raise ValueError(
-                f"The {precip_col} column must be numeric. "
-                f"Got type {met_data.dtypes[precip_col]}."
-            )
-        if runoff_coef is None and runoff_threshold is None:
-            raise ValueError(
-                "Either runoff_coef or runoff_threshold must be provided."
-            )
-        if runoff_coef is not None and runoff_threshold is not None:
-            raise ValueError(
-                "Only one of runoff_coef or runoff_threshold can be provided."
-            )
-        try:
-            met_data[date_time_col] = pd.to_datetime(
-                met_data[date_time_col], errors="raise"
-            )
-        except Exception as e:
-            raise ValueError(
-                f"{date_time_col} is not a valid datetime column."
-            )
-
-        time_diff = pd.Timedelta(
-            met_data[date_time_col][1] - met_data[date_time_col][0]
-        )
-        if (time_diff != pd.Timedelta(days=1) and 
-            time_diff != pd.Timedelta(hours=1)):
-            raise ValueError(
-                "Precipitation data must be hourly or daily timesteps. "
-                "Consider resampling your data."
-            )
+        _check_runoff_method(runoff_coef, runoff_threshold)
 
         self.precip_col = precip_col
         self.catchment_area = catchment_area
@@ -171,6 +368,7 @@ class CatchmentRunoffInflows:
         self.met_data = met_data
         self.catchment_runoff_inflows = None
         self.time_diff = time_diff
+        self._times = times
 
     def _calculate_inflows(
             self,
@@ -185,35 +383,21 @@ class CatchmentRunoffInflows:
         """
         Private method for calculating inflows from catchment runoff.
         """
-        if time_diff == pd.Timedelta(hours=1):
-            num_seconds = 3600
-        elif time_diff == pd.Timedelta(days=1):
-            num_seconds = 86400
-
-        met_data[precip_col] = pd.to_numeric(met_data[precip_col])
-        if runoff_coef is not None:
-            inflow_data = (
-                met_data[precip_col] * catchment_area * runoff_coef
-            )
-        elif runoff_threshold is not None:
-            runoff_threshold /= 1000
-            inflow_data = (
-                met_data[precip_col] - runoff_threshold
-            ) * catchment_area
-        
-        inflow_data[inflow_data < 0] = 0
-
-        inflow_data = inflow_data.div(num_seconds)
-
-        catchment_runoff_inflows = pd.DataFrame(
-            {
-                "time": met_data[date_time_col], 
-                "flow": inflow_data
-            }
+        precip = pd.to_numeric(met_data[precip_col]).to_numpy(
+            dtype=np.float64, copy=True
+        )
+        inflow_data = _runoff(
+            precip=precip,
+            num_seconds=time_diff.total_seconds(),
+            catchment_area=catchment_area,
+            runoff_coef=runoff_coef,
+            runoff_threshold=runoff_threshold,
+        )
+        times = _to_datetime(met_data[date_time_col], date_time_col)
+        return pd.DataFrame(
+            {"flow": inflow_data},
+            index=pd.DatetimeIndex(times, name="time")
         )
-        catchment_runoff_inflows.set_index("time", inplace=True)
-
-        return catchment_runoff_inflows
 
     def get_inflows(self) -> pd.DataFrame:
         """Get the inflows timeseries.
@@ -264,16 +448,63 @@ class CatchmentRunoffInflows:
         )
         return self.catchment_runoff_inflows
 
-    def write_inflows(self, file_path: str) -> None:
+    def iter_inflows(
+        self, chunk_size: int = 100000
+    ) -> Iterator[pd.DataFrame]:
+        """Iterate over the inflows timeseries in chunks.
+
+        Inflows are calculated one chunk of `met_data` rows at a time, so
+        the whole timeseries is never held in memory.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Number of timesteps per chunk. Default is 100000.
+
+        Yields
+        ------
+        pd.DataFrame
+            DataFrame of inflow data, as returned by `get_inflows()`.
+        """
+        if chunk_size < 1:
+            raise ValueError(
+                f"chunk_size must be at least 1. Got {chunk_size}."
+            )
+        num_seconds = self.time_diff.total_seconds()
+        for start in range(0, len(self.met_data), chunk_size):
+            stop = start + chunk_size
+            precip = pd.to_numeric(
+                self.met_data[self.precip_col].iloc[start:stop]
+            ).to_numpy(dtype=np.float64, copy=True)
+            flow = _runoff(
+                precip=precip,
+                num_seconds=num_seconds,
+                catchment_area=self.catchment_area,
+                runoff_coef=self.runoff_coef,
+                runoff_threshold=self.runoff_threshold,
+            )
+            yield pd.DataFrame(
+                {"flow": flow},
+                index=pd.DatetimeIndex(self._times[start:stop], name="time")
+            )
+
+    def write_inflows(
+        self, file_path: str, chunk_size: Union[int, None] = None
+    ) -> None:
         """
-        Write the inflow timeseries to a CSV file.
+        Write the inflow timeseries to a CSV or Parquet file.
 
-        Calculates catchment runoff inflows and writes the timeseries to a CSV.
+        Calculates catchment runoff inflows and writes the timeseries to a
+        CSV, or to a Parquet file if `file_path` ends with `.parquet`. See
+        `TimeseriesWriter`.
 
         Parameters
         ----------
         file_path : str
-            Path to the output CSV file.
+            Path to the output CSV or Parquet file.
+        chunk_size : Union[int, None]
+            Calculate and write the inflows this many timesteps at a time
+            (see `iter_inflows()`). Default is None (all at once).
 
         Examples
         --------
@@ -297,6 +528,14 @@ class CatchmentRunoffInflows:
         Call `write_inflows` to write the inflows timeseries to a CSV:
         >>> inflows_data.write_inflows(file_path='runoff.csv')
         """
+        if chunk_size is not None and self.catchment_runoff_inflows is None:
+            with TimeseriesWriter(file_path) as writer:
+                for inflows in self.iter_inflows(chunk_size):
+                    writer.write(
+                        inflows.index.to_numpy(),
+                        {"flow": inflows["flow"].to_numpy()}
+                    )
+            return
         if self.catchment_runoff_inflows is None:
             self.catchment_runoff_inflows = self._calculate_inflows(
                 time_diff=self.time_diff,
@@ -307,4 +546,358 @@ class CatchmentRunoffInflows:
                 runoff_coef=self.runoff_coef,
                 runoff_threshold=self.runoff_threshold
             )
-        self.catchment_runoff_inflows.to_csv(file_path)
+        write_timeseries(
+            file_path,
+            self.catchment_runoff_inflows.index.to_numpy(),
+            {"flow": self.catchment_runoff_inflows["flow"].to_numpy()}
+        )
+
+
+def write_catchment_runoff_inflows(
+    met_file: str,
+    file_path: str,
+    precip_col: str,
+    date_time_col: str,
+    catchment_area: Union[float, int],
+    runoff_coef: Union[float, None] = None,
+    runoff_threshold: Union[float, None] = None,
+    chunk_size: int = 500000,
+) -> None:
+    """Stream catchment runoff inflows from a meteorological CSV file.
+
+    Reads `met_file` `chunk_size` rows at a time, calculates the inflows of
+    each chunk as `CatchmentRunoffInflows` does and appends them to
+    `file_path`, so decades of hourly forcing (e.g., BARRA or Open-Meteo)
+    are processed in bounded memory. Only the datetime and precipitation
+    columns are read.
+
+    Parameters
+    ----------
+    met_file : str
+        Path to the CSV file of meteorological data.
+    file_path : str
+        Path to the output CSV or Parquet file.
+    precip_col : str
+        Name of the precipitation column (m per timestep).
+    date_time_col : str
+        Name of the datetime column.
+    catchment_area : Union[float, int]
+        Area of the catchment in square meters.
+    runoff_coef : Union[float, None]
+        Runoff coefficient for the catchment. Default is None.
+    runoff_threshold : Union[float, None]
+        Runoff threshold for the catchment in mm. Default is None.
+    chunk_size : int
+        Number of rows per chunk. Must be at least 2. Default is 500000.
+
+    Examples
+    --------
+    >>> from glmpy import inflows
+    >>> inflows.write_catchment_runoff_inflows(
+    ...     met_file="barra_hourly.csv",
+    ...     file_path="bcs/runoff.csv",
+    ...     precip_col="Rain",
+    ...     date_time_col="Date",
+    ...     catchment_area=1000,
+    ...     runoff_coef=0.5
+    ... )
+    """
+    if chunk_size < 2:
+        raise ValueError(f"chunk_size must be at least 2. Got {chunk_size}.")
+    chunks = pd.read_csv(
+        met_file,
+        usecols=[date_time_col, precip_col],
+        chunksize=chunk_size,
+        float_precision="round_trip",
+    )
+    inflows = None
+    last_time = None
+    with TimeseriesWriter(file_path) as writer:
+        for met_data in chunks:
+            if inflows is None:
+                # Validates the arguments and the timestep of the first chunk
+                inflows = CatchmentRunoffInflows(
+                    met_data=met_data,
+                    precip_col=precip_col,
+                    date_time_col=date_time_col,
+                    catchment_area=catchment_area,
+                    runoff_coef=runoff_coef,
+                    runoff_threshold=runoff_threshold,
+                )
+                times = inflows._times
+            else:
+                times = _to_datetime(
+                    met_data[date_time_col], date_time_col
+                )
+                step = inflows.time_diff.to_timedelta64()
+                if times[0] - last_time != step or np.any(
+                    np.diff(times) != step
+                ):
+                    raise ValueError(
+                        "Precipitation data must have a regular timestep. "
+                        "Consider resampling your data."
+                    )
+            precip = pd.to_numeric(met_data[precip_col]).to_numpy(
+                dtype=np.float64, copy=True
+            )
+            flow = _runoff(
+                precip=precip,
+                num_seconds=inflows.time_diff.total_seconds(),
+                catchment_area=catchment_area,
+                runoff_coef=runoff_coef,
+                runoff_threshold=runoff_threshold,
+            )
+            writer.write(times, {"flow": flow})
+            last_time = times[-1]
+
+
+class MultiCatchmentRunoffInflows:
+    """Calculate runoff inflows for several sub-catchments and scenarios.
+
+    Calculates runoff as `CatchmentRunoffInflows` does, but for arrays of
+    catchment areas, runoff coefficients and runoff thresholds, and returns
+    a dictionary of BCs keyed by sub-catchment rather than a single
+    timeseries. The inflows of every sub-catchment
+    in every scenario are calculated at once by broadcasting the
+    precipitation timeseries against the parameter arrays.
+
+    Parameter arrays have one value per sub-catchment along their last axis
+    and, optionally, one row per scenario along their first axis. They are
+    broadcast together, so a 1-D array of areas can be combined with a 2-D
+    array of coefficients (one row per scenario).
+
+    Attributes
+    ----------
+    met_data : pd.DataFrame
+        A pandas DataFrame of meteorological data.
+    precip_col : str
+        Name of the column in the DataFrame containing precipitation data in
+        m per timestep.
+    date_time_col : str
+        Name of the column in the DataFrame containing datetime data.
+    catchment_names : List[str]
+        Name of each sub-catchment. Used as the BC key, so it should match
+        the file name of the sub-catchment's `inflow_fl` without the
+        extension, e.g., `"urban_inflow"` for
+        `"bcs/catchment/urban_inflow.csv"`.
+    catchment_areas : np.ndarray
+        Area of each sub-catchment in square meters.
+    runoff_coefs : Union[np.ndarray, None]
+        Runoff coefficient of each sub-catchment. Either `runoff_coefs` or
+        `runoff_thresholds` must be provided.
+    runoff_thresholds : Union[np.ndarray, None]
+        Runoff threshold of each sub-catchment in mm.
+    columns : Union[Dict[str, Union[float, np.ndarray]], None]
+        Other BC columns (e.g., `temp`, `salt` and tracers), each a constant
+        or an array with one value per timestep, added after `flow` for
+        every sub-catchment. Default is None.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from glmpy import inflows
+
+    Two sub-catchments under three scenarios of runoff coefficient:
+    >>> multi_inflows = inflows.MultiCatchmentRunoffInflows(
+    ...     met_data=daily_met_data,
+    ...     precip_col='Rain',
+    ...     date_time_col='Date',
+    ...     catchment_names=['urban_inflow', 'rural_inflow'],
+    ...     catchment_areas=[2.0e5, 8.0e5],
+    ...     runoff_coefs=np.array([
+    ...         [0.4, 0.05],
+    ...         [0.5, 0.10],
+    ...         [0.6, 0.15],
+    ...     ]),
+    ...     columns={'temp': 18.0, 'salt': 0.5}
+    ... )
+    >>> multi_inflows.get_flows().shape
+    (3, 2, 2922)
+
+    Set the inflow BCs of one simulation per scenario:
+    >>> multi_inflows.set_sim_bcs(glm_sims)
+    """
+    def __init__(
+        self,
+        met_data: pd.DataFrame,
+        precip_col: str,
+        date_time_col: str,
+        catchment_names: List[str],
+        catchment_areas: Union[np.ndarray, List[float]],
+        runoff_coefs: Union[np.ndarray, List[float], None] = None,
+        runoff_thresholds: Union[np.ndarray, List[float], None] = None,
+        columns: Union[Dict[str, Union[float, np.ndarray]], None] = None,
+    ):
+        times, time_diff = _check_met_data(
+            met_data, precip_col, date_time_col
+        )
+        _check_runoff_method(runoff_coefs, runoff_thresholds)
+        runoff_params = runoff_coefs
+        if runoff_params is None:
+            runoff_params = runoff_thresholds
+        try:
+            areas, runoff_params = np.broadcast_arrays(
+                np.asarray(catchment_areas, dtype=np.float64),
+                np.asarray(runoff_params, dtype=np.float64),
+            )
+        except ValueError:
+            raise ValueError(
+                "catchment_areas and the runoff parameters must broadcast "
+                f"together. Got shapes {np.shape(catchment_areas)} and "
+                f"{np.shape(runoff_params)}."
+            )
+        if areas.ndim not in (1, 2):
+            raise ValueError(
+                "Parameter arrays must have one or two dimensions "
+                f"(scenarios x sub-catchments). Got shape {areas.shape}."
+            )
+        areas = np.atleast_2d(areas)
+        runoff_params = np.atleast_2d(runoff_params)
+        if areas.shape[1] != len(catchment_names):
+            raise ValueError(
+                f"Got {len(catchment_names)} catchment_names but parameters "
+                f"for {areas.shape[1]} sub-catchments."
+            )
+        if np.any(areas < 0):
+            raise ValueError("catchment_areas must be positive values.")
+        columns = dict(columns) if columns is not None else {}
+        for name, values in columns.items():
+            if np.ndim(values) not in (0, 1) or (
+                np.ndim(values) == 1 and len(values) != len(times)
+            ):
+                raise ValueError(
+                    f"The {name} column must be a constant or have one value "
+                    f"per timestep ({len(times)})."
+                )
+
+        self.precip_col = precip_col
+        self.date_time_col = date_time_col
+        self.met_data = met_data
+        self.catchment_names = list(catchment_names)
+        self.catchment_areas = areas
+        if runoff_coefs is not None:
+            self.runoff_coefs = runoff_params
+            self.runoff_thresholds = None
+        else:
+            self.runoff_coefs = None
+            self.runoff_thresholds = runoff_params
+        self.columns = columns
+        self.time_diff = time_diff
+        self._times = times
+
+    @property
+    def num_scenarios(self) -> int:
+        return self.catchment_areas.shape[0]
+
+    def _precip(self) -> np.ndarray:
+        return pd.to_numeric(self.met_data[self.precip_col]).to_numpy(
+            dtype=np.float64, copy=True
+        )
+
+    def _scenario_flows(
+        self, precip: np.ndarray, scenarios: Union[slice, int]
+    ) -> np.ndarray:
+        runoff_coefs = self.runoff_coefs
+        runoff_thresholds = self.runoff_thresholds
+        if runoff_coefs is not None:
+            runoff_coefs = runoff_coefs[scenarios, ..., np.newaxis]
+        else:
+            runoff_thresholds = runoff_thresholds[scenarios, ..., np.newaxis]
+        return _runoff(
+            precip=precip,
+            num_seconds=self.time_diff.total_seconds(),
+            catchment_area=self.catchment_areas[scenarios, ..., np.newaxis],
+            runoff_coef=runoff_coefs,
+            runoff_threshold=runoff_thresholds,
+        )
+
+    def get_flows(self) -> np.ndarray:
+        """Inflows (m^3/s) of every scenario and sub-catchment.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (scenarios, sub-catchments, timesteps).
+        """
+        return self._scenario_flows(self._precip(), slice(None))
+
+    def get_inflows(self, scenario: int = 0) -> Dict[str, pd.DataFrame]:
+        """Inflow BCs of one scenario.
+
+        Parameters
+        ----------
+        scenario : int
+            Index of the scenario. Default is 0.
+
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            DataFrame with `time`, `flow` (m^3/s) and `columns` columns for
+            each sub-catchment, keyed by name.
+        """
+        flows = self._scenario_flows(self._precip(), scenario)
+        return self._to_bcs(flows)
+
+    def _to_bcs(self, flows: np.ndarray) -> Dict[str, pd.DataFrame]:
+        time = pd.DatetimeIndex(self._times)
+        bcs = {}
+        for name, flow in zip(self.catchment_names, flows):
+            bcs[name] = pd.DataFrame(
+                {"time": time, "flow": flow, **self.columns}
+            )
+        return bcs
+
+    def iter_scenario_inflows(self) -> Iterator[Dict[str, pd.DataFrame]]:
+        """Iterate over the inflow BCs of each scenario.
+
+        The precipitation is converted once and each scenario's inflows
+        are calculated as they are needed, so memory does not grow with the
+        number of scenarios.
+        """
+        precip = self._precip()
+        for scenario in range(self.num_scenarios):
+            yield self._to_bcs(self._scenario_flows(precip, scenario))
+
+    def set_sim_bcs(self, glm_sims: List[Any]):
+        """Set the inflow BCs of one simulation per scenario.
+
+        Each simulation gets its own copy of its `bcs` dictionary (the
+        other BC DataFrames are not copied) with an entry per sub-catchment,
+        so simulations that shared a BC store, such as the members of a
+        `SimTemplate`, keep their other BCs shared.
+
+        Parameters
+        ----------
+        glm_sims : List[GLMSim]
+            One simulation per scenario, or a single simulation if there is
+            one scenario.
+        """
+        if len(glm_sims) != self.num_scenarios:
+            raise ValueError(
+                f"Got {len(glm_sims)} simulations for {self.num_scenarios} "
+                "scenarios."
+            )
+        for glm_sim, bcs in zip(glm_sims, self.iter_scenario_inflows()):
+            sim_bcs = type(glm_sim.bcs)(glm_sim.bcs)
+            sim_bcs.update(bcs)
+            glm_sim.bcs = sim_bcs
+
+    def write_inflows(self, dir_path: str, scenario: int = 0) -> None:
+        """Write the inflow BCs of one scenario to `<name>.csv` files.
+
+        Parameters
+        ----------
+        dir_path : str
+            Directory to write the files to.
+        scenario : int
+            Index of the scenario. Default is 0.
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        flows = self._scenario_flows(self._precip(), scenario)
+        for name, flow in zip(self.catchment_names, flows):
+            columns = {"flow": flow}
+            for column, values in self.columns.items():
+                columns[column] = np.broadcast_to(values, flow.shape)
+            write_timeseries(
+                os.path.join(dir_path, f"{name}.csv"), self._times, columns
+            )
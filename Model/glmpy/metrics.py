@@ -0,0 +1,537 @@
+import numpy as np
+import pandas as pd
+
+from typing import Union, List, Tuple, Dict
+
+
+def parse_glm_time(time: pd.Series) -> np.ndarray:
+    """Parse the `time` column of a GLM CSV output.
+
+    GLM writes end-of-day timestamps with hours of 24 or more (e.g.,
+    `"2010-01-01 24:00:00"`), which `pd.to_datetime` rejects. The date and
+    time parts are parsed separately and summed so that the whole column is
+    converted without a Python loop.
+
+    Parameters
+    ----------
+    time : pd.Series
+        Strings in the format `"%Y-%m-%d %H:%M:%S"`.
+
+    Returns
+    -------
+    np.ndarray
+        Array of `datetime64[ns]`.
+    """
+    time = time.astype(str).str.strip()
+    dates = pd.to_datetime(time.str.slice(0, 10), format="%Y-%m-%d")
+    clock = time.str.slice(11).str.split(":", expand=True)
+    seconds = np.zeros(len(time), dtype=np.int64)
+    for multiplier, col in zip((3600, 60, 1), clock.columns):
+        seconds += clock[col].fillna("0").astype(np.int64).to_numpy() * (
+            multiplier
+        )
+    return (
+        dates.to_numpy(dtype="datetime64[ns]")
+        + seconds.astype("timedelta64[s]")
+    ).astype("datetime64[ns]")
+
+
+def read_glm_csv(
+    csv_path: str, columns: Union[List[str], str, None] = None
+) -> pd.DataFrame:
+    """Read a GLM CSV output such as `lake.csv` or `WQ_*.csv`.
+
+    Parameters
+    ----------
+    csv_path : str
+        Path to the CSV file.
+    columns : Union[List[str], str, None]
+        Columns to read in addition to `time`. Default is None (all
+        columns).
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with `time` parsed to `datetime64[ns]`.
+    """
+    if isinstance(columns, str):
+        columns = [columns]
+    usecols = None if columns is None else ["time"] + list(columns)
+    df = pd.read_csv(csv_path, usecols=usecols, skipinitialspace=True)
+    df["time"] = parse_glm_time(df["time"])
+    return df
+
+
+def read_ensemble_csv(
+    csv_paths: List[str], column: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Read a column from the CSV outputs of many GLM runs.
+
+    The runs must share a time axis, e.g., ensemble members over the same
+    simulation period.
+
+    Parameters
+    ----------
+    csv_paths : List[str]
+        Paths to the CSV file of each run.
+    column : str
+        Column to read, e.g., `"Lake Level"`.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The `datetime64[ns]` times with shape `(num_times,)` and the values
+        with shape `(num_runs, num_times)`.
+    """
+    times = None
+    values = []
+    for csv_path in csv_paths:
+        df = read_glm_csv(csv_path, column)
+        if times is None:
+            times = df["time"].to_numpy()
+        elif len(df) != len(times) or not np.array_equal(
+            df["time"].to_numpy(), times
+        ):
+            raise ValueError(
+                f"The time axis of {csv_path} differs from {csv_paths[0]}."
+            )
+        values.append(df[column].to_numpy(dtype=np.float64))
+    return times, np.stack(values)
+
+
+def read_glm_nc(
+    nc_path: str, var: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read a profile variable from a GLM `output.nc`.
+
+    Parameters
+    ----------
+    nc_path : str
+        Path to the NetCDF file.
+    var : str
+        Name of the profile variable, e.g., `"temp"`.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        The `datetime64[ns]` times with shape `(num_times,)`, the layer
+        heights above the lake bottom and the variable values, both with
+        shape `(num_times, num_layers)`. Inactive layers are NaN.
+    """
+    import netCDF4
+
+    with netCDF4.Dataset(nc_path, "r") as nc:
+        start = np.datetime64(
+            pd.Timestamp(nc.start_time).to_datetime64(), "ns"
+        )
+        hours = np.asarray(nc.variables["time"][:], dtype=np.float64)
+        num_layers = np.asarray(nc.variables["NS"][:], dtype=np.int64)
+        heights = np.ma.filled(
+            nc.variables["z"][:, :, 0, 0].astype(np.float64), np.nan
+        )
+        values = np.ma.filled(
+            nc.variables[var][:, :, 0, 0].astype(np.float64), np.nan
+        )
+    times = start + (hours * 3.6e12).astype("timedelta64[ns]")
+    inactive = np.arange(heights.shape[1]) >= num_layers[:, np.newaxis]
+    heights[inactive] = np.nan
+    values[inactive] = np.nan
+    return times, heights, values
+
+
+def _pairwise(sim: np.ndarray, obs: np.ndarray):
+    sim = np.asarray(sim, dtype=np.float64)
+    obs = np.broadcast_to(np.asarray(obs, dtype=np.float64), sim.shape)
+    valid = np.isfinite(sim) & np.isfinite(obs)
+    sim = np.where(valid, sim, np.nan)
+    obs = np.where(valid, obs, np.nan)
+    return sim, obs
+
+
+def bias(sim: np.ndarray, obs: np.ndarray) -> np.ndarray:
+    """Mean error of simulated values against observations.
+
+    Metrics in this module operate along the last axis so that leading axes
+    can hold ensemble members. Pairs where either value is NaN are ignored.
+
+    Parameters
+    ----------
+    sim : np.ndarray
+        Simulated values with shape `(..., num_obs)`.
+    obs : np.ndarray
+        Observed values broadcastable to the shape of `sim`.
+
+    Returns
+    -------
+    np.ndarray
+        The metric with shape `sim.shape[:-1]`.
+    """
+    sim, obs = _pairwise(sim, obs)
+    return np.nanmean(sim - obs, axis=-1)
+
+
+def rmse(sim: np.ndarray, obs: np.ndarray) -> np.ndarray:
+    """Root mean square error of simulated values against observations.
+
+    See `bias()` for the shape conventions.
+    """
+    sim, obs = _pairwise(sim, obs)
+    return np.sqrt(np.nanmean((sim - obs) ** 2, axis=-1))
+
+
+def nse(sim: np.ndarray, obs: np.ndarray) -> np.ndarray:
+    """Nash-Sutcliffe efficiency of simulated values against observations.
+
+    See `bias()` for the shape conventions.
+    """
+    sim, obs = _pairwise(sim, obs)
+    obs_mean = np.nanmean(obs, axis=-1, keepdims=True)
+    return 1.0 - (
+        np.nansum((sim - obs) ** 2, axis=-1)
+        / np.nansum((obs - obs_mean) ** 2, axis=-1)
+    )
+
+
+def kge(sim: np.ndarray, obs: np.ndarray) -> np.ndarray:
+    """Kling-Gupta efficiency of simulated values against observations.
+
+    Uses the Gupta et al. (2009) formulation with the ratio of standard
+    deviations. See `bias()` for the shape conventions.
+    """
+    sim, obs = _pairwise(sim, obs)
+    sim_mean = np.nanmean(sim, axis=-1, keepdims=True)
+    obs_mean = np.nanmean(obs, axis=-1, keepdims=True)
+    sim_std = np.nanstd(sim, axis=-1)
+    obs_std = np.nanstd(obs, axis=-1)
+    cov = np.nanmean((sim - sim_mean) * (obs - obs_mean), axis=-1)
+    r = cov / (sim_std * obs_std)
+    alpha = sim_std / obs_std
+    beta = sim_mean[..., 0] / obs_mean[..., 0]
+    return 1.0 - np.sqrt(
+        (r - 1.0) ** 2 + (alpha - 1.0) ** 2 + (beta - 1.0) ** 2
+    )
+
+
+def percentile_error(
+    sim: np.ndarray, obs: np.ndarray, q: Union[float, List[float]]
+) -> np.ndarray:
+    """Difference between simulated and observed percentiles.
+
+    See `bias()` for the shape conventions.
+
+    Parameters
+    ----------
+    sim : np.ndarray
+        Simulated values with shape `(..., num_obs)`.
+    obs : np.ndarray
+        Observed values broadcastable to the shape of `sim`.
+    q : Union[float, List[float]]
+        Percentiles between 0 and 100.
+
+    Returns
+    -------
+    np.ndarray
+        The difference with shape `sim.shape[:-1]` for a single percentile or
+        `(len(q),) + sim.shape[:-1]` for a list.
+    """
+    sim, obs = _pairwise(sim, obs)
+    return np.nanpercentile(sim, q, axis=-1) - np.nanpercentile(
+        obs, q, axis=-1
+    )
+
+
+def skill(
+    sim: np.ndarray,
+    obs: np.ndarray,
+    percentiles: Union[List[float], None] = None,
+) -> pd.DataFrame:
+    """Calculate all skill metrics for each ensemble member.
+
+    Parameters
+    ----------
+    sim : np.ndarray
+        Simulated values with shape `(num_members, num_obs)` or
+        `(num_obs,)`.
+    obs : np.ndarray
+        Observed values with shape `(num_obs,)`.
+    percentiles : Union[List[float], None]
+        Percentiles to compare, e.g., `[10, 50, 90]`. Default is None.
+
+    Returns
+    -------
+    pd.DataFrame
+        A row for each member with `rmse`, `nse`, `kge`, `bias`, `n` and a
+        `p<q>_error` column for each percentile.
+    """
+    sim = np.atleast_2d(np.asarray(sim, dtype=np.float64))
+    obs = np.asarray(obs, dtype=np.float64)
+    results = {
+        "rmse": rmse(sim, obs),
+        "nse": nse(sim, obs),
+        "kge": kge(sim, obs),
+        "bias": bias(sim, obs),
+        "n": np.sum(np.isfinite(sim) & np.isfinite(obs), axis=-1),
+    }
+    if percentiles:
+        errors = np.atleast_2d(percentile_error(sim, obs, percentiles))
+        for q, error in zip(percentiles, errors.reshape(len(percentiles), -1)):
+            results[f"p{q:g}_error"] = error
+    return pd.DataFrame(results)
+
+
+class ObservationSet:
+    """Observations indexed once for matching against many GLM runs.
+
+    Loads an observation DataFrame (e.g., from the data warehouse parquet
+    files) once, sorts it by time and stores it as NumPy arrays. Model
+    outputs are then matched to the observations with a vectorised
+    equivalent of `pd.merge_asof` on time, and optionally on depth for
+    profile outputs. The index of matching model timesteps is cached for
+    the last model time axis seen (compared by value), so matching every
+    member of an ensemble over the same period only searches the time axis
+    once.
+
+    Create the `ObservationSet` before a sweep and use it inside the
+    `on_sim_end` callback of `MultiSim.run()` rather than re-reading the
+    field data for every simulation.
+
+    Attributes
+    ----------
+    obs : pd.DataFrame
+        The observations.
+    time_col : str
+        Name of the datetime column. Default is `"DateTime"`.
+    value_col : str
+        Name of the value column. Default is `"Reading"`.
+    depth_col : Union[str, None]
+        Name of the column of observation depths below the surface (m).
+        Default is None.
+    tolerance : Union[str, pd.Timedelta]
+        Maximum time difference between an observation and a model output.
+        Default is `"12h"`.
+    direction : str
+        Whether to match the `"nearest"`, `"backward"` (previous) or
+        `"forward"` (next) model output. Default is `"nearest"`.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from glmpy import metrics
+    >>> field = pd.read_parquet(
+    ...     "Data/data-warehouse/parquet/level/lakelevel.parquet"
+    ... )
+    >>> obs = metrics.ObservationSet(field, tolerance="1D")
+    >>> times, levels = metrics.read_ensemble_csv(
+    ...     ["sim_0/output/lake.csv", "sim_1/output/lake.csv"], "Lake Level"
+    ... )
+    >>> obs.skill(times, levels - 14.6)
+    """
+
+    def __init__(
+        self,
+        obs: pd.DataFrame,
+        time_col: str = "DateTime",
+        value_col: str = "Reading",
+        depth_col: Union[str, None] = None,
+        tolerance: Union[str, pd.Timedelta] = "12h",
+        direction: str = "nearest",
+    ):
+        if direction not in ("nearest", "backward", "forward"):
+            raise ValueError(
+                "direction must be 'nearest', 'backward' or 'forward'. Got "
+                f"{direction}."
+            )
+        for col in (time_col, value_col, depth_col):
+            if col is not None and col not in obs.columns:
+                raise ValueError(f"{col} not in DataFrame columns.")
+        cols = [time_col, value_col] + ([depth_col] if depth_col else [])
+        obs = obs[cols].dropna().sort_values(time_col, kind="stable")
+        self.obs = obs.reset_index(drop=True)
+        self.time_col = time_col
+        self.value_col = value_col
+        self.depth_col = depth_col
+        self.tolerance = pd.Timedelta(tolerance)
+        self.direction = direction
+        self.times = pd.to_datetime(self.obs[time_col]).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        self.values = self.obs[value_col].to_numpy(dtype=np.float64)
+        self.depths = (
+            None
+            if depth_col is None
+            else self.obs[depth_col].to_numpy(dtype=np.float64)
+        )
+        self._cached_model_times = None
+        self._cached_index = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _time_index(self, model_times: np.ndarray) -> np.ndarray:
+        """Index of the matching model timestep for each observation.
+
+        Unmatched observations have an index of -1.
+        """
+        model_times = np.asarray(model_times, dtype="datetime64[ns]")
+        cached = self._cached_model_times
+        # Compared by content against a private copy, so a time axis that
+        # the caller edits in place is not matched to a stale index
+        if (
+            cached is not None
+            and cached.shape == model_times.shape
+            and np.array_equal(cached, model_times)
+        ):
+            return self._cached_index
+        model_ns = model_times.view(np.int64)
+        obs_ns = self.times.view(np.int64)
+        n = len(model_ns)
+        right = np.searchsorted(model_ns, obs_ns, side="left")
+        left = np.searchsorted(model_ns, obs_ns, side="right") - 1
+        prev_idx = np.clip(left, 0, n - 1)
+        next_idx = np.clip(right, 0, n - 1)
+        prev_gap = np.where(left >= 0, obs_ns - model_ns[prev_idx], np.inf)
+        next_gap = np.where(right < n, model_ns[next_idx] - obs_ns, np.inf)
+        if self.direction == "backward":
+            index, gap = prev_idx, prev_gap
+        elif self.direction == "forward":
+            index, gap = next_idx, next_gap
+        else:
+            use_next = next_gap < prev_gap
+            index = np.where(use_next, next_idx, prev_idx)
+            gap = np.where(use_next, next_gap, prev_gap)
+        index = np.where(gap <= self.tolerance.value, index, -1)
+        self._cached_model_times = model_times.copy()
+        self._cached_index = index
+        return index
+
+    def match(
+        self, model_times: np.ndarray, model_values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Match model outputs to the observations in time.
+
+        Parameters
+        ----------
+        model_times : np.ndarray
+            Model output times with shape `(num_times,)`.
+        model_values : np.ndarray
+            Model values with shape `(num_times,)` for a single run or
+            `(num_members, num_times)` for an ensemble.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The matched model values with shape `(..., num_matched)` and the
+            observed values with shape `(num_matched,)`.
+        """
+        index = self._time_index(model_times)
+        matched = index >= 0
+        model_values = np.asarray(model_values, dtype=np.float64)
+        return model_values[..., index[matched]], self.values[matched]
+
+    def match_profile(
+        self,
+        model_times: np.ndarray,
+        layer_heights: np.ndarray,
+        model_values: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Match model profiles to the observations in time and depth.
+
+        Each observation is matched to the model layer that contains the
+        observation depth below the lake surface at the matched timestep.
+
+        Parameters
+        ----------
+        model_times : np.ndarray
+            Model output times with shape `(num_times,)`.
+        layer_heights : np.ndarray
+            Height of the top of each layer above the lake bottom with shape
+            `(num_times, num_layers)`. Inactive layers are NaN.
+        model_values : np.ndarray
+            Model values with shape `(num_times, num_layers)` for a single
+            run or `(num_members, num_times, num_layers)` for an ensemble.
+            Ensemble members must share `layer_heights`.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The matched model values with shape `(..., num_matched)` and the
+            observed values with shape `(num_matched,)`.
+        """
+        if self.depths is None:
+            raise ValueError(
+                "depth_col must be set to match observations to profiles."
+            )
+        index = self._time_index(model_times)
+        matched = np.flatnonzero(index >= 0)
+        heights = layer_heights[index[matched]]
+        surface = np.nanmax(heights, axis=1)
+        target = surface - self.depths[matched]
+        layer = np.sum(heights < target[:, np.newaxis], axis=1)
+        num_active = np.sum(np.isfinite(heights), axis=1)
+        in_lake = (target >= 0.0) & (layer < num_active)
+        layer = np.minimum(layer, heights.shape[1] - 1)
+        model_values = np.asarray(model_values, dtype=np.float64)
+        sim = model_values[..., index[matched], layer]
+        sim = np.where(in_lake, sim, np.nan)
+        return sim, self.values[matched]
+
+    def skill(
+        self,
+        model_times: np.ndarray,
+        model_values: np.ndarray,
+        percentiles: Union[List[float], None] = None,
+    ) -> pd.DataFrame:
+        """Calculate skill metrics of model outputs against the observations.
+
+        Parameters
+        ----------
+        model_times : np.ndarray
+            Model output times with shape `(num_times,)`.
+        model_values : np.ndarray
+            Model values with shape `(num_times,)` for a single run or
+            `(num_members, num_times)` for an ensemble.
+        percentiles : Union[List[float], None]
+            Percentiles to compare. Default is None.
+
+        Returns
+        -------
+        pd.DataFrame
+            A row of metrics for each member. See `skill()`.
+        """
+        sim, obs = self.match(model_times, model_values)
+        return skill(sim, obs, percentiles)
+
+    def skill_from_csv(
+        self,
+        csv_path: str,
+        column: str,
+        offset: float = 0.0,
+        percentiles: Union[List[float], None] = None,
+    ) -> Dict[str, float]:
+        """Calculate skill metrics of a column of a GLM CSV output.
+
+        Convenience method for `on_sim_end` callbacks that score a single
+        run.
+
+        Parameters
+        ----------
+        csv_path : str
+            Path to the CSV output, e.g., `lake.csv`.
+        column : str
+            Column to compare, e.g., `"Lake Level"`.
+        offset : float
+            Value added to the model output before comparison, e.g., to
+            convert the lake level to a datum. Default is 0.0.
+        percentiles : Union[List[float], None]
+            Percentiles to compare. Default is None.
+
+        Returns
+        -------
+        Dict[str, float]
+            The metrics of the run.
+        """
+        df = read_glm_csv(csv_path, column)
+        values = df[column].to_numpy(dtype=np.float64) + offset
+        return self.skill(
+            df["time"].to_numpy(), values, percentiles
+        ).iloc[0].to_dict()
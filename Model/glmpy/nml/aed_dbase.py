@@ -1,5 +1,13 @@
-from typing import Union, List
-from glmpy.nml.nml import BLOCK_REGISTER, NMLParam, NMLBlock, NML
+import csv
+import copy
+import inspect
+import numpy as np
+
+from collections import OrderedDict
+from typing import Union, List, Dict, Type
+from glmpy.nml.nml import (
+    BLOCK_REGISTER, NMLParam, NMLBlock, NML, NMLReader, NMLWriter
+)
 
 
 @BLOCK_REGISTER.register()
@@ -7,6 +15,7 @@ class PhytoDataBlock(NMLBlock):
     block_name = "phyto_data"
     file_name = "aed_phyto_pars"
     param_prefix = "pd%"
+    name_param = "p_name"
 
     def __init__(
         self,
@@ -128,4 +137,397 @@ class ZoopParamsBlock(NMLBlock):
     block_name = "zoop_params"
     file_name = "aed_zoop_pars"
     param_prefix = "zoop_param%"
+    name_param = "zoop_name"
+
+
+@BLOCK_REGISTER.register()
+class MacrophyteDataBlock(NMLBlock):
+    block_name = "macrophyte_data"
+    file_name = "aed_macrophyte_pars"
+    param_prefix = "macrophyte_param%"
+    name_param = "m_name"
+
+
+_param_types_cache = {}
+
+
+def _param_types(block_type: Type[NMLBlock]) -> Dict[str, type]:
+    param_types = _param_types_cache.get(block_type)
+    if param_types is None:
+        param_types = {
+            key: param.type for key, param in block_type().params.items()
+        }
+        _param_types_cache[block_type] = param_types
+    return param_types
+
+
+def _format_number(value: float) -> str:
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class DBaseTable:
+    """Array-backed table of an AED database, one column per group.
+
+    Holds the numeric traits of every group (e.g., every phytoplankton
+    group of `aed_phyto_pars`) in a single 2-D float array, so that traits
+    can be read, perturbed and written for all groups at once and groups
+    can be added or removed without rebuilding dozens of list parameters.
+    Converts to and from the database's `NMLBlock`, its `.csv` file and its
+    `.nml` file.
+
+    Rows of the `.csv` file that are not numeric (e.g., the prey names of
+    `aed_zoop_pars`) are kept as text and written back unchanged.
+
+    Attributes
+    ----------
+    names : List[str]
+        Group names, one per column.
+    traits : List[str]
+        Trait (parameter) names, one per row, lowercase as in the block.
+    values : np.ndarray
+        Trait values with shape `(len(traits), len(names))`.
+    block_type : Type[NMLBlock]
+        The database block, e.g., `PhytoDataBlock`.
+    labels : Dict[str, str]
+        Row labels to use in `.csv` files where they differ from the trait
+        name, e.g., `{"r_growth": "R_growth"}`.
+    text : Dict[str, List[str]]
+        Non-numeric rows, keyed by their `.csv` label.
+
+    Examples
+    --------
+    >>> from glmpy.nml.aed_dbase import DBaseTable
+    >>> phyto = DBaseTable.from_csv("case_studies/aed_phyto_pars.csv")
+    >>> phyto.scale("r_growth", 1.1)
+    >>> phyto = phyto.select(["cyano", "diatom"])
+    >>> phyto.to_csv("aed/aed_phyto_pars.csv")
+    >>> block = phyto.to_block()
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        traits: List[str],
+        values: np.ndarray,
+        block_type: Type[NMLBlock] = PhytoDataBlock,
+        labels: Union[Dict[str, str], None] = None,
+        text: Union[Dict[str, List[str]], None] = None,
+    ):
+        values = np.array(values, dtype=np.float64, ndmin=2)
+        if values.shape != (len(traits), len(names)):
+            raise ValueError(
+                f"values must have shape ({len(traits)}, {len(names)}) for "
+                f"{len(traits)} traits and {len(names)} groups. Got "
+                f"{values.shape}."
+            )
+        if len(set(traits)) != len(traits):
+            raise ValueError(f"Duplicate traits in {traits}.")
+        self.names = list(names)
+        self.traits = list(traits)
+        self.values = values
+        self.block_type = block_type
+        self.labels = dict(labels) if labels is not None else {}
+        self.text = OrderedDict(text) if text is not None else OrderedDict()
+        self._rows = {trait: i for i, trait in enumerate(self.traits)}
+
+    @property
+    def num_groups(self) -> int:
+        return len(self.names)
+
+    def copy(self) -> "DBaseTable":
+        return DBaseTable(
+            self.names,
+            self.traits,
+            self.values.copy(),
+            self.block_type,
+            self.labels,
+            copy.deepcopy(self.text),
+        )
+
+    def _row(self, trait: str) -> int:
+        row = self._rows.get(trait.lower())
+        if row is None:
+            raise KeyError(f"{trait} is not a trait of the table.")
+        return row
+
+    def _columns(self, groups: Union[List[str], None]) -> Union[slice, list]:
+        if groups is None:
+            return slice(None)
+        missing = [group for group in groups if group not in self.names]
+        if missing:
+            raise KeyError(f"{missing} are not groups of the table.")
+        return [self.names.index(group) for group in groups]
+
+    def get(self, trait: str) -> np.ndarray:
+        """Values of a trait for every group (a view of `values`)."""
+        return self.values[self._row(trait)]
+
+    def set(
+        self,
+        trait: str,
+        values: Union[float, np.ndarray],
+        groups: Union[List[str], None] = None,
+    ):
+        """Set a trait for every group, or for `groups`.
+
+        `values` is broadcast, so a scalar sets the trait of every group.
+        """
+        self.values[self._row(trait), self._columns(groups)] = values
+
+    def scale(
+        self,
+        trait: str,
+        factor: Union[float, np.ndarray],
+        groups: Union[List[str], None] = None,
+    ):
+        """Multiply a trait by `factor` for every group, or for `groups`."""
+        self.values[self._row(trait), self._columns(groups)] *= factor
+
+    def perturb(self, factors: Dict[str, Union[float, np.ndarray]]):
+        """Multiply several traits at once.
+
+        Parameters
+        ----------
+        factors : Dict[str, Union[float, np.ndarray]]
+            Factor for each trait, as a scalar or one value per group.
+        """
+        rows = [self._row(trait) for trait in factors.keys()]
+        factor_array = np.array(
+            [
+                np.broadcast_to(factor, (self.num_groups,))
+                for factor in factors.values()
+            ],
+            dtype=np.float64,
+        )
+        self.values[rows] *= factor_array
+
+    def select(self, groups: List[str]) -> "DBaseTable":
+        """A new table with only `groups`, in the given order."""
+        columns = self._columns(groups)
+        text = OrderedDict(
+            (label, [row[i] for i in columns])
+            for label, row in self.text.items()
+        )
+        return DBaseTable(
+            groups,
+            self.traits,
+            self.values[:, columns],
+            self.block_type,
+            self.labels,
+            text,
+        )
+
+    def drop(self, groups: List[str]) -> "DBaseTable":
+        """A new table without `groups`."""
+        self._columns(groups)
+        return self.select(
+            [group for group in self.names if group not in groups]
+        )
+
+    def add_group(
+        self,
+        name: str,
+        like: Union[str, None] = None,
+        values: Union[Dict[str, float], None] = None,
+    ) -> "DBaseTable":
+        """A new table with an added group.
+
+        Parameters
+        ----------
+        name : str
+            Name of the new group.
+        like : Union[str, None]
+            Group to copy the traits from. Default is None (all traits
+            are NaN unless given in `values`).
+        values : Union[Dict[str, float], None]
+            Trait values of the new group, overriding those of `like`.
+        """
+        if name in self.names:
+            raise ValueError(f"{name} is already a group of the table.")
+        if like is not None:
+            column = self.values[:, self._columns([like])[0]].copy()
+            text_column = {
+                label: row[self.names.index(like)]
+                for label, row in self.text.items()
+            }
+        else:
+            column = np.full(len(self.traits), np.nan)
+            text_column = {label: "" for label in self.text.keys()}
+        for trait, value in (values or {}).items():
+            column[self._row(trait)] = value
+        text = OrderedDict(
+            (label, row + [text_column[label]])
+            for label, row in self.text.items()
+        )
+        return DBaseTable(
+            self.names + [name],
+            self.traits,
+            np.column_stack([self.values, column]),
+            self.block_type,
+            self.labels,
+            text,
+        )
+
+    @classmethod
+    def from_block(cls, block: NMLBlock) -> "DBaseTable":
+        """Build a table from the list parameters of a database block."""
+        name_param = block.name_param
+        names = block.params[name_param].value
+        if names is None:
+            raise ValueError(f"{name_param} of {block.block_name} is None.")
+        traits = []
+        rows = []
+        for key, param in block.params.items():
+            if key == name_param or param.value is None:
+                continue
+            if len(param.value) != len(names):
+                raise ValueError(
+                    f"{key} has {len(param.value)} items but there are "
+                    f"{len(names)} groups."
+                )
+            traits.append(key)
+            rows.append(param.value)
+        values = np.array(rows, dtype=np.float64).reshape(
+            len(traits), len(names)
+        )
+        return cls(names, traits, values, type(block))
+
+    def to_block(self) -> NMLBlock:
+        """Build the database block.
+
+        Integer traits are rounded and must be finite for every group.
+        """
+        if inspect.isabstract(self.block_type):
+            raise ValueError(
+                f"{self.block_type.__name__} does not define its parameters "
+                "yet. Use to_csv() instead."
+            )
+        param_types = _param_types(self.block_type)
+        name_param = self.block_type.name_param
+        unknown = [
+            trait for trait in self.traits if trait not in param_types
+        ]
+        if unknown or name_param not in param_types:
+            raise ValueError(
+                f"{unknown or [name_param]} are not parameters of "
+                f"{self.block_type.__name__}."
+            )
+        kwargs = {name_param: list(self.names)}
+        for trait, row in zip(self.traits, self.values):
+            if param_types[trait] is int:
+                missing = ~np.isfinite(row)
+                if missing.any():
+                    groups = [
+                        name for name, m in zip(self.names, missing) if m
+                    ]
+                    raise ValueError(
+                        f"Integer trait {trait} is not finite for groups "
+                        f"{groups}. Set it with set() or add the groups "
+                        "with add_group(like=...)."
+                    )
+                kwargs[trait] = np.rint(row).astype(int).tolist()
+            else:
+                kwargs[trait] = row.tolist()
+        return self.block_type(**kwargs)
+
+    @classmethod
+    def from_csv(
+        cls, csv_file: str, block_type: Type[NMLBlock] = PhytoDataBlock
+    ) -> "DBaseTable":
+        """Read an AED database `.csv` file (one row per trait)."""
+        with open(csv_file, newline="") as file:
+            rows = [
+                [cell.strip() for cell in row]
+                for row in csv.reader(
+                    file, quotechar="'", skipinitialspace=True
+                )
+                if row
+            ]
+        name_param = block_type.name_param
+        names = None
+        labels = {}
+        traits = []
+        numeric = []
+        text = OrderedDict()
+        for label, *cells in rows:
+            if label.lower() == name_param:
+                names = cells
+                continue
+            try:
+                numeric.append([float(cell) for cell in cells])
+            except ValueError:
+                text[label] = cells
+                continue
+            trait = label.lower()
+            traits.append(trait)
+            if label != trait:
+                labels[trait] = label
+        if names is None:
+            first = rows[0][0] if rows else None
+            raise ValueError(
+                f"{csv_file} has no {name_param} row for "
+                f"{block_type.__name__} (the first row is {first!r}). Pass "
+                "the block_type of the database, e.g., "
+                "block_type=MacrophyteDataBlock for an 'm_name' row."
+            )
+        values = np.array(numeric, dtype=np.float64).reshape(
+            len(traits), len(names)
+        )
+        return cls(names, traits, values, block_type, labels, text)
+
+    def to_csv(self, csv_file: str):
+        """Write an AED database `.csv` file (one row per trait)."""
+        with open(csv_file, "w") as file:
+            file.write(self.to_csv_text())
+
+    def to_csv_text(self) -> str:
+        """Text of the table's `.csv` file."""
+        name_label = self.labels.get(
+            self.block_type.name_param, self.block_type.name_param
+        )
+        lines = [",".join(f"'{i}'" for i in [name_label] + self.names)]
+        for trait, row in zip(self.traits, self.values.tolist()):
+            label = self.labels.get(trait, trait)
+            cells = ", ".join(_format_number(value) for value in row)
+            lines.append(f"'{label}', {cells}")
+        for label, row in self.text.items():
+            cells = ", ".join(f"'{i}'" for i in row)
+            lines.append(f"'{label}', {cells}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def from_nml(
+        cls, nml_file: str, block_type: Type[NMLBlock] = PhytoDataBlock
+    ) -> "DBaseTable":
+        """Read an AED database `.nml` file, e.g., `aed_phyto_pars.nml`."""
+        nml_dict = NMLReader(nml_file).to_dict()
+        block_dict = nml_dict.get(block_type.block_name)
+        if block_dict is None:
+            raise ValueError(
+                f"{nml_file} has no {block_type.block_name} block."
+            )
+        prefix = block_type.param_prefix.rstrip("%")
+        params = {}
+        for key, value in block_dict.items():
+            if key == prefix and isinstance(value, dict):
+                params.update(value)
+            elif key.startswith(f"{prefix}%"):
+                params[key[len(prefix) + 1:]] = value
+        block = block_type(**params)
+        return cls.from_block(block)
+
+    def to_nml(self, nml_file: str):
+        """Write an AED database `.nml` file, e.g., `aed_phyto_pars.nml`."""
+        with open(nml_file, "w") as file:
+            file.write(self.to_nml_text())
 
+    def to_nml_text(self) -> str:
+        """Text of the table's `.nml` file."""
+        block = self.to_block()
+        prefix = self.block_type.param_prefix.rstrip("%")
+        nml_dict = {
+            self.block_type.block_name: {prefix: block.to_dict(False)}
+        }
+        return NMLWriter(nml_dict).to_string()
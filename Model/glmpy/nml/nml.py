@@ -1,19 +1,71 @@
+import io
 import os
+import re
 import copy
 import json
-import f90nml
+import pickle
+import hashlib
+import numbers
 import warnings
-import regex as re
+import itertools
 
 from collections import OrderedDict
 from abc import ABC, abstractmethod
-from importlib.metadata import version
 from datetime import datetime
-from f90nml import Namelist
+from glmpy._lazy import LazyModule
+from glmpy import _cache
 from typing import Union, List, Any, Callable, TypeVar, Generic, Type, Tuple, Optional
 
 
 
+f90nml = LazyModule("f90nml")
+np = LazyModule("numpy")
+
+# List values at least this long are validated with NumPy rather than one
+# element at a time
+_VECTORISE_MIN_LEN = 32
+
+# Source of NMLParam versions. Every value assignment takes a new number from
+# a single counter, so a version identifies one value of one parameter and
+# survives copy.deepcopy and pickling unchanged.
+_param_versions = itertools.count(1)
+
+
+def _canonical(value: Any) -> str:
+    """Canonical text of a parameter value for fingerprints.
+
+    Numbers are encoded by value rather than by type or formatting, so
+    `1`, `1.0`, `1e0` and `numpy.float64(1)` are equal, as are `0.0` and
+    `-0.0`. Strings are length-prefixed so list separators are unambiguous.
+    """
+    if value is None:
+        return "n"
+    if isinstance(value, bool):
+        return "b1" if value else "b0"
+    if isinstance(value, str):
+        return f"s{len(value)}:{value}"
+    if isinstance(value, numbers.Integral):
+        return f"i{int(value)}"
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        if value != value:
+            return "fnan"
+        if value.is_integer():
+            return f"i{int(value)}"
+        return f"f{value!r}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canonical(i) for i in value) + "]"
+    if isinstance(value, dict):
+        items = sorted((str(k), _canonical(v)) for k, v in value.items())
+        return "{" + ",".join(f"{k}={v}" for k, v in items) + "}"
+    if hasattr(value, "tolist"):
+        return _canonical(value.tolist())
+    return f"o{type(value).__name__}:{value!r}"
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
 T = TypeVar('T')  # Represents the value type (NMLParam or NMLBlock)
 
 class NMLDictBase(dict, Generic[T]):
@@ -56,14 +108,164 @@ class NMLDictBase(dict, Generic[T]):
         """Base validation logic."""
         if self.strict:
             for name, item in self.items():
-                if isinstance(item, self._value_type):
+                if isinstance(item, NMLBlock):
+                    item.validate_changed()
+                elif isinstance(item, self._value_type):
                     item.validate()
                 elif not (self._allow_none and item is None):
                     raise TypeError(
                         f"{name} is not of type {self._value_type.__name__} or None."
                     )
                 
+class NMLParamSchema:
+    """Schema shared by every `NMLParam` with the same definition.
+
+    Holds the name, type, units and validation rules of a parameter. Schemas
+    are interned by `get()`, so the thousands of `NMLParam` objects created
+    for an ensemble share one schema per parameter definition and store only
+    their own value.
+    """
+
+    __slots__ = (
+        "name",
+        "type",
+        "units",
+        "is_list",
+        "required",
+        "gt",
+        "gte",
+        "lt",
+        "lte",
+        "switch",
+        "datetime_formats",
+        "val_type",
+        "validators",
+        "_args",
+        "_key",
+    )
+
+    _interned = {}
+    _arg_names = (
+        "name", "type", "units", "is_list", "required", "gt", "gte", "lt",
+        "lte", "switch", "datetime_formats", "val_type"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        type: Any,
+        units: Union[None, str] = None,
+        is_list: bool = False,
+        required: bool = False,
+        gt: Union[None, int, float] = None,
+        gte: Union[None, int, float] = None,
+        lt: Union[None, int, float] = None,
+        lte: Union[None, int, float] = None,
+        switch: Union[None, List[Any]] = None,
+        datetime_formats: Union[None, List[str]] = None,
+        val_type: bool = True,
+    ):
+        self.name = name
+        self.type = type
+        self.units = units
+        self.is_list = is_list
+        self.required = required
+        self.gt = gt
+        self.gte = gte
+        self.lt = lt
+        self.lte = lte
+        self.switch = switch
+        self.datetime_formats = datetime_formats
+        self.val_type = val_type
+        self._args = (
+            name, type, units, is_list, required, gt, gte, lt, lte, switch,
+            datetime_formats, val_type
+        )
+        validators = []
+        if val_type:
+            validators.append(NMLParam._val_type)
+        if gt is not None:
+            validators.append(NMLParam._val_gt)
+        if gte is not None:
+            validators.append(NMLParam._val_gte)
+        if lt is not None:
+            validators.append(NMLParam._val_lt)
+        if lte is not None:
+            validators.append(NMLParam._val_lte)
+        if switch is not None:
+            validators.append(NMLParam._val_switch)
+        if datetime_formats is not None:
+            validators.append(NMLParam._val_datetime)
+        self.validators = tuple(validators)
+
+    @staticmethod
+    def _key_item(item: Any) -> Any:
+        # Include the type so that, e.g., bounds of 0 and 0.0 are distinct
+        if isinstance(item, list):
+            return (list, tuple(NMLParamSchema._key_item(i) for i in item))
+        return (item.__class__, item)
+
+    @staticmethod
+    def _arg_item(key_item: Any) -> Any:
+        item_type, item = key_item
+        if item_type is list:
+            return [NMLParamSchema._arg_item(i) for i in item]
+        return item
+
+    @classmethod
+    def get(cls, *args) -> "NMLParamSchema":
+        """Return the interned schema for the `__init__` arguments."""
+        key = tuple(cls._key_item(arg) for arg in args)
+        return cls._from_key(key)
+
+    @classmethod
+    def _from_key(cls, key: tuple) -> "NMLParamSchema":
+        try:
+            return cls._interned[key]
+        except KeyError:
+            schema = cls(*(cls._arg_item(item) for item in key))
+            schema._key = key
+            cls._interned[key] = schema
+            return schema
+        except TypeError:
+            # Unhashable arguments (e.g., a custom type); don't intern
+            schema = cls(*(cls._arg_item(item) for item in key))
+            schema._key = key
+            return schema
+
+    def replace(self, **kwargs) -> "NMLParamSchema":
+        """Return the interned schema with some arguments changed."""
+        args = dict(zip(self._arg_names, self._args))
+        args.update(kwargs)
+        return NMLParamSchema.get(*args.values())
+
+    def __reduce__(self):
+        return (_get_param_schema, (self._key,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def _get_param_schema(key: tuple) -> NMLParamSchema:
+    # Module-level so pickle stores a single global reference
+    return NMLParamSchema._from_key(key)
+
+
 class NMLParam:
+    __slots__ = (
+        "_schema",
+        "_value",
+        "_version",
+        "strict",
+        "_validated",
+        "_validated_list",
+        "_fingerprint",
+        "_frozen",
+    )
+
     def __init__(
         self,
         name: str,
@@ -80,39 +282,136 @@ class NMLParam:
         val_datetime: Union[None, List[str]] = None,
         val_type: bool = True
     ):
-        self.name = name
-        self.units = units
-        self.type = type
-        self.is_list = is_list
-        self._val_gt_value = val_gt
-        self._val_gte_value = val_gte
-        self._val_lt_value = val_lt
-        self._val_lte_value = val_lte
-        self._val_switch_values = val_switch
-        self._val_datetime_formats = val_datetime
-        
-        self._validators = []
-        if val_type:
-            self._validators.append(self._val_type)
-        if val_gt is not None:
-            self._validators.append(self._val_gt)
-        if val_gte is not None:
-            self._validators.append(self._val_gte)
-        if val_lt is not None:
-            self._validators.append(self._val_lt)
-        if val_lte is not None:
-            self._validators.append(self._val_lte)
-        if val_switch is not None:
-            self._validators.append(self._val_switch)
-        if val_datetime is not None:
-            self._validators.append(self._val_datetime)
-        if val_required: 
-            self.required = True 
-        else: 
-            self.required = False
+        self._schema = NMLParamSchema.get(
+            name, type, units, is_list, bool(val_required), val_gt, val_gte,
+            val_lt, val_lte, val_switch, val_datetime, val_type
+        )
         self.strict = True
+        self._validated = None
+        self._validated_list = None
+        self._fingerprint = None
+        self._frozen = False
         self.value = value
 
+    @property
+    def schema(self) -> NMLParamSchema:
+        return self._schema
+
+    @property
+    def name(self) -> str:
+        return self._schema.name
+
+    @property
+    def type(self) -> Any:
+        return self._schema.type
+
+    @property
+    def units(self) -> Union[None, str]:
+        return self._schema.units
+
+    @property
+    def is_list(self) -> bool:
+        return self._schema.is_list
+
+    @property
+    def required(self) -> bool:
+        return self._schema.required
+
+    @required.setter
+    def required(self, value: bool):
+        self._check_not_frozen()
+        self._schema = self._schema.replace(required=bool(value))
+        self._validated = None
+
+    @property
+    def _val_gt_value(self):
+        return self._schema.gt
+
+    @property
+    def _val_gte_value(self):
+        return self._schema.gte
+
+    @property
+    def _val_lt_value(self):
+        return self._schema.lt
+
+    @property
+    def _val_lte_value(self):
+        return self._schema.lte
+
+    @property
+    def _val_switch_values(self):
+        return self._schema.switch
+
+    @property
+    def _val_datetime_formats(self):
+        return self._schema.datetime_formats
+
+    def __getstate__(self):
+        validated = self._validated == (self._version, self.strict)
+        if validated and self._validated_list is not None:
+            # Keep the validated state only if the list is unchanged
+            validated = self._validated_list[1] == tuple(self._value)
+        return (self._schema, self._value, self._version, self.strict, validated)
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple) and len(state) == 2 and state[0] is None:
+            state = state[1]
+        if isinstance(state, dict):
+            # NMLParam pickled before schemas were introduced
+            validators = [v.__name__ for v in state.get("_validators", [])]
+            self._schema = NMLParamSchema.get(
+                state["name"],
+                state["type"],
+                state.get("units"),
+                state.get("is_list", False),
+                bool(state.get("required", False)),
+                state.get("_val_gt_value"),
+                state.get("_val_gte_value"),
+                state.get("_val_lt_value"),
+                state.get("_val_lte_value"),
+                state.get("_val_switch_values"),
+                state.get("_val_datetime_formats"),
+                "_val_type" in validators,
+            )
+            self._value = state.get("_value")
+            self._version = next(_param_versions)
+            self.strict = state.get("strict", True)
+            self._validated = None
+            self._validated_list = None
+            self._fingerprint = None
+            self._frozen = False
+            return
+        schema, value, version, strict, validated = state
+        self._schema = schema
+        self._value = value
+        self._version = version
+        self.strict = strict
+        self._validated = (version, strict) if validated else None
+        self._validated_list = None
+        self._fingerprint = None
+        self._frozen = False
+        if validated and isinstance(value, list):
+            self._validated_list = (value, tuple(value))
+
+    def __copy__(self):
+        new = NMLParam.__new__(NMLParam)
+        new.__setstate__(self.__getstate__())
+        new._fingerprint = self._fingerprint
+        return new
+
+    def __deepcopy__(self, memo):
+        new = NMLParam.__new__(NMLParam)
+        value = self._value
+        if isinstance(value, list):
+            value = copy.deepcopy(value, memo)
+        state = self.__getstate__()
+        new.__setstate__((state[0], value) + state[2:])
+        if not isinstance(value, list):
+            new._fingerprint = self._fingerprint
+        memo[id(self)] = new
+        return new
+
     def _val_type(self, value):
         if not isinstance(value, self.type):
             raise ValueError(
@@ -168,35 +467,171 @@ class NMLParam:
             f"{self._val_datetime_formats}. Got '{value}'"
         )
     
-    def validate(self):
+    def _state(self) -> int:
+        """Version of the current value.
+
+        Assigning `value` always gives a new version. List values can also be
+        modified in place, so they are compared with the list seen by the
+        last successful validation and given a new version if they differ.
+        """
+        if self._validated_list is not None:
+            validated_value, validated_items = self._validated_list
+            if (
+                self._value is not validated_value
+                or tuple(self._value) != validated_items
+            ):
+                self._version = next(_param_versions)
+                self._validated_list = None
+        return self._version
+
+    def is_changed(self) -> bool:
+        """Whether the parameter has changed since it was last validated."""
+        return self._validated != (self._state(), self.strict)
+
+    def fingerprint(self) -> bytes:
+        """Digest of the canonical value (see `_canonical()`).
+
+        Cached until the value changes, including in-place changes to list
+        values.
+        """
+        version = self._state()
+        value = self._value
+        cached = self._fingerprint
+        if cached is not None and cached[0] == version:
+            if cached[1] is None or (
+                value is cached[1][0] and tuple(value) == cached[1][1]
+            ):
+                return cached[2]
+        digest = _digest(_canonical(value))
+        items = (value, tuple(value)) if isinstance(value, list) else None
+        self._fingerprint = (version, items, digest)
+        return digest
+
+    def validate(self, force: bool = False):
+        """Validate the value.
+
+        Validation is skipped if the value and `strict` are unchanged since
+        the last successful validation. Set `force` to validate regardless.
+        """
+        state = (self._state(), self.strict)
+        if not force and self._validated == state:
+            return
+        self._validate()
+        self._validated = state
+        if self.is_list and self._value is not None:
+            self._validated_list = (self._value, tuple(self._value))
+
+    def _validate(self):
         if self.strict:
-            if self.value is not None:
+            if self._value is not None:
+                validators = self._schema.validators
                 if self.is_list:
-                    for i in self.value:
-                        for validator in self._validators:
-                            validator(i)
+                    values = self._value
+                    if len(values) >= _VECTORISE_MIN_LEN:
+                        # Re-run the validators on the first invalid item
+                        # so the error matches the item-by-item loop
+                        i = self._first_invalid(values)
+                        values = [] if i is None else [values[i]]
+                    for i in values:
+                        for validator in validators:
+                            validator(self, i)
                 else:
-                    for validator in self._validators:
-                        validator(self.value)
+                    for validator in validators:
+                        validator(self, self._value)
             elif self.required:
                 raise ValueError(
                     f"{self.name} is a required parameter but is currently "
                     "set to None"
                 )
 
+    def _first_invalid(self, values: list) -> Union[int, None]:
+        """Index of the first list item that fails a validator, or None.
+
+        Type checks compare the set of item types, and bound and switch
+        checks run on a NumPy array of the items. Validators that cannot be
+        vectorised for these values are run item by item.
+        """
+        schema = self._schema
+        num_values = len(values)
+        first = num_values
+        # Validator -> (bound, ufunc that is True for invalid items)
+        bound_checks = {
+            NMLParam._val_gt: (schema.gt, np.less_equal),
+            NMLParam._val_gte: (schema.gte, np.less),
+            NMLParam._val_lt: (schema.lt, np.greater_equal),
+            NMLParam._val_lte: (schema.lte, np.greater),
+        }
+        item_types = set(map(type, values))
+        array = None
+        if all(issubclass(t, numbers.Real) for t in item_types):
+            try:
+                array = np.asarray(values)
+            except (OverflowError, ValueError):
+                array = None
+            if array is not None and array.dtype.kind not in "biuf":
+                array = None
+        for validator in schema.validators:
+            bad = None
+            if validator is NMLParam._val_type:
+                if all(issubclass(t, schema.type) for t in item_types):
+                    continue
+                bad = [not isinstance(i, schema.type) for i in values]
+            elif array is not None and validator is NMLParam._val_switch:
+                switch = schema.switch
+                if all(isinstance(i, numbers.Real) for i in switch):
+                    bad = ~np.isin(array, np.asarray(switch))
+            elif array is not None and validator in bound_checks:
+                bound, invalid = bound_checks[validator]
+                bad = invalid(array, bound)
+            if bad is None:
+                for i in range(min(first, num_values)):
+                    try:
+                        validator(self, values[i])
+                    except ValueError:
+                        first = i
+                        break
+                continue
+            bad = np.flatnonzero(bad)
+            if len(bad) > 0:
+                first = min(first, int(bad[0]))
+        return None if first == num_values else first
+
     @property
     def value(self) -> Any:
-        return self._value
+        value = self._value
+        if self._frozen and type(value) is list:
+            # Lists of a shared block are returned as copies, so modifying
+            # them in place cannot change the block for every simulation
+            return list(value)
+        return value
+
+    def _check_not_frozen(self):
+        if self._frozen:
+            raise ValueError(
+                f"{self.name} belongs to a block shared through a BlockPool "
+                "and cannot be modified. Use NMLBlockDict.unshare() to get a "
+                "private copy of the block first."
+            )
 
     @value.setter
     def value(self, value):
+        if self._frozen:
+            self._check_not_frozen()
         if value is not None:
-            if self.type is float and isinstance(value, int):
+            schema = self._schema
+            if schema.type is float and isinstance(value, int):
                 value = float(value)
-            if self.is_list and not isinstance(value, list):
+            if schema.is_list and hasattr(value, "ndim") and value.ndim == 1:
+                # NumPy arrays are stored as lists of Python scalars
+                if schema.type is float and value.dtype.kind in "iu":
+                    value = value.astype(float)
+                value = value.tolist()
+            if schema.is_list and not isinstance(value, list):
                 value = [value]
         
         self._value = value
+        self._version = next(_param_versions)
+        self._validated_list = None
 
 
 class NMLParamDict(NMLDictBase):
@@ -233,11 +668,16 @@ class NMLBlock(ABC):
     Base class for all configuration block classes.
     """
 
+    _validated = None
+    _fingerprint = None
+    _shared = False
+
     def __init__(self, **kwargs):
         self.params = NMLParamDict(**kwargs)
         self.required = False
        # self.block_name = "unnamed_block"
         self.strict = False
+        self._validated = None
 
     @property
     def strict(self) -> Any:
@@ -245,14 +685,111 @@ class NMLBlock(ABC):
 
     @strict.setter
     def strict(self, value: bool):
+        if self._shared and value != self._strict:
+            raise ValueError(
+                "Cannot change strict of a block shared through a BlockPool. "
+                "Use NMLBlockDict.unshare() to get a private copy first."
+            )
         self.params.strict = value
         self._strict = value
 
     def __str__(self):
         return self.params.__str__()
 
+    @property
+    def is_shared(self) -> bool:
+        """Whether the block is an immutable instance from a `BlockPool`."""
+        return self._shared
+
+    def _freeze(self):
+        for nml_param in self.params.values():
+            nml_param._frozen = True
+        self._shared = True
+
+    def __getstate__(self):
+        # Unpickled blocks are private, mutable copies
+        state = self.__dict__.copy()
+        state.pop("_shared", None)
+        return state
+
+    def __deepcopy__(self, memo):
+        # Shared blocks are immutable, so copies of an NML or simulation
+        # keep referring to them
+        if self._shared:
+            return self
+        return self._copy(memo)
+
+    def _copy(self, memo: dict) -> "NMLBlock":
+        cls = self.__class__
+        new = cls.__new__(cls)
+        memo[id(self)] = new
+        for key, value in self.__dict__.items():
+            if key != "_shared":
+                new.__dict__[key] = copy.deepcopy(value, memo)
+        return new
+
+    def get_unshared_copy(self) -> "NMLBlock":
+        """A private, mutable deep copy of the block.
+
+        Unlike `copy.deepcopy()`, shared blocks are also copied. The copy
+        keeps the block's validation state.
+        """
+        return self._copy({})
+
+    def _state(self) -> tuple:
+        return (
+            self.strict,
+            tuple(self.params.keys()),
+            tuple(nml_param._state() for nml_param in self.params.values()),
+        )
+
+    def is_changed(self) -> bool:
+        """Whether the block has changed since it was last validated."""
+        return (
+            self._validated is None
+            or self._validated[0] is not self.params
+            or self._validated[1] != self._state()
+        )
+
+    def validate_changed(self, force: bool = False):
+        """Run `validate()` only if the block has changed.
+
+        A block is changed if any parameter value, the set of parameters, or
+        `strict` differs from the last successful `validate_changed()`. Only
+        the changed parameters are re-checked by `self.params.validate()`,
+        while the block's cross-parameter rules are re-run in full. Set
+        `force` to validate regardless.
+        """
+        if not force and not self.is_changed():
+            return
+        self.validate()
+        self._validated = (self.params, self._state())
+
+    def _fingerprint_items(self) -> tuple:
+        return tuple(sorted(
+            (key, nml_param.fingerprint())
+            for key, nml_param in self.params.items()
+            if nml_param.value is not None
+        ))
+
+    def fingerprint(self) -> str:
+        """Content hash of the block's parameter values.
+
+        The hash is independent of parameter order and of how numbers are
+        formatted or typed. Parameters set to None are ignored, as they are
+        not written to the namelist. Each parameter's digest is cached until
+        its value changes, so repeated calls only re-hash changed values.
+        """
+        items = self._fingerprint_items()
+        cached = self._fingerprint
+        if cached is not None and cached[0] == items:
+            return cached[1]
+        digest = _digest(repr(items)).hex()
+        self._fingerprint = (items, digest)
+        return digest
+
     def to_dict(self, none_params: bool = True) -> dict:
-        self.validate()            
+        self.validate_changed()
         param_dict = {}
         for key, nml_param in self.params.items():
             if isinstance(nml_param, NMLParam):
@@ -369,6 +906,31 @@ class NMLBlockDict(NMLDictBase):
     
     def __reduce__(self):
         return (NMLBlockDict, (), self.__getstate__())
+
+    @property
+    def strict(self) -> Any:
+        return self._strict
+
+    @strict.setter
+    def strict(self, value: bool):
+        for key, block in list(self.items()):
+            if isinstance(block, NMLBlock):
+                if block.is_shared and block.strict != value:
+                    block = self.unshare(key)
+                block.strict = value
+        self._strict = value
+
+    def unshare(self, key: str) -> NMLBlock:
+        """Return the block at `key`, copying it first if it is shared.
+
+        Call before modifying a block that may have been interned with a
+        `BlockPool` (copy-on-write). Private blocks are returned as is.
+        """
+        block = self[key]
+        if block is not None and block.is_shared:
+            block = block.get_unshared_copy()
+            self[key] = block
+        return block
     
     def __setitem__(self, key, value):
         # if self.strict:
@@ -406,6 +968,109 @@ class NMLBlockDict(NMLDictBase):
                 nml_dict[block_name] = nml_block
         return str(nml_dict)
 
+
+class LazyNMLBlockDict(NMLBlockDict):
+    """`NMLBlockDict` that builds its blocks on first access.
+
+    Holds the parsed parameter values of each pending block and constructs
+    the `NMLBlock` when the block is first read, e.g., by `get_block()`,
+    `get_param_value()` or validation of a strict NML. Until then a pending
+    key holds None in the underlying dict. Used by
+    `NMLReader.to_nml_obj(..., lazy=True)`.
+
+    Errors in a pending block's parameters (e.g., an unknown parameter name)
+    are raised when the block is built.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._pending = {}
+        self._pending_strict = None
+        super().__init__(*args, **kwargs)
+
+    def __reduce__(self):
+        return (NMLBlockDict, (), self.__getstate__())
+
+    def add_pending(self, key: str, block_type: Type[NMLBlock], params: dict):
+        """Add a block to build from `params` on first access."""
+        super(NMLDictBase, self).__setitem__(key, None)
+        self._pending[key] = (block_type, params)
+
+    def _build(self, key: str) -> NMLBlock:
+        block_type, params = self._pending.pop(key)
+        block = block_type(**params)
+        if self._pending_strict is not None:
+            block.strict = self._pending_strict
+        super(NMLDictBase, self).__setitem__(key, block)
+        return block
+
+    def _build_all(self):
+        for key in list(self._pending):
+            self._build(key)
+
+    @property
+    def is_built(self) -> bool:
+        """Whether every block has been built."""
+        return not self._pending
+
+    @property
+    def strict(self) -> Any:
+        return self._strict
+
+    @strict.setter
+    def strict(self, value: bool):
+        # Set on the built blocks only; pending blocks get it when built
+        pending = self._pending
+        self._pending = {}
+        try:
+            NMLBlockDict.strict.fset(self, value)
+        finally:
+            self._pending = pending
+        self._pending_strict = value
+
+    def __getitem__(self, key: str) -> NMLBlock:
+        if key in self._pending:
+            return self._build(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._pending.pop(key, None)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._pending.pop(key, None)
+
+    def pop(self, key, *args):
+        if key in self._pending:
+            self._build(key)
+        return super().pop(key, *args)
+
+    def values(self):
+        self._build_all()
+        return super().values()
+
+    def items(self):
+        self._build_all()
+        return super().items()
+
+    def copy(self):
+        self._build_all()
+        return NMLBlockDict(self)
+
+    def __getstate__(self):
+        self._build_all()
+        return super().__getstate__()
+
+    def __eq__(self, other):
+        self._build_all()
+        return super().__eq__(other)
+
+
 class NML(ABC):
     nml_name = "unnamed_nml"
 
@@ -430,6 +1095,21 @@ class NML(ABC):
     
     def get_deepcopy(self):
         return copy.deepcopy(self)
+
+    def fingerprint(self) -> str:
+        """Content hash of the NML.
+
+        Two NMLs with equal fingerprints write the same parameter values,
+        regardless of block or parameter order and of number formatting.
+        Blocks set to None and parameters set to None are ignored. See
+        `NMLBlock.fingerprint()`.
+        """
+        items = sorted(
+            (block_name, block.fingerprint())
+            for block_name, block in self.blocks.items()
+            if block is not None
+        )
+        return _digest(repr(items)).hex()
     
     def write_nml(
             self, 
@@ -444,7 +1124,7 @@ class NML(ABC):
     def set_param_value(
             self, block_name:str, param_name:str, value:Any
         ):
-        self.blocks[block_name].params[param_name].value = value
+        self.blocks.unshare(block_name).params[param_name].value = value
         self.validate()
     
     def get_param_value(self, block_name:str, param_name:str) -> Any:
@@ -486,6 +1166,18 @@ class NMLDict(NMLDictBase):
             )
         super(NMLDictBase, self).__setitem__(key, value)
 
+    def fingerprint(self) -> str:
+        """Content hash of every NML in the dictionary.
+
+        See `NML.fingerprint()`.
+        """
+        items = sorted(
+            (nml_name, nml.fingerprint())
+            for nml_name, nml in self.items()
+            if nml is not None
+        )
+        return _digest(repr(items)).hex()
+
     def validate(self):
         """Validates NML objects with custom glm check."""
         if self.strict:
@@ -520,6 +1212,197 @@ class NMLDict(NMLDictBase):
                 nml_dict[block_name] = nml_block
         return str(nml_dict)
 
+class BlockPool:
+    """Hash-consing table of immutable, shared NML blocks.
+
+    `intern()` returns a single shared instance for each distinct block
+    content, so that simulations in an ensemble refer to one copy of the
+    blocks they have in common rather than holding their own. Shared
+    blocks are frozen: assigning a parameter value raises a `ValueError`
+    and list values are returned as copies, so modifying them in place does
+    not change the shared block.
+    A simulation that needs to modify a shared block takes a private copy
+    with `NMLBlockDict.unshare()` (copy-on-write), which `Sim` and `NML`
+    `set_param_value()` and the samplers do automatically. Copying an NML
+    or simulation with `copy.deepcopy()` keeps references to its shared
+    blocks.
+
+    Validation results are stored on each block, so a shared block is
+    validated once for every simulation that uses it.
+
+    Blocks are keyed by class, `strict`, and the exact value of every
+    parameter in order, so two blocks are shared only if they write the
+    same namelist text.
+
+    Examples
+    --------
+    >>> from glmpy.nml.nml import BlockPool
+    >>> pool = BlockPool()
+    >>> pool.intern_sim(base_sim)
+    >>> sims = [base_sim.get_deepcopy() for _ in range(1000)]
+    >>> sims[0].set_param_value("glm", "light", "Kw", 0.5)
+    >>> sims[0].nml["glm"].blocks["morphometry"] is (
+    ...     sims[1].nml["glm"].blocks["morphometry"]
+    ... )
+    True
+    """
+
+    def __init__(self):
+        self._blocks = {}
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    @staticmethod
+    def _key(block: NMLBlock) -> tuple:
+        values = repr([
+            (key, nml_param.value) for key, nml_param in block.params.items()
+        ])
+        return (type(block), block.strict, _digest(values))
+
+    def intern(self, block: NMLBlock) -> NMLBlock:
+        """Return the shared instance with the same content as `block`.
+
+        If there is none, `block` itself is frozen and becomes the shared
+        instance.
+
+        Parameters
+        ----------
+        block : NMLBlock
+            The block to intern.
+
+        Returns
+        -------
+        NMLBlock
+            The shared block.
+        """
+        if block is None or block.is_shared:
+            return block
+        key = self._key(block)
+        shared = self._blocks.get(key)
+        if shared is None:
+            block._freeze()
+            self._blocks[key] = block
+            shared = block
+        return shared
+
+    def intern_nml(
+        self, nml: NML, block_names: Union[List[str], None] = None
+    ):
+        """Replace the blocks of an NML with their shared instances.
+
+        Parameters
+        ----------
+        nml : NML
+            The NML to update in place.
+        block_names : Union[List[str], None]
+            The blocks to share. Default is None (all blocks).
+        """
+        if block_names is None:
+            block_names = list(nml.blocks.keys())
+        for block_name in block_names:
+            block = nml.blocks[block_name]
+            if block is not None:
+                nml.blocks[block_name] = self.intern(block)
+
+    def intern_sim(
+        self, glm_sim: Any, blocks: Union[List[Tuple[str, str]], None] = None
+    ):
+        """Replace the blocks of a simulation with their shared instances.
+
+        Parameters
+        ----------
+        glm_sim : Sim
+            The simulation to update in place.
+        blocks : Union[List[Tuple[str, str]], None]
+            `(nml_name, block_name)` of the blocks to share. Default is None
+            (every block of every NML).
+        """
+        if blocks is None:
+            for nml in glm_sim.nml.values():
+                if nml is not None:
+                    self.intern_nml(nml)
+            return
+        for nml_name, block_name in blocks:
+            self.intern_nml(glm_sim.nml[nml_name], [block_name])
+
+    def clear(self):
+        """Forget the shared blocks. Blocks already in use stay frozen."""
+        self._blocks.clear()
+
+
+def _diff_blocks(
+    blocks_a: NMLBlockDict, blocks_b: NMLBlockDict, prefix: tuple = ()
+) -> List[tuple]:
+    changed = []
+    block_names = list(blocks_a.keys())
+    block_names += [key for key in blocks_b.keys() if key not in blocks_a]
+    for block_name in block_names:
+        block_a = blocks_a.get(block_name)
+        block_b = blocks_b.get(block_name)
+        if block_a is not None and block_b is not None:
+            if block_a.fingerprint() == block_b.fingerprint():
+                continue
+        items_a = dict(block_a._fingerprint_items()) if block_a else {}
+        items_b = dict(block_b._fingerprint_items()) if block_b else {}
+        param_names = list(items_a.keys())
+        param_names += [key for key in items_b.keys() if key not in items_a]
+        for param_name in param_names:
+            if items_a.get(param_name) != items_b.get(param_name):
+                changed.append(prefix + (block_name, param_name))
+    return changed
+
+
+def diff(
+    a: Union[NML, NMLDict], b: Union[NML, NMLDict]
+) -> List[tuple]:
+    """Parameters that differ between two NMLs or NMLDicts.
+
+    Values are compared as in `NML.fingerprint()`: a parameter set to None
+    is equal to a missing parameter, and numbers are compared by value.
+
+    Parameters
+    ----------
+    a : Union[NML, NMLDict]
+        The first NML or NMLDict.
+    b : Union[NML, NMLDict]
+        The second object, of the same type as `a`.
+
+    Returns
+    -------
+    List[tuple]
+        `(block_name, param_name)` paths for NMLs, or
+        `(nml_name, block_name, param_name)` paths for NMLDicts, in the
+        order they appear in `a` followed by those only in `b`.
+
+    Examples
+    --------
+    >>> b = a.get_deepcopy()
+    >>> b.set_param_value("light", "Kw", 0.5)
+    >>> diff(a, b)
+    [('light', 'Kw')]
+    """
+    if isinstance(a, NML) and isinstance(b, NML):
+        return _diff_blocks(a.blocks, b.blocks)
+    if isinstance(a, NMLDict) and isinstance(b, NMLDict):
+        changed = []
+        nml_names = list(a.keys())
+        nml_names += [key for key in b.keys() if key not in a]
+        for nml_name in nml_names:
+            nml_a = a.get(nml_name)
+            nml_b = b.get(nml_name)
+            changed += _diff_blocks(
+                nml_a.blocks if nml_a is not None else NMLBlockDict(),
+                nml_b.blocks if nml_b is not None else NMLBlockDict(),
+                (nml_name,),
+            )
+        return changed
+    raise TypeError(
+        "a and b must both be NML or both be NMLDict objects. Got "
+        f"{type(a)} and {type(b)}."
+    )
+
+
 # Adapted from: 
 # github.com/facebookresearch/fvcore/blob/main/fvcore/common/registry.py
 class NMLRegistry():
@@ -578,20 +1461,501 @@ class NMLRegistry():
 
 BLOCK_REGISTER = NMLRegistry('blocks')
 
+_SCALAR_TYPES = frozenset((float, int, bool, str, type(None)))
+
+
+class _UnsupportedValue(Exception):
+    """Raised by `NMLWriter._var_lines` for values it does not render."""
+
+
 class NMLWriter():
+    """Write a dictionary of namelist blocks to a namelist or JSON file.
+
+    Namelist text is rendered natively rather than through `f90nml`. The
+    output is identical to `f90nml.Namelist.write()` with its default
+    formatting: lowercase names, parameters sorted within each block, a
+    four-space indent, `.true.`/`.false.` logicals, Fortran-quoted strings,
+    and lists wrapped at 72 columns. Values this writer does not render
+    natively (multidimensional arrays and lists of derived types) fall back to
+    `f90nml`.
+    """
+    _column_width = 72
+    _indent = "    "
+
     def __init__(self, nml_dict: dict):
-        self._nml = Namelist(nml_dict)
+        self._nml_dict = nml_dict
+        self._namelist = None
+
+    @property
+    def _nml(self):
+        # f90nml representation, used for JSON output and fallback rendering
+        if self._namelist is None:
+            self._namelist = f90nml.Namelist(self._nml_dict)
+        return self._namelist
+
+    @staticmethod
+    def _f90str(value: str) -> str:
+        result = repr(value).replace("\\'", "''").replace('\\"', '""')
+        return result.replace("\\\\", "\\")
+
+    @staticmethod
+    def _f90repr(value: Any) -> str:
+        f90repr = _F90_REPR.get(type(value))
+        if f90repr is not None:
+            return f90repr(value)
+        if hasattr(value, "tolist"):
+            return NMLWriter._f90repr(value.tolist())
+        if isinstance(value, bool):
+            return ".true." if value else ".false."
+        if isinstance(value, numbers.Integral):
+            return str(value)
+        if isinstance(value, numbers.Real):
+            return format(value, "")
+        if isinstance(value, str):
+            return NMLWriter._f90repr(str(value))
+        raise ValueError(
+            f"Type {type(value)} of {value} cannot be converted to a Fortran "
+            "type."
+        )
+
+    @staticmethod
+    def _sorted_items(params: dict):
+        # Match f90nml: plain dicts are sorted, keys are lowercased and a
+        # later key that differs only in case replaces the earlier value
+        if not isinstance(params, OrderedDict):
+            items = sorted(params.items())
+        else:
+            items = list(params.items())
+        if all(key == key.lower() for key, _ in items):
+            return items
+        lowered = {}
+        for key, value in items:
+            lowered[key.lower()] = value
+        return lowered.items()
+
+    def _var_lines(self, name: str, value: Any, lines: List[str]):
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            # Single values always fit on one line
+            text = f"{self._indent}{name} = {_F90_REPR[value_type](value)}"
+            lines.append(text.rstrip() + (" ," if value is None else ""))
+            return
+        if hasattr(value, "tolist"):
+            value = value.tolist()
+        if isinstance(value, dict):
+            for field, field_value in self._sorted_items(value):
+                self._var_lines(f"{name}%{field}", field_value, lines)
+            return
+        if not isinstance(value, list):
+            value = [value]
+        if not value:
+            lines.append(f"{self._indent}{name} = ,")
+            return
+        get_repr = _F90_REPR.get
+        f90repr = self._f90repr
+        strs = []
+        for v in value:
+            v_repr = get_repr(type(v))
+            if v_repr is not None:
+                strs.append(v_repr(v))
+            elif isinstance(v, (list, dict)):
+                raise _UnsupportedValue(name)
+            else:
+                strs.append(f90repr(v))
+        header = f"{self._indent}{name} = "
+        width = self._column_width
+        if len(header) >= width:
+            width = len(header) + 1
+        null_end = " ," if value[-1] is None else ""
+        text = header + ", ".join(strs)
+        if len(text) < width:
+            lines.append(text.rstrip() + null_end)
+            return
+        # Wrap as f90nml does: break once a line reaches the column width
+        pad = " " * len(header)
+        start = 0
+        line_len = len(header)
+        line_head = header
+        last = len(strs) - 1
+        for i, v_str in enumerate(strs):
+            is_last = i == last
+            line_len += len(v_str) if is_last else len(v_str) + 2
+            if line_len >= width or is_last:
+                text = line_head + ", ".join(strs[start:i + 1])
+                lines.append(text.rstrip() if is_last else text + ",")
+                start = i + 1
+                line_len = len(pad)
+                line_head = pad
+        lines[-1] += null_end
+
+    def to_string(self) -> str:
+        """Render the namelist text."""
+        indent = self._indent
+        try:
+            lines = []
+            for block_name, params in self._sorted_items(self._nml_dict):
+                if lines:
+                    lines.append("")
+                lines.append(f"&{block_name}")
+                for name, value in self._sorted_items(params):
+                    f90repr = _F90_REPR.get(type(value))
+                    if f90repr is not None and value is not None:
+                        # Single values always fit on one line
+                        lines.append(f"{indent}{name} = {f90repr(value)}")
+                    else:
+                        self._var_lines(name, value, lines)
+                lines.append("/")
+            return "\n".join(lines) + "\n" if lines else ""
+        except _UnsupportedValue:
+            stream = io.StringIO()
+            self._nml._writestream(stream)
+            return stream.getvalue()
 
     def to_nml(self, nml_file: str):
-        self._nml.write(nml_file, force=True)
+        text = self.to_string()
+        with open(nml_file, 'w') as file:
+            file.write(text)
     
     def to_json(self, json_file: str):
         with open(json_file, 'w') as file:
             json.dump(self._nml, file, indent=2)
 
 
+# Fortran representations of the intrinsic types, keyed by exact type
+_F90_REPR = {
+    float: float.__repr__,
+    int: int.__repr__,
+    bool: lambda value: ".true." if value else ".false.",
+    str: NMLWriter._f90str,
+    type(None): lambda value: "",
+}
+
+
+class _Slot:
+    """Marks a templated parameter while compiling an `NMLTemplate`."""
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+class NMLTemplate:
+    """Compiled namelist text with placeholders for swept parameters.
+
+    The base `NML` is validated and rendered once. Every parameter that is
+    not swept becomes fixed text, so rendering a member only formats and
+    validates the swept values and joins the text. Output is identical to
+    `NML.write_nml()` with the same values.
+
+    Only the substituted values are checked, against the rules of their own
+    `NMLParam`. Cross-parameter rules of the block (`NMLBlock.validate()`) are
+    not re-run for each member.
+
+    Attributes
+    ----------
+    nml_name : str
+        Name of the templated NML, e.g., `"glm"`.
+    params : List[Tuple[str, str]]
+        The `(block_name, param_name)` of each placeholder, in the order that
+        values are passed to `render()`.
+
+    Examples
+    --------
+    >>> from glmpy.nml.nml import NMLTemplate
+    >>> template = NMLTemplate(
+    ...     glm_nml, [("mixing", "coef_mix_hyp"), ("light", "Kw")]
+    ... )
+    >>> template.write("member_0/glm3.nml", [0.4, 0.8])
+    """
+
+    def __init__(self, nml: NML, params: List[Tuple[str, str]]):
+        nml.validate()
+        self.nml_name = nml.nml_name
+        self.params = [tuple(param) for param in params]
+        if len(set(self.params)) != len(self.params):
+            raise ValueError(f"Duplicate parameters in {self.params}.")
+        self._params = []
+        nml_dict = nml.blocks._to_dict(False, False)
+        for i, (block_name, param_name) in enumerate(self.params):
+            block = nml.blocks.get(block_name)
+            if block is None:
+                raise ValueError(
+                    f"Block {block_name} is not set in the {self.nml_name} "
+                    "NML."
+                )
+            if param_name not in block.params:
+                raise ValueError(
+                    f"{param_name} is not a parameter of {block_name}."
+                )
+            self._params.append(copy.copy(block.params[param_name]))
+            nml_dict[block_name][param_name] = _Slot(i)
+        self._writer = NMLWriter(nml_dict)
+        self._segments = self._compile(nml_dict)
+
+    def _compile(self, nml_dict: dict) -> list:
+        writer = self._writer
+        indent = writer._indent
+        segments = []
+        lines = []
+        for block_name, params in writer._sorted_items(nml_dict):
+            if lines or segments:
+                lines.append("")
+            lines.append(f"&{block_name}")
+            for name, value in writer._sorted_items(params):
+                if isinstance(value, _Slot):
+                    if lines:
+                        segments.append("\n".join(lines) + "\n")
+                        lines = []
+                    segments.append((value.index, name))
+                    continue
+                f90repr = _F90_REPR.get(type(value))
+                try:
+                    if f90repr is not None and value is not None:
+                        lines.append(f"{indent}{name} = {f90repr(value)}")
+                    else:
+                        writer._var_lines(name, value, lines)
+                except _UnsupportedValue:
+                    raise ValueError(
+                        f"{block_name} {name} cannot be rendered in a "
+                        "template. Use write_nml()."
+                    )
+            lines.append("/")
+        if lines:
+            segments.append("\n".join(lines) + "\n")
+        return segments
+
+    def check(
+        self, values: List[Any], validate: bool = True
+    ) -> List[NMLParam]:
+        """Assign and validate values for the placeholders.
+
+        Parameters
+        ----------
+        values : List[Any]
+            A value for each parameter in `params`.
+        validate : bool
+            Validate the values against their `NMLParam` rules. Default is
+            True.
+
+        Returns
+        -------
+        List[NMLParam]
+            Copies of the templated parameters holding the values.
+        """
+        if len(values) != len(self._params):
+            raise ValueError(
+                f"Expected {len(self._params)} values for {self.params}. Got "
+                f"{len(values)}."
+            )
+        params = []
+        for param, value in zip(self._params, values):
+            param = copy.copy(param)
+            param.value = value
+            if validate:
+                param.validate()
+            params.append(param)
+        return params
+
+    def render(self, values: List[Any], check: bool = True) -> str:
+        """Render the namelist text for a member.
+
+        Parameters
+        ----------
+        values : List[Any]
+            A value for each parameter in `params`.
+        check : bool
+            Validate the values against their `NMLParam` rules. Default is
+            True.
+
+        Returns
+        -------
+        str
+            The namelist text.
+        """
+        values = [param.value for param in self.check(values, check)]
+        parts = []
+        for segment in self._segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            index, name = segment
+            value = values[index]
+            if value is None:
+                continue
+            if hasattr(value, "tolist"):
+                value = value.tolist()
+            lines = []
+            self._writer._var_lines(name, value, lines)
+            parts.append("\n".join(lines) + "\n")
+        return "".join(parts)
+
+    def write(self, nml_file: str, values: List[Any], check: bool = True):
+        """Render the namelist for a member and write it to `nml_file`.
+
+        See `render()`.
+        """
+        text = self.render(values, check=check)
+        with open(nml_file, "w") as file:
+            file.write(text)
+
+
+class _UnsupportedNML(Exception):
+    """Raised by `_parse_nml` for syntax outside the supported subset."""
+
+
+_NML_TOKENS = re.compile(
+    r"""
+    (?P<space>\s+)
+    |(?P<comment>![^\n]*)
+    |(?P<string>'(?:[^'\n]|'')*'|"(?:[^"\n]|"")*")
+    |(?P<group>&\w+)
+    |(?P<end>/)
+    |(?P<equals>=)
+    |(?P<comma>,)
+    |(?P<word>[^\s,=/!'"&]+)
+    """,
+    re.VERBOSE,
+)
+_NML_NAME = re.compile(r"[a-z_]\w*$", re.IGNORECASE)
+_NML_INT = re.compile(r"[+-]?\d+$")
+_NML_FLOAT = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eEdD][+-]?\d+)?$")
+_NML_LOGICALS = {
+    ".true.": True, ".t.": True, "t": True,
+    ".false.": False, ".f.": False, "f": False,
+}
+
+
+def _nml_tokens(text: str):
+    pos = 0
+    for match in _NML_TOKENS.finditer(text):
+        if match.start() != pos:
+            raise _UnsupportedNML(text[pos:match.start()])
+        pos = match.end()
+        kind = match.lastgroup
+        if kind != "space" and kind != "comment":
+            yield kind, match.group()
+    if pos != len(text):
+        raise _UnsupportedNML(text[pos:])
+
+
+def _nml_value(kind: str, token: str):
+    if kind == "string":
+        quote = token[0]
+        return token[1:-1].replace(quote * 2, quote)
+    if _NML_INT.match(token):
+        return int(token)
+    if _NML_FLOAT.match(token):
+        return float(token.replace("d", "e").replace("D", "e"))
+    logical = _NML_LOGICALS.get(token.lower())
+    if logical is None:
+        raise _UnsupportedNML(token)
+    return logical
+
+
+def _parse_nml(text: str) -> OrderedDict:
+    """Parse the namelist subset used by GLM and AED.
+
+    Handles groups of scalar and one-dimensional variables whose values are
+    integers, reals, logicals or quoted strings. Anything else (null values,
+    repeat counts, indexed or derived-type variables, repeated groups or
+    variables) raises `_UnsupportedNML` so the caller can fall back to
+    `f90nml`. The result matches `f90nml.read(...).todict()`.
+    """
+    tokens = list(_nml_tokens(text))
+    nml = OrderedDict()
+    i = 0
+    num_tokens = len(tokens)
+    while i < num_tokens:
+        kind, token = tokens[i]
+        if kind != "group":
+            raise _UnsupportedNML(token)
+        group_name = token[1:].lower()
+        if group_name in nml or group_name == "end":
+            raise _UnsupportedNML(token)
+        group = nml[group_name] = OrderedDict()
+        i += 1
+        while True:
+            if i >= num_tokens:
+                raise _UnsupportedNML(f"Unterminated group {group_name}")
+            kind, token = tokens[i]
+            if kind == "end" or (kind == "group" and token.lower() == "&end"):
+                i += 1
+                break
+            if (
+                kind != "word"
+                or i + 1 >= num_tokens
+                or tokens[i + 1][0] != "equals"
+                or not _NML_NAME.match(token)
+            ):
+                raise _UnsupportedNML(token)
+            name = token.lower()
+            if name in group:
+                raise _UnsupportedNML(token)
+            i += 2
+            values = []
+            after_value = False
+            while i < num_tokens:
+                kind, token = tokens[i]
+                if kind == "comma":
+                    if not after_value:
+                        raise _UnsupportedNML(token)
+                    after_value = False
+                elif kind == "string" or kind == "word":
+                    if (
+                        kind == "word"
+                        and i + 1 < num_tokens
+                        and tokens[i + 1][0] == "equals"
+                    ):
+                        break
+                    values.append(_nml_value(kind, token))
+                    after_value = True
+                else:
+                    break
+                i += 1
+            if not values:
+                group[name] = None
+            elif len(values) == 1:
+                group[name] = values[0]
+            else:
+                group[name] = values
+    return nml
+
+
+# Bump when the parsed form changes so stale cache files are ignored
+_PARSE_CACHE_FORMAT = 1
+
+# Parsed files of this process, keyed by absolute path. Values are
+# ((mtime_ns, size), pickled dict) so each read returns a fresh copy.
+_parse_cache = {}
+
+
 class NMLReader():
-    def __init__(self, nml_file: str):
+    """Read a `.nml` or `.json` file of NML parameters.
+
+    Parsed files are cached in memory and on disk. A cache entry is reused
+    while the file's path, modification time and size are unchanged, or
+    when its content hash still matches (e.g., after a checkout that only
+    touched the file). The on-disk cache is a pickle per file in
+    `cache_dir`.
+
+    Parameters
+    ----------
+    nml_file : str
+        Path to the `.nml` or `.json` file.
+    cache : bool
+        Use the parse cache. Default is True.
+    cache_dir : Union[str, None]
+        Directory of the on-disk cache. Default is None, which uses the
+        `GLMPY_CACHE_DIR` environment variable if set, otherwise
+        `~/.cache/glmpy`. The on-disk cache is skipped if the directory
+        cannot be written.
+    """
+    def __init__(
+        self,
+        nml_file: str,
+        cache: bool = True,
+        cache_dir: Union[str, None] = None,
+    ):
         _, file_extension = os.path.splitext(nml_file)
         if file_extension == ".nml":
             self._is_json = False
@@ -603,23 +1967,136 @@ class NMLReader():
                 f"Got {file_extension}."
             )
         self._nml_file = nml_file
-    
-    def to_dict(self) -> dict:
+        self.cache = cache
+        if cache_dir is None:
+            cache_dir = _cache.cache_dir()
+        self.cache_dir = cache_dir
+
+    def _parse(self, data: bytes) -> dict:
+        text = data.decode()
         if self._is_json:
-            with open(self._nml_file) as file:
-                nml = json.load(file)
+            return json.loads(text)
+        try:
+            return _parse_nml(text)
+        except _UnsupportedNML:
+            return f90nml.reads(text).todict()
+
+    def _cache_path(self, path: str) -> str:
+        name = hashlib.sha1(path.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pickle")
+
+    def _read_cache_file(self, path: str):
+        """Return (stamp, digest, pickled dict) from the on-disk cache."""
+        try:
+            with open(self._cache_path(path), "rb") as file:
+                header = pickle.load(file)
+                if header[:2] != (_PARSE_CACHE_FORMAT, path):
+                    return None
+                return header[2], header[3], file.read()
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError,
+                TypeError, IndexError):
+            return None
+
+    def _write_cache_file(self, path: str, stamp: tuple, digest: str,
+                          payload: bytes):
+        cache_path = self._cache_path(path)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                pickle.dump(
+                    (_PARSE_CACHE_FORMAT, path, stamp, digest),
+                    file,
+                    pickle.HIGHEST_PROTOCOL,
+                )
+                file.write(payload)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _cached_dict(self) -> dict:
+        path = os.path.abspath(self._nml_file)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = _parse_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return pickle.loads(cached[1])
+        cached = self._read_cache_file(path)
+        if cached is not None and cached[0] == stamp:
+            payload = cached[2]
         else:
-            with open(self._nml_file) as file:
-                nml = f90nml.read(file)
-                nml = nml.todict()
-        return nml
+            with open(path, "rb") as file:
+                data = file.read()
+            digest = hashlib.sha1(data).hexdigest()
+            if cached is not None and cached[1] == digest:
+                payload = cached[2]
+            else:
+                payload = pickle.dumps(
+                    self._parse(data), pickle.HIGHEST_PROTOCOL
+                )
+            self._write_cache_file(path, stamp, digest, payload)
+        _parse_cache[path] = (stamp, payload)
+        return pickle.loads(payload)
+
+    def to_dict(self) -> dict:
+        if self.cache:
+            return self._cached_dict()
+        with open(self._nml_file, "rb") as file:
+            return self._parse(file.read())
 
-    def to_nml_obj(self, nml_obj, block_registry: NMLRegistry = BLOCK_REGISTER):
+    def to_nml_obj(
+        self,
+        nml_obj,
+        block_registry: NMLRegistry = BLOCK_REGISTER,
+        lazy: bool = False,
+    ):
+        """Build an NML object from the file.
+
+        Parameters
+        ----------
+        nml_obj : Type[NML]
+            The NML class, e.g., `GLMNML` or `AEDNML`.
+        block_registry : NMLRegistry
+            Registry of the block classes. Default is `BLOCK_REGISTER`.
+        lazy : bool
+            Build each block on first access instead of up front. The NML's
+            `blocks` is then a `LazyNMLBlockDict`. Block names are checked
+            immediately but parameter names and values are only checked
+            when a block is built. Default is False.
+        """
         nml = self.to_dict()
-        nml_args = {}
-        for block_name in nml.keys():
-            block_obj = block_registry.get(block_name)
-            block_obj = block_obj(**nml[block_name])
-            nml_args[block_name] = block_obj
-        return nml_obj(**nml_args)
-    
+        block_types = {
+            block_name: block_registry.get(block_name)
+            for block_name in nml.keys()
+        }
+        if not lazy:
+            nml_args = {
+                block_name: block_type(**nml[block_name])
+                for block_name, block_type in block_types.items()
+            }
+            return nml_obj(**nml_args)
+        nml_instance = nml_obj()
+        blocks = nml_instance.blocks
+        for block_name in block_types.keys():
+            if block_name not in blocks:
+                raise TypeError(
+                    f"{nml_obj.__name__} has no {block_name} block."
+                )
+        lazy_blocks = LazyNMLBlockDict()
+        for block_name in blocks.keys():
+            block_type = block_types.get(block_name)
+            if block_type is None:
+                lazy_blocks[block_name] = blocks[block_name]
+            else:
+                lazy_blocks.add_pending(
+                    block_name, block_type, nml[block_name]
+                )
+        # As in the eager path, blocks take the NML's strict setting if its
+        # __init__ sets one and otherwise keep their own
+        lazy_blocks._strict = blocks.strict
+        lazy_blocks._pending_strict = getattr(nml_instance, "_strict", None)
+        nml_instance.blocks = lazy_blocks
+        return nml_instance
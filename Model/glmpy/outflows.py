@@ -1,7 +1,19 @@
+import os
+import warnings
+import numpy as np
 import pandas as pd
 import datetime as dt
 
-from typing import Mapping, Union
+from abc import ABC, abstractmethod
+from typing import Mapping, Union, Sequence, List
+from glmpy.metrics import read_glm_csv
+
+_Datetimes = Union[
+    pd.DatetimeIndex,
+    pd.Series,
+    np.ndarray,
+    Sequence[Union[str, pd.Timestamp, dt.datetime]]
+]
 
 class CustomOutflows:
     """
@@ -238,6 +250,202 @@ class CustomOutflows:
                 f"{start_datetime} must preceed {end_datetime}."
             )
 
+    def _check_valid_outflows(self, outflows: np.ndarray) -> np.ndarray:
+        """
+        Private method for checking that an array of outflow values is
+        numeric and positive. Returns the values as float64.
+        """
+        outflows = np.asarray(outflows)
+        if outflows.dtype.kind not in "biuf":
+            for outflow in outflows.ravel():
+                self._check_valid_outflow(outflow_value=outflow)
+        outflows = outflows.astype(np.float64)
+        negative = np.flatnonzero(outflows < 0.0)
+        if negative.size:
+            self._check_valid_outflow(outflow_value=outflows[negative[0]])
+        return outflows
+
+    def _to_positions(self, datetimes: _Datetimes) -> np.ndarray:
+        """
+        Private method for validating datetimes and returning their positions
+        in the outflows DataFrame.
+
+        Positions are computed arithmetically from the regular time grid
+        rather than by searching the `time` column.
+        """
+        if not isinstance(datetimes, (pd.DatetimeIndex, pd.Series, np.ndarray)):
+            for datetime in datetimes:
+                self._check_datetime_type(datetime=datetime)
+        try:
+            timestamps = pd.DatetimeIndex(pd.to_datetime(datetimes))
+        except (TypeError, ValueError) as err:
+            raise ValueError(
+                f"Unknown datetime format. {err}"
+            ) from err
+        if timestamps.hasnans:
+            raise ValueError("Datetimes must not be missing (NaT).")
+        step = self.num_seconds * 10**9
+        offsets = (
+            np.asarray(timestamps, dtype="datetime64[ns]").view(np.int64)
+            - self.start_datetime.value
+        )
+        positions, remainders = np.divmod(offsets, step)
+        unaligned = np.flatnonzero(remainders)
+        if unaligned.size:
+            timestamp = timestamps[unaligned[0]]
+            self._check_datetime_alignment(
+                timestamp=timestamp, frequency=self.frequency
+            )
+            raise ValueError(
+                f"Unaligned date time. {timestamp} is not on the "
+                f"{self.frequency} time grid starting at {self.start_datetime}."
+            )
+        outside = np.flatnonzero(
+            (positions < 0) | (positions >= len(self.outflows))
+        )
+        if outside.size:
+            raise ValueError(
+                f"{timestamps[outside[0]]} is not within "
+                f"{self.start_datetime} and {self.end_datetime}."
+            )
+        return positions
+
+    def _assign_flows(self, positions: np.ndarray, outflows: np.ndarray):
+        """
+        Private method for assigning outflow volumes by position. Where a
+        position is given more than once the last outflow is used.
+        """
+        flow = self.outflows["flow"].to_numpy(dtype=np.float64, copy=True)
+        if positions.size > 1 and not np.all(np.diff(positions) > 0):
+            positions, last = np.unique(positions[::-1], return_index=True)
+            outflows = outflows[::-1][last]
+        flow[positions] = outflows / self.num_seconds
+        self.outflows["flow"] = flow
+
+    def set_on_datetimes(
+        self,
+        datetimes: Union[pd.Series, _Datetimes],
+        outflows: Union[np.ndarray, Sequence[Union[float, int]], None] = None
+    ):
+        """
+        Set the outflow volume for many datetimes at once.
+
+        Bulk version of `set_on_datetime()`. Datetimes and volumes are
+        validated as arrays and assigned by their position in the regular
+        time grid. Where a datetime is given more than once the last volume
+        is used. Outflow volumes have the same units as the base outflow
+        (m^3/day or m^3/hour depending on `frequency`).
+
+        Parameters
+        ----------
+        datetimes : Union[pd.Series, pd.DatetimeIndex, np.ndarray, Sequence]
+            Datetimes to set the outflow on, or a Series of outflow volumes
+            indexed by datetime (in which case `outflows` must be None).
+        outflows : Union[np.ndarray, Sequence[Union[float, int]], None]
+            Outflow volume for each datetime. Default is None.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import pandas as pd
+        >>> from glmpy import outflows
+        >>> outflows = outflows.CustomOutflows(
+        ...     start_datetime="2020-01-01 00:00:00",
+        ...     end_datetime="2020-12-31 23:00:00",
+        ...     frequency="1h",
+        ...     base_outflow=0.0
+        ... )
+        >>> pumping = pd.Series(
+        ...     np.full(366, 10.0),
+        ...     index=pd.date_range("2020-01-01 06:00", periods=366, freq="24h")
+        ... )
+        >>> outflows.set_on_datetimes(pumping)
+        """
+        if isinstance(datetimes, pd.Series):
+            if outflows is not None:
+                raise ValueError(
+                    "outflows must be None when datetimes is a Series of "
+                    "outflow volumes."
+                )
+            outflows = datetimes.to_numpy()
+            datetimes = datetimes.index
+        elif outflows is None:
+            raise ValueError(
+                "outflows must be provided unless datetimes is a Series of "
+                "outflow volumes."
+            )
+        outflows = self._check_valid_outflows(outflows)
+        if outflows.ndim != 1 or len(outflows) != len(datetimes):
+            raise ValueError(
+                f"Got {len(datetimes)} datetimes but {outflows.size} outflows."
+            )
+        positions = self._to_positions(datetimes)
+        self._assign_flows(positions, outflows)
+
+    def set_over_datetimes(
+        self,
+        from_datetimes: _Datetimes,
+        to_datetimes: _Datetimes,
+        outflows: Union[np.ndarray, Sequence[Union[float, int]], float, int]
+    ):
+        """
+        Set the outflow volume over many periods at once.
+
+        Bulk version of `set_over_datetime()`. Each period includes its
+        start and end datetime. Where periods overlap, the later period's
+        volume is used.
+
+        Parameters
+        ----------
+        from_datetimes : Union[pd.DatetimeIndex, np.ndarray, Sequence]
+            Start datetime of each period.
+        to_datetimes : Union[pd.DatetimeIndex, np.ndarray, Sequence]
+            End datetime of each period.
+        outflows : Union[np.ndarray, Sequence[Union[float, int]], float, int]
+            Outflow volume of each period, or one volume for every period,
+            in m^3/day or m^3/hour (depending on `frequency`).
+
+        Examples
+        --------
+        >>> from glmpy import outflows
+        >>> outflows = outflows.CustomOutflows(
+        ...     start_datetime="2020-01-01",
+        ...     end_datetime="2020-12-31",
+        ...     frequency="24h",
+        ...     base_outflow=0.0
+        ... )
+        >>> outflows.set_over_datetimes(
+        ...     from_datetimes=["2020-01-10", "2020-06-01"],
+        ...     to_datetimes=["2020-01-20", "2020-06-30"],
+        ...     outflows=[5, 8]
+        ... )
+        """
+        if len(from_datetimes) != len(to_datetimes):
+            raise ValueError(
+                f"Got {len(from_datetimes)} from_datetimes but "
+                f"{len(to_datetimes)} to_datetimes."
+            )
+        outflows = self._check_valid_outflows(
+            np.broadcast_to(outflows, (len(from_datetimes),))
+        )
+        starts = self._to_positions(from_datetimes)
+        ends = self._to_positions(to_datetimes)
+        reversed_periods = np.flatnonzero(starts >= ends)
+        if reversed_periods.size:
+            i = reversed_periods[0]
+            step = pd.Timedelta(seconds=self.num_seconds)
+            self._check_start_preceeds_end(
+                start_datetime=self.start_datetime + starts[i] * step,
+                end_datetime=self.start_datetime + ends[i] * step
+            )
+        lengths = ends - starts + 1
+        period_starts = np.cumsum(lengths) - lengths
+        positions = (
+            np.arange(lengths.sum())
+            - np.repeat(period_starts - starts, lengths)
+        )
+        self._assign_flows(positions, np.repeat(outflows, lengths))
+
     def set_on_datetime(
         self,
         datetime_outflows: dict
@@ -292,28 +500,12 @@ class CustomOutflows:
                 f"{datetime_outflows}."
             )
 
-        validated_datetime_outflows = {}
-        for key, val in datetime_outflows.items():
+        for val in datetime_outflows.values():
             self._check_valid_outflow(outflow_value=val)
-            self._check_datetime_type(datetime=key)
-            timestamp = self._to_pd_timestamp(datetime=key)
-            self._check_datetime_alignment(
-                timestamp=timestamp,
-                frequency=self.frequency
-            )
-            self._check_timestamp_is_within_range(
-                timestamp=timestamp,
-                start_datetime=self.start_datetime,
-                end_datetime=self.end_datetime,
-                outflows_df=self.outflows
-            )
-
-            validated_datetime_outflows[timestamp] = val
-
-        for key, val in validated_datetime_outflows.items():
-            self.outflows.loc[
-                self.outflows['time'] == key, 'flow'
-            ] = val/self.num_seconds
+        self.set_on_datetimes(
+            list(datetime_outflows.keys()),
+            list(datetime_outflows.values())
+        )
 
     def set_over_datetime(
         self,
@@ -383,25 +575,10 @@ class CustomOutflows:
             timestamp=to_datetime, frequency=self.frequency
         )
 
-        self._check_timestamp_is_within_range(
-            timestamp=from_datetime,
-            start_datetime=self.start_datetime,
-            end_datetime=self.end_datetime,
-            outflows_df=self.outflows
-        )
-        self._check_timestamp_is_within_range(
-            timestamp=to_datetime,
-            start_datetime=self.start_datetime,
-            end_datetime=self.end_datetime,
-            outflows_df=self.outflows
-        )
-
-        mask = (
-            self.outflows['time'] >= from_datetime
-        ) & (
-            self.outflows['time'] <= to_datetime
-        )
-        self.outflows.loc[mask, 'flow'] = outflow / self.num_seconds
+        start, end = self._to_positions([from_datetime, to_datetime])
+        flow = self.outflows["flow"].to_numpy(dtype=np.float64, copy=True)
+        flow[start:end + 1] = outflow / self.num_seconds
+        self.outflows["flow"] = flow
 
     def get_outflows(self) -> pd.DataFrame:
         """
@@ -448,3 +625,377 @@ class CustomOutflows:
         >>> outflows.write_outflows(file_path="outflows.csv")
         """
         self.outflows.to_csv(file_path, index=False)
+
+
+class OutflowRule(ABC):
+    """
+    A rule giving an outflow rate from the lake level.
+
+    Subclasses implement `flow()`, which evaluates the rule for a whole
+    series of times and levels at once.
+    """
+    @abstractmethod
+    def flow(self, time: np.ndarray, level: np.ndarray) -> np.ndarray:
+        """
+        Outflow in m^3/second for each time and lake level.
+
+        Parameters
+        ----------
+        time : np.ndarray
+            Array of `datetime64[ns]`.
+        level : np.ndarray
+            Lake level (m) at each time.
+        """
+        pass
+
+
+class WeirRule(OutflowRule):
+    """
+    Overflow over a broad-crested weir.
+
+    Flow is `coefficient * width * (level - crest_level)^exponent` when the
+    level is above the crest and zero otherwise.
+
+    Attributes
+    ----------
+    crest_level : float
+        Elevation of the weir crest (m).
+    width : float
+        Width of the weir (m).
+    coefficient : float
+        Discharge coefficient (m^0.5/second). Default is 1.7.
+    exponent : float
+        Exponent of the head over the crest. Default is 1.5.
+    """
+    def __init__(
+        self,
+        crest_level: float,
+        width: float,
+        coefficient: float = 1.7,
+        exponent: float = 1.5
+    ):
+        self.crest_level = crest_level
+        self.width = width
+        self.coefficient = coefficient
+        self.exponent = exponent
+
+    def flow(self, time: np.ndarray, level: np.ndarray) -> np.ndarray:
+        head = np.maximum(level - self.crest_level, 0.0)
+        return self.coefficient * self.width * head ** self.exponent
+
+
+class ThresholdPumpRule(OutflowRule):
+    """
+    Pumping at a fixed rate while the lake level is high.
+
+    The pump starts when the level reaches `start_level` and stops when it
+    falls to `stop_level`, so a `stop_level` below `start_level` gives a
+    pump with hysteresis.
+
+    Attributes
+    ----------
+    start_level : float
+        Level (m) at or above which the pump runs.
+    rate : float
+        Pumping rate (m^3/second).
+    stop_level : Union[float, None]
+        Level (m) at or below which the pump stops. Default is None (same
+        as `start_level`).
+    """
+    def __init__(
+        self,
+        start_level: float,
+        rate: float,
+        stop_level: Union[float, None] = None
+    ):
+        if stop_level is not None and stop_level > start_level:
+            raise ValueError(
+                f"stop_level ({stop_level}) must not exceed start_level "
+                f"({start_level})."
+            )
+        self.start_level = start_level
+        self.rate = rate
+        self.stop_level = stop_level
+
+    def flow(self, time: np.ndarray, level: np.ndarray) -> np.ndarray:
+        if self.stop_level is None:
+            return np.where(level >= self.start_level, self.rate, 0.0)
+        # Between the stop and start levels the pump keeps its last state:
+        # index each time by the last time it switched and carry it forward.
+        # Times before the first switch index 0, where the pump is off.
+        on = level >= self.start_level
+        switched = on | (level <= self.stop_level)
+        last_switch = np.where(switched, np.arange(len(level)), 0)
+        np.maximum.accumulate(last_switch, out=last_switch)
+        return np.where(on[last_switch], self.rate, 0.0)
+
+
+class ScheduleRule(OutflowRule):
+    """
+    Outflow at a fixed rate on a seasonal or daily schedule.
+
+    Attributes
+    ----------
+    rate : float
+        Outflow rate (m^3/second) while the schedule is active.
+    months : Union[List[int], None]
+        Months (1-12) the schedule is active. Default is None (every
+        month).
+    hours : Union[List[int], None]
+        Hours of the day (0-23) the schedule is active. Default is None
+        (every hour).
+    min_level : Union[float, None]
+        Level (m) below which there is no outflow. Default is None.
+    """
+    def __init__(
+        self,
+        rate: float,
+        months: Union[List[int], None] = None,
+        hours: Union[List[int], None] = None,
+        min_level: Union[float, None] = None
+    ):
+        self.rate = rate
+        self.months = months
+        self.hours = hours
+        self.min_level = min_level
+
+    def flow(self, time: np.ndarray, level: np.ndarray) -> np.ndarray:
+        active = np.ones(len(time), dtype=bool)
+        if self.months is not None:
+            months = time.astype("datetime64[M]").astype(np.int64) % 12 + 1
+            active &= np.isin(months, self.months)
+        if self.hours is not None:
+            hours = time.astype("datetime64[h]").astype(np.int64) % 24
+            active &= np.isin(hours, self.hours)
+        if self.min_level is not None:
+            active &= level >= self.min_level
+        return np.where(active, self.rate, 0.0)
+
+
+def read_sim_levels(glm_sim) -> pd.Series:
+    """
+    Read the lake level of a simulation that has run.
+
+    Reads the `Lake Level` column of the simulation's `lake.csv` output
+    (per the `out_dir` and `csv_lake_fname` parameters of the `output`
+    block). Can be used as the `on_sim_end` callback of `MultiSim.run()`.
+
+    Returns
+    -------
+    pd.Series
+        Lake level (m) indexed by time.
+    """
+    out_dir = "output"
+    csv_lake_fname = "lake"
+    output = glm_sim.nml["glm"].blocks.get("output")
+    if output is not None:
+        out_dir = output.params["out_dir"].value or out_dir
+        csv_lake_fname = output.params["csv_lake_fname"].value or (
+            csv_lake_fname
+        )
+    lake_csv = os.path.join(
+        glm_sim.get_sim_dir(), out_dir, f"{csv_lake_fname}.csv"
+    )
+    lake = read_glm_csv(lake_csv, "Lake Level")
+    return pd.Series(
+        lake["Lake Level"].to_numpy(), index=pd.DatetimeIndex(lake["time"])
+    )
+
+
+class RuleOutflows:
+    """
+    Outflow timeseries generated from rules on the lake level.
+
+    Evaluates `OutflowRule`s (e.g., weir overflow, threshold pumping and
+    seasonal schedules) over a lake level series, such as the output of a
+    previous run or observed levels. The level series is interpolated onto
+    the outflow time grid and every rule is evaluated over the whole grid
+    at once. The flows of all rules are summed.
+
+    Attributes
+    ----------
+    rules : List[OutflowRule]
+        The outflow rules.
+    frequency : str
+        Frequency of the outflow timeseries, e.g., `'1h'` or `'24h'`.
+        Default is `'1h'`.
+    max_flow : Union[float, None]
+        Maximum total outflow (m^3/second). Default is None.
+
+    Examples
+    --------
+    >>> from glmpy import outflows
+    >>> rule_outflows = outflows.RuleOutflows(
+    ...     rules=[
+    ...         outflows.WeirRule(crest_level=14.9, width=2.0),
+    ...         outflows.ThresholdPumpRule(
+    ...             start_level=14.8, rate=0.05, stop_level=14.6
+    ...         ),
+    ...         outflows.ScheduleRule(rate=0.01, months=[12, 1, 2]),
+    ...     ],
+    ...     frequency="1h"
+    ... )
+    >>> levels = outflows.read_sim_levels(sim)
+    >>> outflow = rule_outflows.get_outflows(levels)
+    >>> sim.bcs["outflow"] = outflow
+
+    Iterate run -> outflow -> run until the levels converge:
+    >>> from glmpy.sim import MultiSim
+    >>> changes = rule_outflows.iterate(
+    ...     MultiSim([sim]), bc_name="outflow", tol=0.005
+    ... )
+    """
+    def __init__(
+        self,
+        rules: List[OutflowRule],
+        frequency: str = "1h",
+        max_flow: Union[float, None] = None
+    ):
+        self.rules = rules
+        self.frequency = frequency
+        self.max_flow = max_flow
+
+    @staticmethod
+    def levels_from_parquet(
+        path: str,
+        time_column: str = "time",
+        level_column: str = "Lake Level"
+    ) -> pd.Series:
+        """
+        Read a lake level series from a Parquet file of observations.
+        """
+        df = pd.read_parquet(path, columns=[time_column, level_column])
+        return pd.Series(
+            df[level_column].to_numpy(dtype=np.float64),
+            index=pd.DatetimeIndex(df[time_column])
+        )
+
+    def get_flows(self, time: np.ndarray, level: np.ndarray) -> np.ndarray:
+        """
+        Total outflow (m^3/second) of the rules at each time and level.
+        """
+        flow = np.zeros(len(time))
+        for rule in self.rules:
+            flow += rule.flow(time, level)
+        if self.max_flow is not None:
+            np.minimum(flow, self.max_flow, out=flow)
+        return flow
+
+    def get_outflows(
+        self,
+        levels: pd.Series,
+        start_datetime: Union[str, pd.Timestamp, dt.datetime, None] = None,
+        end_datetime: Union[str, pd.Timestamp, dt.datetime, None] = None
+    ) -> pd.DataFrame:
+        """
+        Generate the outflow timeseries from a lake level series.
+
+        Parameters
+        ----------
+        levels : pd.Series
+            Lake level (m) indexed by time. Levels are linearly
+            interpolated onto the outflow time grid and held constant
+            beyond the first and last level.
+        start_datetime : Union[str, pd.Timestamp, dt.datetime, None]
+            Start of the outflow timeseries. Default is None (the first
+            time of `levels`).
+        end_datetime : Union[str, pd.Timestamp, dt.datetime, None]
+            End of the outflow timeseries. Default is None (the last time
+            of `levels`).
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with `time` and `flow` (m^3/second) columns, as
+            returned by `CustomOutflows.get_outflows()`.
+        """
+        level_times = np.asarray(levels.index, dtype="datetime64[ns]")
+        if len(level_times) == 0:
+            raise ValueError("levels must not be empty.")
+        if start_datetime is None:
+            start_datetime = level_times[0]
+        if end_datetime is None:
+            end_datetime = level_times[-1]
+        time = pd.date_range(
+            start=pd.Timestamp(start_datetime).ceil(self.frequency),
+            end=end_datetime,
+            freq=self.frequency
+        )
+        time_values = np.asarray(time, dtype="datetime64[ns]")
+        level = np.interp(
+            time_values.view(np.int64),
+            level_times.view(np.int64),
+            levels.to_numpy(dtype=np.float64)
+        )
+        return pd.DataFrame({
+            "time": time,
+            "flow": self.get_flows(time_values, level)
+        })
+
+    def iterate(
+        self,
+        multi_sim,
+        bc_name: str,
+        initial_levels: Union[pd.Series, List[pd.Series], None] = None,
+        max_iter: int = 10,
+        tol: float = 0.01,
+        **run_kwargs
+    ) -> List[float]:
+        """
+        Iterate run -> outflow -> run until the lake levels converge.
+
+        Each iteration sets `bcs[bc_name]` of every simulation from its
+        current levels and runs them with `multi_sim.run()`. Iteration stops
+        when no simulated level changes by more than `tol` between
+        iterations, or after `max_iter` runs.
+
+        Parameters
+        ----------
+        multi_sim : MultiSim
+            The simulations. The outflow BC `bc_name` must be one of the
+            `outflow_fl` files of each simulation.
+        bc_name : str
+            Key of the outflow BC in each simulation's `bcs`.
+        initial_levels : Union[pd.Series, List[pd.Series], None]
+            Levels to generate the first outflows from, for all simulations
+            or one per simulation. Default is None (run the simulations
+            with their current outflow BCs first).
+        max_iter : int
+            Maximum number of runs. Default is 10.
+        tol : float
+            Convergence tolerance on the lake level (m). Default is 0.01.
+        **run_kwargs
+            Passed to `multi_sim.run()`, e.g., `cpu_count` or `glm_path`.
+
+        Returns
+        -------
+        List[float]
+            Largest level change of each iteration after the first.
+        """
+        glm_sims = multi_sim.glm_sims
+        if isinstance(initial_levels, pd.Series):
+            initial_levels = [initial_levels] * len(glm_sims)
+        levels = initial_levels
+        previous_levels = None
+        changes = []
+        for _ in range(max_iter):
+            if levels is not None:
+                for glm_sim, sim_levels in zip(glm_sims, levels):
+                    glm_sim.bcs[bc_name] = self.get_outflows(sim_levels)
+            levels = multi_sim.run(on_sim_end=read_sim_levels, **run_kwargs)
+            if previous_levels is not None:
+                change = max(
+                    float(np.nanmax(np.abs(
+                        new.to_numpy() - old.reindex(new.index).to_numpy()
+                    )))
+                    for new, old in zip(levels, previous_levels)
+                )
+                changes.append(change)
+                if change <= tol:
+                    return changes
+            previous_levels = levels
+        warnings.warn(
+            f"Lake levels did not converge to within {tol} m in {max_iter} "
+            "iterations."
+        )
+        return changes
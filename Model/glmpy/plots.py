@@ -1,14 +1,20 @@
-import netCDF4
+from __future__ import annotations
+
 import numpy as np
 import pandas as pd
 import numpy.ma as ma
-import matplotlib.dates as mdates
 
-from typing import Union, List
-from matplotlib.axes import Axes
-from matplotlib.lines import Line2D
-from matplotlib.image import AxesImage
+from typing import Union, List, TYPE_CHECKING
 from datetime import datetime, timedelta
+from glmpy._lazy import LazyModule
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.lines import Line2D
+    from matplotlib.image import AxesImage
+
+netCDF4 = LazyModule("netCDF4")
+mdates = LazyModule("matplotlib.dates")
 
 
 class WQPlotter:
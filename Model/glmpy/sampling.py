@@ -0,0 +1,900 @@
+import weakref
+import numpy as np
+
+from typing import Union, List, Any, Tuple, Iterator
+from glmpy.nml.nml import NMLParam, BlockPool
+from glmpy.sim import GLMSim
+
+
+class SampledParam:
+    """Sampling specification for a single `NMLParam`.
+
+    Describes the range and type of a parameter to vary in an experimental
+    design. Bounds, switch values and the parameter type are read from the
+    validators of the `NMLParam` by `NMLSampler` so that every sampled value
+    passes the parameter's own validators. `lower` and `upper` narrow the
+    range allowed by the validators and are required for float parameters
+    that are not bounded by their validators. Rules that relate several
+    parameters of a block are not sampled, so choose bounds that keep them
+    (e.g., increasing `H` and `A` in the `morphometry` block).
+
+    Attributes
+    ----------
+    nml_name : str
+        Name of the NML, e.g., `"glm"` or `"aed"`.
+    block_name : str
+        Name of the block, e.g., `"mixing"`.
+    param_name : str
+        Name of the parameter, e.g., `"coef_mix_conv"`.
+    lower : Union[float, int, None]
+        Lower bound of the sampled range. Must be a whole number for int
+        parameters. Default is None.
+    upper : Union[float, int, None]
+        Upper bound of the sampled range. Must be a whole number for int
+        parameters. Default is None.
+    values : Union[List[Any], None]
+        Discrete values to sample from. Must be a subset of the parameter's
+        `val_switch` values if it has them. Default is None.
+    index : Union[int, None]
+        Index of the list item to sample for list parameters. If None, every
+        item of the list is sampled as an independent dimension. Default is
+        None.
+    log : bool
+        Sample uniformly in log space. Requires `lower > 0` and is only
+        supported for float parameters. Default is False.
+
+    Examples
+    --------
+    >>> from glmpy.sampling import SampledParam
+    >>> coef_mix_conv = SampledParam(
+    ...     "glm", "mixing", "coef_mix_conv", lower=0.1, upper=0.3
+    ... )
+    >>> deepest_area = SampledParam(
+    ...     "glm", "morphometry", "A", lower=500.0, upper=1500.0, index=0
+    ... )
+    """
+
+    def __init__(
+        self,
+        nml_name: str,
+        block_name: str,
+        param_name: str,
+        lower: Union[float, int, None] = None,
+        upper: Union[float, int, None] = None,
+        values: Union[List[Any], None] = None,
+        index: Union[int, None] = None,
+        log: bool = False,
+    ):
+        self.nml_name = nml_name
+        self.block_name = block_name
+        self.param_name = param_name
+        self.lower = lower
+        self.upper = upper
+        self.values = values
+        self.index = index
+        self.log = log
+
+    @property
+    def path(self) -> Tuple[str, str, str]:
+        return (self.nml_name, self.block_name, self.param_name)
+
+
+class _Dimension:
+    """A single column of a design derived from a `SampledParam`."""
+
+    def __init__(
+        self,
+        path: Tuple[str, str, str],
+        index: Union[int, None],
+        type: Any,
+        lower: float,
+        upper: float,
+        values: Union[List[Any], None],
+        log: bool,
+        codes: Union[np.ndarray, None] = None,
+    ):
+        self.path = path
+        self.index = index
+        self.type = type
+        self.lower = lower
+        self.upper = upper
+        self.values = values
+        self.log = log
+        self.codes = codes
+
+    @property
+    def key(self) -> Tuple:
+        if self.index is None:
+            return self.path
+        return self.path + (self.index,)
+
+
+def _validator_bounds(
+    param: NMLParam,
+) -> Tuple[Union[float, None], Union[float, None]]:
+    """Get the closed range allowed by the bound validators of a param."""
+    lower = None
+    upper = None
+    is_int = param.type is int
+    if param._val_gte_value is not None:
+        lower = param._val_gte_value
+    if param._val_gt_value is not None:
+        if is_int:
+            gt = param._val_gt_value + 1
+        else:
+            gt = np.nextafter(float(param._val_gt_value), np.inf)
+        lower = gt if lower is None else max(lower, gt)
+    if param._val_lte_value is not None:
+        upper = param._val_lte_value
+    if param._val_lt_value is not None:
+        if is_int:
+            lt = param._val_lt_value - 1
+        else:
+            lt = np.nextafter(float(param._val_lt_value), -np.inf)
+        upper = lt if upper is None else min(upper, lt)
+    return lower, upper
+
+
+class ParameterSpace:
+    """A flat float64 vector view of selected NML parameters.
+
+    Compiles a set of `(nml_name, block_name, param_name[, index])` paths
+    into positions in a float64 vector so that optimisers and samplers can
+    read and write simulation parameters in bulk. Paths are resolved against
+    a reference simulation once: list parameters without an index expand to
+    one position per list item, and the type, validator bounds and switch
+    values of each position are cached.
+
+    Positions hold the parameter value for numeric and bool parameters. Str
+    parameters must have `val_switch` values and hold the index of their
+    value in `val_switch`. `apply_vector()` assigns whole parameters through
+    the `NMLParam.value` setter, which coerces the type but does not
+    validate, and writes list items in place in the stored list. Neither
+    runs the validators; use `check()` to validate a whole array of
+    candidates at once.
+
+    The parameter objects of each simulation are resolved on first use and
+    cached for as long as the simulation exists, so repeated calls do not
+    walk the `NMLDict`.
+
+    Attributes
+    ----------
+    glm_sim : GLMSim
+        The reference simulation.
+    paths : List[Tuple]
+        Paths of the parameters to include.
+
+    Examples
+    --------
+    >>> from glmpy.example_sims import SparklingSim
+    >>> from glmpy.sampling import ParameterSpace
+    >>> sparkling = SparklingSim()
+    >>> space = ParameterSpace(
+    ...     sparkling,
+    ...     [
+    ...         ("glm", "mixing", "coef_mix_conv"),
+    ...         ("glm", "meteorology", "wind_factor"),
+    ...         ("glm", "morphometry", "A", 0),
+    ...     ],
+    ... )
+    >>> x = space.to_vector(sparkling)
+    >>> x[0] = 0.25
+    >>> space.apply_vector(sparkling, x)
+    """
+
+    def __init__(self, glm_sim: GLMSim, paths: List[Tuple]):
+        self.glm_sim = glm_sim
+        self.paths = [tuple(path) for path in paths]
+        self._param_keys = []
+        self._param_index = {}
+        self._dim_param = []
+        self._dim_index = []
+        self._dim_path = []
+        self.keys = []
+        self.types = []
+        self.switch_values = []
+        lower = []
+        upper = []
+        for path_num, path in enumerate(self.paths):
+            if len(path) not in (3, 4):
+                raise ValueError(
+                    "Paths must be (nml_name, block_name, param_name) or "
+                    "(nml_name, block_name, param_name, index). Got "
+                    f"{path}."
+                )
+            param_key = path[:3]
+            nml_name, block_name, param_name = param_key
+            param = glm_sim.get_block(nml_name, block_name).params[
+                param_name
+            ]
+            if param.type is str and param._val_switch_values is None:
+                raise ValueError(
+                    f"{param_name} is a str parameter without val_switch "
+                    "values and cannot be represented in a numeric vector."
+                )
+            index = path[3] if len(path) == 4 else None
+            if param.is_list:
+                if param.value is None:
+                    raise ValueError(
+                        f"Cannot include {param_name} of the {block_name} "
+                        "block when its value is None. Set a value so that "
+                        "the list length is known."
+                    )
+                num_items = len(param.value)
+                if index is None:
+                    indices = list(range(num_items))
+                elif -num_items <= index < num_items:
+                    indices = [index % num_items]
+                else:
+                    raise IndexError(
+                        f"index {index} is out of range for {param_name} "
+                        f"with {num_items} items."
+                    )
+            elif index is not None:
+                raise ValueError(
+                    f"An index was given for {param_name} but {param_name} "
+                    "is not a list parameter."
+                )
+            else:
+                indices = [None]
+            if param_key not in self._param_index:
+                self._param_index[param_key] = len(self._param_keys)
+                self._param_keys.append(param_key)
+            if param.type is str:
+                val_lower = 0
+                val_upper = len(param._val_switch_values) - 1
+            elif param.type is bool:
+                val_lower, val_upper = 0, 1
+            else:
+                val_lower, val_upper = _validator_bounds(param)
+            for index in indices:
+                self._dim_param.append(self._param_index[param_key])
+                self._dim_index.append(index)
+                self._dim_path.append(path_num)
+                self.keys.append(
+                    param_key if index is None else param_key + (index,)
+                )
+                self.types.append(param.type)
+                self.switch_values.append(param._val_switch_values)
+                lower.append(-np.inf if val_lower is None else val_lower)
+                upper.append(np.inf if val_upper is None else val_upper)
+        if len(self.keys) == 0:
+            raise ValueError("No parameters to include.")
+        self.lower = np.array(lower, dtype=np.float64)
+        self.upper = np.array(upper, dtype=np.float64)
+        self._is_integer = np.array(
+            [t is not float for t in self.types], dtype=bool
+        )
+        self._is_str = [t is str for t in self.types]
+        self._codes = [
+            {v: i for i, v in enumerate(values)} if is_str else None
+            for values, is_str in zip(self.switch_values, self._is_str)
+        ]
+        self._blocks = {}
+        for param_key in self._param_keys:
+            self._blocks.setdefault(param_key[:2], []).append(param_key[2])
+        self._bindings = weakref.WeakKeyDictionary()
+
+    @property
+    def num_dims(self) -> int:
+        return len(self.keys)
+
+    def _bind(self, glm_sim: GLMSim) -> List[NMLParam]:
+        binding = self._bindings.get(glm_sim)
+        if binding is not None:
+            blocks, params = binding
+            if all(
+                glm_sim.nml[nml_name].blocks[block_name] is block
+                for (nml_name, block_name), block in blocks.items()
+            ):
+                return params
+        blocks = {}
+        params_by_key = {}
+        for (nml_name, block_name), param_names in self._blocks.items():
+            # Values are written to the bound parameters, so take private
+            # copies of blocks shared through a BlockPool
+            block = glm_sim.nml[nml_name].blocks.unshare(block_name)
+            blocks[(nml_name, block_name)] = block
+            for param_name in param_names:
+                params_by_key[(nml_name, block_name, param_name)] = (
+                    block.params[param_name]
+                )
+        params = [params_by_key[key] for key in self._param_keys]
+        self._bindings[glm_sim] = (blocks, params)
+        return params
+
+    def encode(self, dim: int, value: Any) -> float:
+        """Encode a parameter value as a vector element.
+
+        Parameters
+        ----------
+        dim : int
+            Position in the vector.
+        value : Any
+            The parameter value.
+
+        Returns
+        -------
+        float
+            The vector element.
+        """
+        if value is None:
+            return np.nan
+        if self._is_str[dim]:
+            return float(self._codes[dim][value])
+        return float(value)
+
+    def decode(self, dim: int, x: float) -> Any:
+        """Decode a vector element to a parameter value.
+
+        Parameters
+        ----------
+        dim : int
+            Position in the vector.
+        x : float
+            The vector element.
+
+        Returns
+        -------
+        Any
+            The parameter value.
+        """
+        param_type = self.types[dim]
+        if self._is_str[dim]:
+            return self.switch_values[dim][int(x)]
+        if param_type is bool:
+            return bool(x)
+        if param_type is int:
+            return int(round(x))
+        return float(x)
+
+    def to_vector(self, glm_sim: GLMSim) -> np.ndarray:
+        """Read the parameters of a simulation into a vector.
+
+        Parameters that are None are returned as NaN.
+
+        Parameters
+        ----------
+        glm_sim : GLMSim
+            The simulation to read.
+
+        Returns
+        -------
+        np.ndarray
+            Vector with shape `(num_dims,)`.
+        """
+        params = self._bind(glm_sim)
+        x = np.empty(self.num_dims, dtype=np.float64)
+        for dim, (i, index) in enumerate(
+            zip(self._dim_param, self._dim_index)
+        ):
+            value = params[i]._value
+            if index is not None and value is not None:
+                value = value[index]
+            x[dim] = self.encode(dim, value)
+        return x
+
+    def to_matrix(self, glm_sims: List[GLMSim]) -> np.ndarray:
+        """Read the parameters of many simulations into a 2-D array.
+
+        Parameters
+        ----------
+        glm_sims : List[GLMSim]
+            The simulations to read.
+
+        Returns
+        -------
+        np.ndarray
+            Array with shape `(len(glm_sims), num_dims)`.
+        """
+        return np.stack([self.to_vector(sim) for sim in glm_sims])
+
+    def check(self, x: np.ndarray) -> np.ndarray:
+        """Check vectors against the parameter validators.
+
+        Checks bounds, integer and bool values, and `val_switch` membership
+        for every row at once.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            A vector with shape `(num_dims,)` or candidates with shape
+            `(num_candidates, num_dims)`.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array of shape `(num_candidates,)` that is True where a
+            candidate is valid.
+        """
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        if x.shape[1] != self.num_dims:
+            raise ValueError(
+                f"Expected vectors of length {self.num_dims}. Got "
+                f"{x.shape[1]}."
+            )
+        valid = np.all(np.isfinite(x), axis=1)
+        valid &= np.all((x >= self.lower) & (x <= self.upper), axis=1)
+        ints = x[:, self._is_integer]
+        valid &= np.all(ints == np.round(ints), axis=1)
+        for dim, values in enumerate(self.switch_values):
+            if values is not None and not self._is_str[dim]:
+                valid &= np.isin(x[:, dim], np.asarray(values, dtype=float))
+        return valid
+
+    def apply_vector(
+        self, glm_sim: GLMSim, x: np.ndarray, check: bool = True
+    ) -> None:
+        """Write a vector to the parameters of a simulation.
+
+        Whole parameters are assigned through the `NMLParam.value` setter
+        and list items are written in place in the stored list. The
+        validators are not run; use `check()` for that.
+
+        Parameters
+        ----------
+        glm_sim : GLMSim
+            The simulation to update in place.
+        x : np.ndarray
+            Vector with shape `(num_dims,)`.
+        check : bool
+            Check the vector with `check()` before writing. Default is True.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if check and not self.check(x)[0]:
+            raise ValueError(
+                f"Vector {x} is not valid for the parameters {self.keys}."
+            )
+        params = self._bind(glm_sim)
+        for dim, (i, index) in enumerate(
+            zip(self._dim_param, self._dim_index)
+        ):
+            value = self.decode(dim, x[dim])
+            if index is None:
+                params[i].value = value
+            else:
+                params[i]._value[index] = value
+
+    def apply_matrix(
+        self, glm_sims: List[GLMSim], x: np.ndarray, check: bool = True
+    ) -> None:
+        """Write the rows of a 2-D array to many simulations.
+
+        Parameters
+        ----------
+        glm_sims : List[GLMSim]
+            The simulations to update in place. Row `i` of `x` is written to
+            `glm_sims[i]`.
+        x : np.ndarray
+            Array with shape `(len(glm_sims), num_dims)`.
+        check : bool
+            Check every row with `check()` before writing any. Default is
+            True.
+        """
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        if x.shape[0] != len(glm_sims):
+            raise ValueError(
+                f"Got {x.shape[0]} vectors for {len(glm_sims)} simulations."
+            )
+        if check:
+            invalid = np.flatnonzero(~self.check(x))
+            if len(invalid) > 0:
+                raise ValueError(
+                    f"Rows {invalid.tolist()} are not valid for the "
+                    f"parameters {self.keys}."
+                )
+        for sim, xi in zip(glm_sims, x):
+            self.apply_vector(sim, xi, check=False)
+
+    def validate_blocks(self, glm_sim: GLMSim) -> None:
+        """Validate the blocks of a simulation that hold sampled parameters.
+
+        Runs `validate_changed()` on each block, so the block-level rules
+        that `check()` does not cover are applied to the written values.
+
+        Parameters
+        ----------
+        glm_sim : GLMSim
+            The simulation to validate.
+        """
+        self._bind(glm_sim)
+        blocks, _ = self._bindings[glm_sim]
+        for block in blocks.values():
+            block.validate_changed()
+
+    def get_sims(
+        self,
+        x: np.ndarray,
+        sim_name_prefix: Union[str, None] = None,
+        check: bool = True,
+        pool: Union[BlockPool, None] = None,
+        validate: bool = False,
+    ) -> Iterator[GLMSim]:
+        """Build simulations from the rows of a 2-D array.
+
+        Yields a copy of the reference simulation for each row with the row
+        written to its parameters.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Array with shape `(num_sims, num_dims)`.
+        sim_name_prefix : Union[str, None]
+            Prefix for the `sim_name` of each simulation. The row index is
+            appended. Default is None (the `sim_name` of the reference
+            simulation).
+        check : bool
+            Check every row with `check()` before building any simulations.
+            Default is True.
+        pool : Union[BlockPool, None]
+            Share blocks with identical content between the simulations
+            through this pool. The reference simulation's blocks are
+            interned first, so only the blocks holding sampled parameters
+            are copied for each row. Default is None (each simulation holds
+            its own copy of every block).
+        validate : bool
+            Validate the blocks holding sampled parameters with
+            `validate_blocks()` after writing each row. Default is False.
+
+        Yields
+        ------
+        GLMSim
+            A simulation for each row of `x`.
+        """
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        if check:
+            invalid = np.flatnonzero(~self.check(x))
+            if len(invalid) > 0:
+                raise ValueError(
+                    f"Rows {invalid.tolist()} are not valid for the "
+                    f"parameters {self.keys}."
+                )
+        if sim_name_prefix is None:
+            sim_name_prefix = self.glm_sim.sim_name
+        if pool is not None:
+            pool.intern_sim(self.glm_sim)
+        for i, xi in enumerate(x):
+            sim = self.glm_sim.get_deepcopy()
+            sim.sim_name = f"{sim_name_prefix}_{i}"
+            self.apply_vector(sim, xi, check=False)
+            if validate:
+                try:
+                    self.validate_blocks(sim)
+                except ValueError as err:
+                    raise ValueError(
+                        f"Row {i} is not valid for its blocks: {err}"
+                    ) from err
+            if pool is not None:
+                pool.intern_sim(sim)
+            yield sim
+
+
+class NMLSampler:
+    """Space-filling samplers for NML parameters.
+
+    Builds an experimental design over a set of `SampledParam`s. Parameter
+    ranges and types are read once from the `NMLParam` validators of a base
+    `GLMSim`: integer parameters are sampled as integers, parameters with
+    `val_switch` values (and bools) are sampled as categories, and list
+    parameters are expanded to one dimension per list item. Every sampled
+    value therefore passes its parameter's validators. Rules that relate
+    several parameters of a block (e.g., increasing `H` and `A` in the
+    `morphometry` block) are not sampled; the blocks are validated when the
+    design is applied to simulations, but constraints that no validator
+    expresses must be kept by the choice of bounds.
+
+    Designs are returned as float64 arrays with shape `(num_samples,
+    num_dims)` in the encoding of the sampler's `ParameterSpace` (see
+    `space`), so they can be checked and applied in bulk.
+
+    Attributes
+    ----------
+    glm_sim : GLMSim
+        The base simulation that parameters are sampled around.
+    params : List[SampledParam]
+        The parameters to sample.
+
+    Examples
+    --------
+    >>> from glmpy.example_sims import SparklingSim
+    >>> from glmpy.sampling import NMLSampler, SampledParam
+    >>> sparkling = SparklingSim()
+    >>> sampler = NMLSampler(
+    ...     sparkling,
+    ...     [
+    ...         SampledParam("glm", "mixing", "coef_mix_conv", 0.1, 0.3),
+    ...         SampledParam("glm", "mixing", "deep_mixing"),
+    ...         SampledParam("glm", "meteorology", "wind_factor", 0.7, 1.3),
+    ...     ],
+    ... )
+    >>> design = sampler.latin_hypercube(1000, seed=42)
+    >>> sims = list(sampler.get_sims(design[:10]))
+    """
+
+    def __init__(self, glm_sim: GLMSim, params: List[SampledParam]):
+        self.glm_sim = glm_sim
+        self.params = params
+        if len(params) == 0:
+            raise ValueError("No parameters to sample.")
+        self.space = ParameterSpace(
+            glm_sim,
+            [
+                p.path if p.index is None else p.path + (p.index,)
+                for p in params
+            ],
+        )
+        self.dims = []
+        for dim, key in enumerate(self.space.keys):
+            sampled_param = params[self.space._dim_path[dim]]
+            self.dims.append(self._compile(sampled_param, key, dim))
+
+    def _compile(
+        self, sampled_param: SampledParam, key: Tuple, dim: int
+    ) -> _Dimension:
+        nml_name, block_name, param_name = sampled_param.path
+        param = self.glm_sim.get_block(nml_name, block_name).params[
+            param_name
+        ]
+        values = self._compile_values(sampled_param, param)
+        if sampled_param.log and (values is not None or param.type is int):
+            raise ValueError(
+                f"log sampling is only supported for float parameters. "
+                f"{param.name} is sampled from discrete values."
+            )
+        if values is not None:
+            lower, upper = 0.0, float(len(values) - 1)
+            codes = np.array([self.space.encode(dim, v) for v in values])
+        else:
+            lower, upper = self._compile_bounds(sampled_param, param)
+            codes = None
+        return _Dimension(
+            path=sampled_param.path,
+            index=key[3] if len(key) == 4 else None,
+            type=param.type,
+            lower=lower,
+            upper=upper,
+            values=values,
+            log=sampled_param.log,
+            codes=codes,
+        )
+
+    def _compile_values(
+        self, sampled_param: SampledParam, param: NMLParam
+    ) -> Union[List[Any], None]:
+        allowed = param._val_switch_values
+        if allowed is None and param.type is bool:
+            allowed = [False, True]
+        if sampled_param.values is None:
+            if allowed is None and param.type is str:
+                raise ValueError(
+                    f"{param.name} is a str parameter without val_switch "
+                    "values. Provide values to sample from."
+                )
+            return None if allowed is None else list(allowed)
+        values = list(sampled_param.values)
+        if len(values) == 0:
+            raise ValueError(f"values for {param.name} cannot be empty.")
+        if allowed is not None:
+            invalid = [v for v in values if v not in allowed]
+            if invalid:
+                raise ValueError(
+                    f"{param.name} must be one of {allowed}. Got {invalid}"
+                )
+        for v in values:
+            if not isinstance(v, param.type):
+                raise ValueError(
+                    f"{param.name} must be of type {param.type}. Got type "
+                    f"{type(v)}"
+                )
+        return values
+
+    def _compile_bounds(
+        self, sampled_param: SampledParam, param: NMLParam
+    ) -> Tuple[float, float]:
+        val_lower, val_upper = _validator_bounds(param)
+        lower = sampled_param.lower
+        upper = sampled_param.upper
+        if param.type is int:
+            for name, bound in (("lower", lower), ("upper", upper)):
+                if bound is not None and not float(bound).is_integer():
+                    raise ValueError(
+                        f"{name} of {bound} for {param.name} must be a whole "
+                        "number because it is an int parameter."
+                    )
+        if lower is None:
+            lower = val_lower
+        elif val_lower is not None and lower < val_lower:
+            raise ValueError(
+                f"lower of {lower} for {param.name} is outside the range "
+                f"allowed by its validators (>= {val_lower})."
+            )
+        if upper is None:
+            upper = val_upper
+        elif val_upper is not None and upper > val_upper:
+            raise ValueError(
+                f"upper of {upper} for {param.name} is outside the range "
+                f"allowed by its validators (<= {val_upper})."
+            )
+        if lower is None or upper is None:
+            raise ValueError(
+                f"{param.name} is not bounded by its validators. Provide "
+                "lower and upper."
+            )
+        if not lower <= upper:
+            raise ValueError(
+                f"lower ({lower}) must not exceed upper ({upper}) for "
+                f"{param.name}."
+            )
+        if sampled_param.log and lower <= 0:
+            raise ValueError(
+                f"lower must be positive to log-sample {param.name}. Got "
+                f"{lower}."
+            )
+        return float(lower), float(upper)
+
+    @property
+    def num_dims(self) -> int:
+        return len(self.dims)
+
+    def get_bounds(self) -> np.ndarray:
+        """Get the lower and upper bound of each design column.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape `(num_dims, 2)`.
+        """
+        return np.array([(d.lower, d.upper) for d in self.dims])
+
+    def scale(self, u: np.ndarray) -> np.ndarray:
+        """Scale points on the unit hypercube to a design.
+
+        Parameters
+        ----------
+        u : np.ndarray
+            Points on `[0, 1)` with shape `(num_samples, num_dims)`.
+
+        Returns
+        -------
+        np.ndarray
+            The design in the encoding of `space`. Integer columns are whole
+            numbers and str columns are indices into `val_switch`.
+        """
+        u = np.asarray(u, dtype=np.float64)
+        if u.ndim != 2 or u.shape[1] != self.num_dims:
+            raise ValueError(
+                f"Expected an array with shape (num_samples, {self.num_dims})"
+                f". Got {u.shape}."
+            )
+        bounds = self.get_bounds()
+        lower = bounds[:, 0]
+        upper = bounds[:, 1]
+        is_log = np.array([d.log for d in self.dims])
+        is_discrete = np.array(
+            [d.values is not None or d.type is int for d in self.dims]
+        )
+        x = np.empty_like(u)
+        cont = ~is_discrete & ~is_log
+        x[:, cont] = lower[cont] + u[:, cont] * (upper[cont] - lower[cont])
+        log = ~is_discrete & is_log
+        if np.any(log):
+            log_lower = np.log(lower[log])
+            log_upper = np.log(upper[log])
+            x[:, log] = np.exp(log_lower + u[:, log] * (log_upper - log_lower))
+        if np.any(is_discrete):
+            num_levels = upper[is_discrete] - lower[is_discrete] + 1.0
+            x[:, is_discrete] = lower[is_discrete] + np.minimum(
+                np.floor(u[:, is_discrete] * num_levels), num_levels - 1.0
+            )
+        np.clip(x, lower, upper, out=x)
+        for j, dim in enumerate(self.dims):
+            if dim.codes is not None:
+                x[:, j] = dim.codes[x[:, j].astype(np.int64)]
+        return x
+
+    def latin_hypercube(
+        self, num_samples: int, seed: Union[int, None] = None
+    ) -> np.ndarray:
+        """Generate a Latin hypercube design.
+
+        Parameters
+        ----------
+        num_samples : int
+            Number of parameter vectors to generate.
+        seed : Union[int, None]
+            Seed for the random number generator. Default is None.
+
+        Returns
+        -------
+        np.ndarray
+            Design with shape `(num_samples, num_dims)`.
+        """
+        rng = np.random.default_rng(seed)
+        strata = np.tile(np.arange(num_samples), (self.num_dims, 1))
+        strata = rng.permuted(strata, axis=1).T
+        u = (strata + rng.random((num_samples, self.num_dims))) / num_samples
+        return self.scale(u)
+
+    def sobol(
+        self,
+        num_samples: int,
+        seed: Union[int, None] = None,
+        scramble: bool = True,
+    ) -> np.ndarray:
+        """Generate a Sobol sequence design.
+
+        Requires `scipy`. `num_samples` should be a power of 2 to preserve
+        the balance properties of the sequence.
+
+        Parameters
+        ----------
+        num_samples : int
+            Number of parameter vectors to generate.
+        seed : Union[int, None]
+            Seed for the scrambling. Default is None.
+        scramble : bool
+            Apply Owen scrambling. Default is True.
+
+        Returns
+        -------
+        np.ndarray
+            Design with shape `(num_samples, num_dims)`.
+        """
+        try:
+            from scipy.stats import qmc
+        except ImportError as e:
+            raise ImportError(
+                "scipy is required for Sobol sequences. Install scipy or use "
+                "latin_hypercube()."
+            ) from e
+        engine = qmc.Sobol(d=self.num_dims, scramble=scramble, seed=seed)
+        return self.scale(engine.random(num_samples))
+
+    def get_values(self, x: np.ndarray) -> List[Any]:
+        """Convert a row of a design to parameter values.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            A single row of a design with shape `(num_dims,)`.
+
+        Returns
+        -------
+        List[Any]
+            The typed value of each dimension.
+        """
+        return [self.space.decode(dim, xi) for dim, xi in enumerate(x)]
+
+    def get_sims(
+        self,
+        design: np.ndarray,
+        sim_name_prefix: Union[str, None] = None,
+        pool: Union[BlockPool, None] = None,
+    ) -> Iterator[GLMSim]:
+        """Build simulations from a design.
+
+        Yields a copy of the base simulation for each row of the design with
+        the sampled values assigned. The blocks holding sampled parameters
+        are validated after each row is assigned, and a `ValueError` naming
+        the row is raised if a block rule is broken.
+
+        Parameters
+        ----------
+        design : np.ndarray
+            Design with shape `(num_samples, num_dims)`.
+        sim_name_prefix : Union[str, None]
+            Prefix for the `sim_name` of each simulation. The row index is
+            appended. Default is None (the `sim_name` of the base simulation).
+        pool : Union[BlockPool, None]
+            Share blocks with identical content between the simulations. See
+            `ParameterSpace.get_sims()`.
+
+        Returns
+        -------
+        Iterator[GLMSim]
+            A simulation for each row of the design.
+        """
+        return self.space.get_sims(
+            design, sim_name_prefix=sim_name_prefix, check=False, pool=pool,
+            validate=True,
+        )
@@ -32,7 +32,8 @@ class LocalSensitivity:
         for i in range(0, num_sims):
             si_sim = self.glm_sim.get_deepcopy()
             si_sim.sim_name = f"{self.glm_sim.sim_name}_{i}"
-            si_sim.nml[x_nml].blocks[x_block].params[x_param].value = new_x_vals[i]
+            x_block_obj = si_sim.nml[x_nml].blocks.unshare(x_block)
+            x_block_obj.params[x_param].value = new_x_vals[i]
             si_sim.validate()
             self._si_sims.append(si_sim)
 
@@ -1,6 +1,7 @@
 import os
 import copy
 import time
+import queue
 import pickle
 import shutil
 import warnings
@@ -8,9 +9,11 @@ import datetime
 import pandas as pd
 import multiprocessing
 
-from glmpy.nml.nml import NMLDict, NML, NMLBlock
+from glmpy.nml.nml import NMLDict, NML, NMLBlock, NMLTemplate
 from glmpy.nml.glm_nml import GLMNML
-from typing import Union, Dict, List, Any, Callable
+from glmpy import sim_file
+from glmpy.dbase_store import DBaseStore
+from typing import Union, Dict, List, Any, Callable, Iterator, Tuple
 from abc import ABC, abstractmethod
 
 class BcsDict(dict):
@@ -27,6 +30,22 @@ class Sim(ABC):
         self.bcs = BcsDict()
         self.aed_dbase = {}
         self.outputs_dir = "."
+
+    def __getattr__(self, name: str):
+        # Simulations read from a v2 .glmpy file load their NMLs, BCs and
+        # AED databases on first access
+        loader = self.__dict__.get("_sim_file")
+        if loader is None or name not in sim_file.LAZY_ATTRS:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        value = loader.load(name)
+        if name == "bcs":
+            value = BcsDict(value)
+        setattr(self, name, value)
+        if all(attr in self.__dict__ for attr in sim_file.LAZY_ATTRS):
+            del self.__dict__["_sim_file"]
+        return value
     
     @property
     def sim_name(self):
@@ -34,7 +53,8 @@ class Sim(ABC):
 
     @sim_name.setter
     def sim_name(self, value: str):
-        self.nml["glm"].blocks["glm_setup"].params["sim_name"].value = value
+        glm_setup = self.nml["glm"].blocks.unshare("glm_setup")
+        glm_setup.params["sim_name"].value = value
         self._sim_name = (
             self.nml["glm"].blocks["glm_setup"].params["sim_name"].value
         )
@@ -63,25 +83,21 @@ class Sim(ABC):
 
         for key, value in self.nml.items():
             nml_name = value.nml_name
-            if nml_name == "glm":
-                self.nml["glm"].write_nml(
-                    os.path.join(self.outputs_dir, self.sim_name, "glm3.nml")
-                )
-            elif nml_name == "aed":
-                os.makedirs(
-                    os.path.join(self.outputs_dir, self.sim_name, "aed")
-                )
-                self.nml["aed"].write_nml(
-                    os.path.join(
-                        self.outputs_dir, self.sim_name, "aed", "aed.nml"
-                    )
-                )
-            else:
-                self.nml[nml_name].write_nml(
-                    os.path.join(
-                        self.outputs_dir, self.sim_name, f"{nml_name}.nml"
-                    )
-                )
+            nml_file = os.path.join(
+                self.outputs_dir, self.sim_name, self.nml_file_path(nml_name)
+            )
+            os.makedirs(os.path.dirname(nml_file), exist_ok=True)
+            self.nml[nml_name].write_nml(nml_file)
+
+    @staticmethod
+    def nml_file_path(nml_name: str) -> str:
+        """Path of an NML file relative to the simulation directory."""
+        if nml_name == "glm":
+            return "glm3.nml"
+        elif nml_name == "aed":
+            return os.path.join("aed", "aed.nml")
+        else:
+            return f"{nml_name}.nml"
 
     @abstractmethod
     def prepare_bcs(self):
@@ -91,10 +107,18 @@ class Sim(ABC):
     def prepare_aed_dbases(self):
         pass
 
-    def write_bc_csv(self, nml: str, block: str, bc_fl_param: str):
+    def write_bc_csv(
+        self,
+        nml: str,
+        block: str,
+        bc_fl_param: str,
+        missing_ok: bool = False,
+    ):
         def _write_single_fl(bc_fl_path):
             bc_fl = os.path.basename(bc_fl_path).split(".")[0]
             if bc_fl not in self.bcs.keys():
+                if missing_ok:
+                    return
                 raise KeyError(
                     f"{bc_fl} is not defined in the bcs attribute keys. "
                     f"{bc_fl_param} was set to {bc_fl_path} in the "
@@ -113,15 +137,20 @@ class Sim(ABC):
             )
         if (
             block in self.nml[nml].blocks.keys()
+            and self.nml[nml].blocks[block] is not None
             and bc_fl_param
             in self.nml[nml].blocks[block].params.keys()
         ):
             bc_fl_paths = (
                 self.nml[nml].blocks[block].params[bc_fl_param].value
             )
+            # Unset paths (e.g., with num_inflows = 0) have no file to write
+            if bc_fl_paths is None:
+                return
             if isinstance(bc_fl_paths, list):
                 for bc_fl_path in bc_fl_paths:
-                    _write_single_fl(bc_fl_path)
+                    if bc_fl_path is not None:
+                        _write_single_fl(bc_fl_path)
             else:
                 bc_fl_path = bc_fl_paths
                 _write_single_fl(bc_fl_path)
@@ -139,20 +168,39 @@ class Sim(ABC):
     def get_sim_dir(self):
         return os.path.join(self.outputs_dir, self.sim_name)
 
-    def to_file(self, path: str):
+    def to_file(self, path: str, version: int = 1):
+        """Save the simulation to a `.glmpy` file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file. Must have the `.glmpy` extension.
+        version : int
+            File format. Version 1 (default) pickles the whole object.
+            Version 2 stores NML values as JSON, BCs as Parquet and AED
+            databases by content hash, and can be loaded lazily (see
+            `glmpy.sim_file`). Version 2 requires `pyarrow` and attributes
+            that are JSON-serialisable.
+        """
         _, file_extension = os.path.splitext(path)
         if not file_extension == ".glmpy":
             raise ValueError(
                 "The `.glmpy` extension must be used with the to_file() "
                 f"method. Got {file_extension}"
             )
-        with open(path, "wb") as f:
-            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        if version == 2:
+            sim_file.write_sim_file(self, path)
+        elif version == 1:
+            with open(path, "wb") as f:
+                pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        else:
+            raise ValueError(f"version must be 1 or 2. Got {version}.")
 
     def set_param_value(
             self, nml_name:str, block_name:str, param_name:str, value:Any
         ):
-        self.nml[nml_name].blocks[block_name].params[param_name].value = value
+        block = self.nml[nml_name].blocks.unshare(block_name)
+        block.params[param_name].value = value
         self.validate()
     
     def get_param_value(self, nml_name:str, block_name:str, param_name:str) -> Any:
@@ -204,6 +252,7 @@ class GLMSim(Sim):
         bcs: Union[None, Dict[str, pd.DataFrame]] = None,
         sim_name: Union[str, None] = None,
         outputs_dir: str = ".",
+        dbase_dir: Union[str, None] = None,
     ):
         super().__init__()
         self.nml[glm_nml.nml_name] = glm_nml
@@ -213,55 +262,369 @@ class GLMSim(Sim):
                 self.nml[nml_file.nml_name] = nml_file
         self.outputs_dir = outputs_dir
         self.aed_dbase = aed_dbase
+        self.dbase_dir = dbase_dir
         if bcs is not None:
             self.bcs.update(bcs)
 
     # prepare_aux_files
     def prepare_bcs(self):
         self.write_bc_csv("glm", "meteorology", "meteo_fl")
+        # Inflow and outflow files not in bcs are expected to be provided
+        # separately
+        self.write_bc_csv("glm", "inflow", "inflow_fl", missing_ok=True)
+        self.write_bc_csv("glm", "outflow", "outflow_fl", missing_ok=True)
 
     def prepare_aed_dbases(self):
-        self.copy_aed_dbase("aed", "aed_zooplankton", "dbase")
-        self.copy_aed_dbase("aed", "aed_phytoplankton", "dbase")
-        self.copy_aed_dbase("aed", "aed_macrophyte", "dbase")
+        dbase_index = self._aed_dbase_index()
+        self.copy_aed_dbase("aed", "aed_zooplankton", "dbase", dbase_index)
+        self.copy_aed_dbase("aed", "aed_phytoplankton", "dbase", dbase_index)
+        self.copy_aed_dbase("aed", "aed_macrophyte", "dbase", dbase_index)
+
+    def _aed_dbase_index(self) -> Dict[str, Any]:
+        # Each entry of aed_dbase is either the path of a database file,
+        # matched by its basename, or a DBaseTable, matched by its block's
+        # file_name. Later entries take precedence, as with the copies they
+        # replace.
+        dbase_index = {}
+        for dbase in self.aed_dbase:
+            if isinstance(dbase, (str, os.PathLike)):
+                dbase_index[os.path.basename(dbase)] = dbase
+            else:
+                dbase_index[dbase.block_type.file_name] = dbase
+        return dbase_index
 
-    
     def copy_aed_dbase(
-        self, nml_name:str, block_name:str, param_name: str
+        self,
+        nml_name: str,
+        block_name: str,
+        param_name: str,
+        dbase_index: Union[Dict[str, Any], None] = None,
     ):
-        if nml_name in self.nml.keys():
-            if self.nml[nml_name].blocks[block_name] is not None:
-                if param_name in self.nml[nml_name].blocks[block_name].params.keys():
-                    param = self.nml[nml_name].blocks[block_name].params[param_name]
-                    dest_path = param.value
-                    if dest_path is not None:
-                        dest_file_name = os.path.basename(dest_path)
-                        for src_file_path in self.aed_dbase:
-                            if dest_file_name == os.path.basename(src_file_path):
-                                shutil.copyfile(
-                                    src=src_file_path,
-                                    dst=os.path.join(
-                                        self.outputs_dir, 
-                                        self.sim_name, 
-                                        dest_path
-                                    )
-                                )
+        """Link an AED database into the simulation directory.
+
+        Databases are stored once per distinct content in a `DBaseStore`
+        (at `dbase_dir`) and hard-linked to the path set by the block's
+        `param_name` parameter. Databases given as `DBaseTable`s are
+        rendered as `.csv` or `.nml` text to match that path.
+        """
+        if nml_name not in self.nml.keys():
+            return
+        block = self.nml[nml_name].blocks[block_name]
+        if block is None or param_name not in block.params.keys():
+            return
+        dest_path = block.params[param_name].value
+        if dest_path is None:
+            return
+        if dbase_index is None:
+            dbase_index = self._aed_dbase_index()
+        dest_file_name = os.path.basename(dest_path)
+        dbase = dbase_index.get(dest_file_name)
+        if dbase is None:
+            dbase = dbase_index.get(os.path.splitext(dest_file_name)[0])
+            if dbase is None or isinstance(dbase, (str, os.PathLike)):
+                return
+        store = DBaseStore(getattr(self, "dbase_dir", None))
+        store.materialise(
+            dbase,
+            os.path.join(self.outputs_dir, self.sim_name, dest_path),
+        )
     
     def validate(self):
         self.nml.validate()
     
     @staticmethod
-    def from_file(path: str) -> "GLMSim":
+    def from_file(path: str, memory_map: bool = False) -> "GLMSim":
+        """Load a simulation saved with `to_file()`.
+
+        Version 2 files are opened lazily: the NMLs, BCs and AED databases
+        are read when first accessed. Version 1 (pickle) files are loaded
+        in full.
+
+        Parameters
+        ----------
+        path : str
+            Path of the `.glmpy` file.
+        memory_map : bool
+            Memory-map the BC Parquet files of a version 2 file. Default is
+            False.
+        """
         _, file_extension = os.path.splitext(path)
         if not file_extension == ".glmpy":
             raise ValueError(
                 "The `.glmpy` extension must be used with the from_file() "
                 f"method. Got {file_extension}"
             )
+        if sim_file.is_sim_file(path):
+            return sim_file.read_sim_file(path, memory_map=memory_map)
         with open(path, "rb") as f:
             return pickle.load(f)
 
 
+class SimTemplate:
+    """Compiled NML templates for sweeping parameters of a `GLMSim`.
+
+    The NMLs of the base simulation are validated and rendered once, with
+    placeholders for the swept parameters. Members created by `get_sims()`
+    share the base simulation's NMLs, boundary conditions and databases and
+    hold only their swept values. When a member runs, its NML files are
+    rendered by substituting the values into the compiled text rather than
+    re-serialising every block, and only the swept values are validated.
+
+    Attributes
+    ----------
+    glm_sim : GLMSim
+        The base simulation. It should not be modified while members created
+        from the template are in use.
+    params : List[tuple]
+        The swept parameters as `(nml_name, block_name, param_name)` or
+        `(nml_name, block_name, param_name, index)` tuples. An `index` sweeps
+        a single element of a list parameter.
+    templates : Dict[str, NMLTemplate]
+        The template of each NML of the base simulation.
+
+    Examples
+    --------
+    >>> from glmpy.sim import GLMSim, MultiSim, SimTemplate
+    >>> glm_sim = GLMSim.from_file("richmond.glmpy")
+    >>> template = SimTemplate(
+    ...     glm_sim,
+    ...     [("glm", "mixing", "coef_mix_hyp"), ("glm", "light", "Kw")],
+    ... )
+    >>> sims = template.get_sims(
+    ...     [[0.3, 0.5], [0.4, 0.8], [0.5, 1.2]], sim_name_prefix="sweep"
+    ... )
+    >>> MultiSim(list(sims)).run(rm_sim_dir=False)
+    """
+
+    def __init__(self, glm_sim: "GLMSim", params: List[tuple]):
+        glm_sim.validate()
+        self.glm_sim = glm_sim
+        self.params = [tuple(param) for param in params]
+        self._slots = {}
+        self._dims = []
+        for param in self.params:
+            if len(param) == 3:
+                nml_name, block_name, param_name = param
+                index = None
+            elif len(param) == 4:
+                nml_name, block_name, param_name, index = param
+            else:
+                raise ValueError(
+                    "Parameters must be (nml_name, block_name, param_name) "
+                    f"or (nml_name, block_name, param_name, index). Got "
+                    f"{param}."
+                )
+            if nml_name not in glm_sim.nml:
+                raise ValueError(f"{nml_name} is not an NML of the simulation.")
+            slots = self._slots.setdefault(nml_name, [])
+            key = (block_name, param_name)
+            if key not in slots:
+                slots.append(key)
+            self._dims.append((nml_name, slots.index(key), index))
+        # Each member writes its own sim_name to glm_setup
+        glm_slots = self._slots.setdefault("glm", [])
+        if ("glm_setup", "sim_name") not in glm_slots:
+            glm_slots.append(("glm_setup", "sim_name"))
+        self._sim_name_slot = glm_slots.index(("glm_setup", "sim_name"))
+        self.templates = {
+            nml_name: NMLTemplate(nml, self._slots.get(nml_name, []))
+            for nml_name, nml in glm_sim.nml.items()
+            if nml is not None
+        }
+        self._base_values = {
+            nml_name: [
+                glm_sim.get_param_value(nml_name, block_name, param_name)
+                for block_name, param_name in slots
+            ]
+            for nml_name, slots in self._slots.items()
+        }
+
+    def get_nml_values(
+        self, values: List[Any], sim_name: Union[str, None] = None
+    ) -> Dict[str, List[Any]]:
+        """Values of each NML template's placeholders for a member.
+
+        Parameters
+        ----------
+        values : List[Any]
+            A value for each parameter in `params`.
+        sim_name : Union[str, None]
+            The member's `sim_name`. Default is None (the `sim_name` of the
+            base simulation).
+
+        Returns
+        -------
+        Dict[str, List[Any]]
+            The placeholder values keyed by NML name.
+        """
+        if len(values) != len(self._dims):
+            raise ValueError(
+                f"Expected {len(self._dims)} values for {self.params}. Got "
+                f"{len(values)}."
+            )
+        nml_values = {
+            nml_name: list(base_values)
+            for nml_name, base_values in self._base_values.items()
+        }
+        copied = set()
+        for (nml_name, slot, index), value in zip(self._dims, values):
+            if index is None:
+                nml_values[nml_name][slot] = value
+            else:
+                if (nml_name, slot) not in copied:
+                    base_list = nml_values[nml_name][slot]
+                    nml_values[nml_name][slot] = list(base_list)
+                    copied.add((nml_name, slot))
+                nml_values[nml_name][slot][index] = value
+        if sim_name is not None:
+            nml_values["glm"][self._sim_name_slot] = sim_name
+        return nml_values
+
+    def check(self, values: List[Any]):
+        """Validate a member's values against their `NMLParam` rules."""
+        for nml_name, nml_values in self.get_nml_values(values).items():
+            self.templates[nml_name].check(nml_values)
+
+    def write_nmls(
+        self,
+        sim_dir: str,
+        values: List[Any],
+        sim_name: Union[str, None] = None,
+        check: bool = True,
+    ):
+        """Render and write the NML files of a member to `sim_dir`.
+
+        Parameters
+        ----------
+        sim_dir : str
+            The member's simulation directory.
+        values : List[Any]
+            A value for each parameter in `params`.
+        sim_name : Union[str, None]
+            The member's `sim_name`. Default is None (the `sim_name` of the
+            base simulation).
+        check : bool
+            Validate the values. Default is True.
+        """
+        nml_values = self.get_nml_values(values, sim_name)
+        for nml_name, template in self.templates.items():
+            nml_file = os.path.join(sim_dir, Sim.nml_file_path(nml_name))
+            os.makedirs(os.path.dirname(nml_file), exist_ok=True)
+            template.write(nml_file, nml_values.get(nml_name, []), check)
+
+    def get_sims(
+        self,
+        values: List[List[Any]],
+        sim_name_prefix: Union[str, None] = None,
+    ) -> Iterator["TemplateSim"]:
+        """Create a member for each row of values.
+
+        Parameters
+        ----------
+        values : List[List[Any]]
+            A row of values for each member, in the order of `params`.
+        sim_name_prefix : Union[str, None]
+            Prefix for the `sim_name` of each member. The row index is
+            appended. Default is None (the `sim_name` of the base
+            simulation).
+
+        Returns
+        -------
+        Iterator[TemplateSim]
+            A member for each row.
+        """
+        if sim_name_prefix is None:
+            sim_name_prefix = self.glm_sim.sim_name
+        for i, row in enumerate(values):
+            yield TemplateSim(self, list(row), f"{sim_name_prefix}_{i}")
+
+
+class TemplateSim(GLMSim):
+    """A member of a `SimTemplate` sweep.
+
+    Shares the NMLs, boundary conditions and databases of the template's
+    base simulation and stores only its swept values. Its NML files are
+    rendered from the template when it runs.
+
+    Attributes
+    ----------
+    template : SimTemplate
+        The template the member belongs to.
+    values : List[Any]
+        The member's value for each of the template's `params`.
+    """
+
+    def __init__(self, template: SimTemplate, values: List[Any], sim_name: str):
+        Sim.__init__(self)
+        base = template.glm_sim
+        self.template = template
+        self.values = values
+        self.nml = base.nml
+        self.bcs = base.bcs
+        self.aed_dbase = base.aed_dbase
+        self.dbase_dir = getattr(base, "dbase_dir", None)
+        self.outputs_dir = base.outputs_dir
+        self.sim_name = sim_name
+
+    @property
+    def sim_name(self):
+        return self._sim_name
+
+    @sim_name.setter
+    def sim_name(self, value: str):
+        # The shared glm_setup block is left unchanged; the name is written
+        # when the NMLs are rendered
+        self._sim_name = value
+
+    def validate(self):
+        self.template.check(self.values)
+
+    def prepare_inputs(self):
+        sim_dir = os.path.join(self.outputs_dir, self.sim_name)
+        if os.path.isdir(sim_dir):
+            shutil.rmtree(sim_dir)
+        os.makedirs(sim_dir)
+        # Values are validated by run()
+        self.template.write_nmls(
+            sim_dir, self.values, self.sim_name, check=False
+        )
+
+    def get_param_value(
+        self, nml_name: str, block_name: str, param_name: str
+    ) -> Any:
+        nml_values = self.template.get_nml_values(self.values, self.sim_name)
+        slots = self.template._slots.get(nml_name, [])
+        if (block_name, param_name) in slots:
+            slot = slots.index((block_name, param_name))
+            return nml_values[nml_name][slot]
+        return super().get_param_value(nml_name, block_name, param_name)
+
+    def _read_only(self, *args, **kwargs):
+        raise ValueError(
+            "A TemplateSim shares the NMLs of its template. Set the swept "
+            "values with the `values` attribute or modify a copy of the base "
+            "simulation."
+        )
+
+    set_param_value = _read_only
+    set_block = _read_only
+    set_nml = _read_only
+
+    def to_file(self, path: str, version: int = 1):
+        """Save the member to a `.glmpy` file.
+
+        Only version 1 is supported: a member holds its `SimTemplate`,
+        which cannot be stored as JSON. See `Sim.to_file()`.
+        """
+        if version == 2:
+            raise ValueError(
+                "A TemplateSim holds its SimTemplate and cannot be stored in "
+                "a v2 .glmpy file. Use to_file(path, version=1) or save the "
+                "template's base simulation."
+            )
+        super().to_file(path, version=version)
+
+
 class GLMRunner:
     @staticmethod
     def glmpy_glm_path() -> Union[str, None]:
@@ -335,6 +698,30 @@ class GLMRunner:
 def no_op_callback(x):
     return None
 
+
+def _run_single_sim(
+    glm_sim: GLMSim,
+    on_sim_end: Callable[[GLMSim], Any],
+    rm_sim_dir: bool = False,
+    write_log: bool = True,
+    time_sim: bool = True,
+    glm_path: Union[str, None] = "./glm",
+):
+    # Submitted to the worker pool by MultiSim. A module-level function, so
+    # only its arguments are pickled for each task, not the MultiSim and
+    # its (possibly unpicklable) iterable of simulations.
+    glm_sim.run(
+        write_log=write_log,
+        quiet=True,
+        time_sim=time_sim,
+        glm_path=glm_path,
+    )
+    rv = on_sim_end(glm_sim)
+    if rm_sim_dir:
+        glm_sim.rm_sim_dir()
+    return rv
+
+
 class MultiSim:
     def __init__(self, glm_sims: List[GLMSim]):
         self.glm_sims = glm_sims
@@ -351,16 +738,9 @@ class MultiSim:
             time_sim: bool = True,
             glm_path: Union[str, None] = "./glm",
         ):
-        glm_sim.run(
-            write_log=write_log,
-            quiet=True,
-            time_sim=time_sim,
-            glm_path=glm_path,
+        return _run_single_sim(
+            glm_sim, on_sim_end, rm_sim_dir, write_log, time_sim, glm_path
         )
-        rv = on_sim_end(glm_sim)
-        if rm_sim_dir:
-            glm_sim.rm_sim_dir()
-        return rv
 
     def run(
         self,
@@ -403,7 +783,7 @@ class MultiSim:
             for glm_sim in self.glm_sims
         ]
         with multiprocessing.Pool(processes=cpu_count) as pool:
-            rvs = pool.starmap(self.run_single_sim, args)
+            rvs = pool.starmap(_run_single_sim, args)
         if time_multi_sim:
             end_time = time.perf_counter()
             total_duration = end_time - start_time
@@ -413,3 +793,100 @@ class MultiSim:
                 f"{str(total_duration)}"
             )
         return rvs
+
+    def run_iter(
+        self,
+        on_sim_end: Union[Callable, None] = None,
+        cpu_count: Union[int, None] = None,
+        max_pending: Union[int, None] = None,
+        rm_sim_dir: bool = False,
+        write_log: bool = True,
+        time_sim: bool = True,
+        glm_path: Union[str, None] = "./glm",
+    ) -> Iterator[Tuple[int, Any]]:
+        """Run the simulations and yield results as they complete.
+
+        Unlike `run()`, results are yielded in completion order as
+        `(index, rv)` tuples, where `index` is the position of the
+        simulation in `glm_sims`. At most `max_pending` simulations are
+        submitted to the pool at once and `glm_sims` is consumed lazily, so
+        a generator of simulations (e.g., from `NMLSampler.get_sims()`) can
+        be run without holding every simulation in memory.
+
+        Parameters
+        ----------
+        on_sim_end : Union[Callable, None]
+            Called in the worker process with the `GLMSim` after it has
+            run. Its return value is yielded. Default is None.
+        cpu_count : Union[int, None]
+            Number of worker processes. Default is None (all CPUs).
+        max_pending : Union[int, None]
+            Maximum number of simulations submitted but not yet completed.
+            Default is None (twice `cpu_count`).
+        rm_sim_dir : bool
+            Remove the simulation directory after `on_sim_end` is called.
+            Default is False.
+        write_log : bool
+            Write the GLM log to the simulation directory. Default is True.
+        time_sim : bool
+            Print the duration of each simulation. Default is True.
+        glm_path : Union[str, None]
+            Path to the GLM binary. Default is `"./glm"`.
+
+        Yields
+        ------
+        Tuple[int, Any]
+            The index of the simulation and the return value of
+            `on_sim_end`.
+        """
+        if on_sim_end is None:
+            on_sim_end = no_op_callback
+        sys_cpu_count = self.cpu_count()
+        if cpu_count is None:
+            cpu_count = sys_cpu_count if sys_cpu_count is not None else 1
+        if sys_cpu_count is not None and cpu_count > sys_cpu_count:
+            raise ValueError(
+                f"cpu_count of {cpu_count} exceeds the {sys_cpu_count} "
+                f"CPUs on the system."
+            )
+        if max_pending is None:
+            max_pending = 2 * cpu_count
+        if max_pending < 1:
+            raise ValueError(
+                f"max_pending must be at least 1. Got {max_pending}."
+            )
+        completed = queue.Queue()
+        glm_sims = enumerate(self.glm_sims)
+        num_pending = 0
+        with multiprocessing.Pool(processes=cpu_count) as pool:
+
+            def submit() -> bool:
+                try:
+                    index, glm_sim = next(glm_sims)
+                except StopIteration:
+                    return False
+                pool.apply_async(
+                    _run_single_sim,
+                    (
+                        glm_sim,
+                        on_sim_end,
+                        rm_sim_dir,
+                        write_log,
+                        time_sim,
+                        glm_path,
+                    ),
+                    callback=lambda rv: completed.put((index, rv, None)),
+                    error_callback=lambda e: completed.put((index, None, e)),
+                )
+                return True
+
+            while num_pending < max_pending and submit():
+                num_pending += 1
+            while num_pending > 0:
+                index, rv, error = completed.get()
+                num_pending -= 1
+                if error is not None:
+                    raise error
+                if submit():
+                    num_pending += 1
+                yield index, rv
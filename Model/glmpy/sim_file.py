@@ -0,0 +1,367 @@
+"""Reading and writing `.glmpy` v2 simulation files.
+
+A v2 file is an uncompressed zip archive:
+
+- `glmpy.json`: the format version, the simulation's class, `sim_name`,
+  `outputs_dir`, other JSON-serialisable attributes, and an index of the
+  BCs and AED databases.
+- `nml.json`: the value of every NML parameter, keyed by NML, block and
+  parameter name, with the class of each NML and block.
+- `bcs/<i>.parquet`: one Parquet file per boundary condition DataFrame.
+- `dbase/<sha256>`: the content of each AED database file, stored once per
+  distinct content.
+
+Members are stored uncompressed so that Parquet files can be memory-mapped
+directly from the archive. Only `glmpy.json` is read when a file is
+opened; NMLs, BCs and databases are read on first access.
+"""
+
+import io
+import os
+import json
+import struct
+import hashlib
+import zipfile
+import importlib
+
+from typing import Any, Dict, List, Union
+from collections import OrderedDict
+
+from glmpy import _cache
+from glmpy._lazy import LazyModule
+from glmpy.nml.nml import NMLDict, NMLBlock
+
+pa = LazyModule("pyarrow")
+pq = LazyModule("pyarrow.parquet")
+
+SIM_FILE_VERSION = 2
+
+# Attributes of a Sim stored in their own archive members and loaded on
+# first access
+LAZY_ATTRS = ("nml", "bcs", "aed_dbase")
+
+_ZIP_MAGIC = b"PK\x03\x04"
+
+
+def is_sim_file(path: str) -> bool:
+    """Whether `path` is a v2 `.glmpy` file rather than a pickle."""
+    with open(path, "rb") as file:
+        return file.read(4) == _ZIP_MAGIC
+
+
+def _class_path(obj: Any) -> str:
+    cls = obj if isinstance(obj, type) else type(obj)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _import_class(class_path: str) -> type:
+    module_name, qualname = class_path.split(":")
+    obj = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable"
+    )
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, default=_json_default, separators=(",", ":")
+    ).encode()
+
+
+def _nml_to_dict(nml_dict: NMLDict) -> dict:
+    nmls = OrderedDict()
+    for nml_name, nml in nml_dict.items():
+        if nml is None:
+            nmls[nml_name] = None
+            continue
+        blocks = OrderedDict()
+        for block_name, block in nml.blocks.items():
+            if block is None:
+                blocks[block_name] = None
+                continue
+            blocks[block_name] = {
+                "class": _class_path(block),
+                "strict": block.strict,
+                "params": OrderedDict(
+                    (key, param.value) for key, param in block.params.items()
+                ),
+            }
+        nmls[nml_name] = {
+            "class": _class_path(nml),
+            # Not every NML sets `strict` in its __init__
+            "strict": getattr(nml, "_strict", None),
+            "blocks": blocks,
+        }
+    return {"strict": nml_dict.strict, "nmls": nmls}
+
+
+def _block_from_dict(block_name: str, block_dict: dict) -> NMLBlock:
+    block = _import_class(block_dict["class"])()
+    block.strict = block_dict["strict"]
+    params = block.params
+    for key, value in block_dict["params"].items():
+        if key not in params:
+            raise ValueError(
+                f"{key} is not a parameter of {block_name} "
+                f"({block_dict['class']})."
+            )
+        params[key].value = value
+    return block
+
+
+def _nml_from_dict(data: dict) -> NMLDict:
+    # `strict` is set on each container before its items are added, as in
+    # NMLDictBase.__setstate__, so that it does not overwrite theirs
+    nml_dict = NMLDict()
+    nml_dict.strict = data["strict"]
+    for nml_name, nml_data in data["nmls"].items():
+        if nml_data is None:
+            nml_dict[nml_name] = None
+            continue
+        nml = _import_class(nml_data["class"])()
+        nml.blocks.clear()
+        if nml_data["strict"] is not None:
+            nml.strict = nml_data["strict"]
+        for block_name, block_data in nml_data["blocks"].items():
+            if block_data is None:
+                nml.blocks[block_name] = None
+            else:
+                nml.blocks[block_name] = _block_from_dict(
+                    block_name, block_data
+                )
+        nml_dict[nml_name] = nml
+    return nml_dict
+
+
+def _write_parquet(df) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df), buffer)
+    return buffer.getvalue()
+
+
+def _read_parquet(source):
+    return pq.read_table(source).to_pandas()
+
+
+def write_sim_file(sim: Any, path: str):
+    """Write a simulation to a v2 `.glmpy` file.
+
+    Parameters
+    ----------
+    sim : Sim
+        The simulation. Besides `nml`, `bcs`, `aed_dbase`, `outputs_dir`
+        and `sim_name`, its attributes must be JSON-serialisable.
+    path : str
+        Path of the `.glmpy` file.
+    """
+    attrs = {}
+    for key, value in vars(sim).items():
+        if key in LAZY_ATTRS or key in ("outputs_dir", "_sim_name"):
+            continue
+        if key == "_sim_file":
+            continue
+        try:
+            _dumps(value)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"The {key} attribute of {type(sim).__name__} cannot be "
+                "stored in a v2 .glmpy file. Use to_file(path, version=1)."
+            )
+        attrs[key] = value
+
+    bcs = []
+    dbases = []
+    members = {}
+    for i, (bc_name, bc) in enumerate(sim.bcs.items()):
+        member = f"bcs/{i}.parquet"
+        members[member] = _write_parquet(bc)
+        bcs.append([bc_name, member])
+    for src_path in sim.aed_dbase:
+        if not isinstance(src_path, (str, os.PathLike)):
+            raise ValueError(
+                "AED databases held as tables cannot be stored in a v2 "
+                "`.glmpy` file. Write them to files with to_csv() or use "
+                "to_file(path, version=1)."
+            )
+        with open(src_path, "rb") as file:
+            data = file.read()
+        digest = hashlib.sha256(data).hexdigest()
+        members[f"dbase/{digest}"] = data
+        dbases.append({
+            "name": os.path.basename(src_path),
+            "path": str(src_path),
+            "sha256": digest,
+        })
+    manifest = {
+        "format": "glmpy",
+        "version": SIM_FILE_VERSION,
+        "class": _class_path(sim),
+        "sim_name": sim.sim_name,
+        "outputs_dir": sim.outputs_dir,
+        "attrs": attrs,
+        "bcs": bcs,
+        "aed_dbase": dbases,
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("glmpy.json", _dumps(manifest))
+        zf.writestr("nml.json", _dumps(_nml_to_dict(sim.nml)))
+        for member, data in members.items():
+            zf.writestr(member, data)
+    os.replace(tmp_path, path)
+
+
+class SimFile:
+    """Lazy reader of the members of a v2 `.glmpy` file.
+
+    Held by a simulation loaded with `read_sim_file()` until each of its
+    `LAZY_ATTRS` has been loaded. Only the path and index are stored, so a
+    simulation can be copied or pickled before its parts are loaded.
+
+    Attributes
+    ----------
+    path : str
+        Absolute path of the `.glmpy` file.
+    manifest : dict
+        Contents of `glmpy.json`.
+    memory_map : bool
+        Memory-map BC Parquet files from the archive instead of reading
+        them into memory first.
+    dbase_dir : Union[str, None]
+        Directory that AED database files are extracted to, one
+        subdirectory per content hash. Default is None, which uses
+        `dbase` in glmpy's cache directory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memory_map: bool = False,
+        dbase_dir: Union[str, None] = None,
+    ):
+        self.path = os.path.abspath(path)
+        stat = os.stat(self.path)
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+        with zipfile.ZipFile(self.path) as zf:
+            self.manifest = json.loads(zf.read("glmpy.json"))
+        if self.manifest.get("version") != SIM_FILE_VERSION:
+            raise ValueError(
+                f"Unsupported .glmpy version {self.manifest.get('version')}."
+            )
+        self.memory_map = memory_map
+        self.dbase_dir = dbase_dir
+
+    def _check_unchanged(self):
+        stat = os.stat(self.path)
+        if (stat.st_mtime_ns, stat.st_size) != self._stamp:
+            raise ValueError(
+                f"{self.path} has changed since the simulation was loaded."
+            )
+
+    def load(self, name: str) -> Any:
+        """Read one of `LAZY_ATTRS` from the file."""
+        self._check_unchanged()
+        if name == "nml":
+            return self.load_nml()
+        elif name == "bcs":
+            return self.load_bcs()
+        elif name == "aed_dbase":
+            return self.load_aed_dbase()
+        raise ValueError(f"{name} is not stored in a .glmpy file.")
+
+    def load_nml(self) -> NMLDict:
+        with zipfile.ZipFile(self.path) as zf:
+            return _nml_from_dict(json.loads(zf.read("nml.json")))
+
+    def load_bcs(self) -> Dict[str, Any]:
+        bcs = {}
+        with zipfile.ZipFile(self.path) as zf:
+            if not self.memory_map:
+                for bc_name, member in self.manifest["bcs"]:
+                    bcs[bc_name] = _read_parquet(
+                        pa.BufferReader(zf.read(member))
+                    )
+                return bcs
+            with open(self.path, "rb") as file:
+                offsets = {
+                    member: self._data_offset(file, zf.getinfo(member))
+                    for _, member in self.manifest["bcs"]
+                }
+            source = pa.memory_map(self.path, "r")
+            for bc_name, member in self.manifest["bcs"]:
+                buffer = source.read_at(
+                    zf.getinfo(member).file_size, offsets[member]
+                )
+                bcs[bc_name] = _read_parquet(pa.BufferReader(buffer))
+        return bcs
+
+    @staticmethod
+    def _data_offset(file, info: zipfile.ZipInfo) -> int:
+        # Local file header: 30 bytes, then the name and extra field
+        file.seek(info.header_offset)
+        header = file.read(30)
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        return info.header_offset + 30 + name_len + extra_len
+
+    def load_aed_dbase(self) -> List[str]:
+        dbase_dir = self.dbase_dir
+        if dbase_dir is None:
+            dbase_dir = _cache.cache_dir("dbase")
+        paths = []
+        with zipfile.ZipFile(self.path) as zf:
+            for entry in self.manifest["aed_dbase"]:
+                digest_dir = os.path.join(dbase_dir, entry["sha256"])
+                dbase_path = os.path.join(digest_dir, entry["name"])
+                if not os.path.isfile(dbase_path):
+                    os.makedirs(digest_dir, exist_ok=True)
+                    tmp_path = f"{dbase_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "wb") as file:
+                        file.write(zf.read(f"dbase/{entry['sha256']}"))
+                    os.replace(tmp_path, dbase_path)
+                paths.append(dbase_path)
+        return paths
+
+
+def read_sim_file(
+    path: str,
+    memory_map: bool = False,
+    dbase_dir: Union[str, None] = None,
+) -> Any:
+    """Open a v2 `.glmpy` file.
+
+    The simulation is created without calling its `__init__`, as with
+    pickle. Its `nml`, `bcs` and `aed_dbase` are read from the file on
+    first access.
+
+    Parameters
+    ----------
+    path : str
+        Path of the `.glmpy` file.
+    memory_map : bool
+        Memory-map BC Parquet files. Default is False.
+    dbase_dir : Union[str, None]
+        Directory to extract AED database files to. See `SimFile`.
+
+    Returns
+    -------
+    Sim
+        The simulation, of the class it was saved from.
+    """
+    sim_file = SimFile(path, memory_map=memory_map, dbase_dir=dbase_dir)
+    manifest = sim_file.manifest
+    sim_cls = _import_class(manifest["class"])
+    sim = sim_cls.__new__(sim_cls)
+    sim.__dict__.update(manifest["attrs"])
+    sim.__dict__["_sim_name"] = manifest["sim_name"]
+    sim.__dict__["outputs_dir"] = manifest["outputs_dir"]
+    sim.__dict__["_sim_file"] = sim_file
+    return sim
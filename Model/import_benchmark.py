@@ -0,0 +1,89 @@
+"""Import-time benchmark for glmpy.
+
+Imports each module in a fresh interpreter several times and reports the
+median wall time. Exits with status 1 if any module exceeds its budget, so
+the check can run alongside the model scripts:
+
+    python import_benchmark.py
+    python import_benchmark.py --repeats 10 --scale 1.5
+
+Budgets are in seconds. Most of the cost of `glmpy.sim` is pandas; the
+budgets leave room for that but fail if a git subprocess, netCDF4 or
+matplotlib creep back into import.
+"""
+
+import sys
+import argparse
+import statistics
+import subprocess
+
+BUDGETS = {
+    "glmpy": 0.05,
+    "glmpy.nml.nml": 0.15,
+    "glmpy.nml.glm_nml": 0.15,
+    "glmpy.nml.aed_nml": 0.15,
+    "glmpy.sim": 0.80,
+    "glmpy.plots": 0.80,
+}
+
+# Modules that must not be imported as a side effect of importing glmpy
+FORBIDDEN = ["netCDF4", "matplotlib", "f90nml", "regex", "pyarrow"]
+
+SNIPPET = """
+import sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = set(sys.modules) - before
+forbidden = [m for m in {forbidden!r} if m in loaded]
+print(elapsed, ",".join(forbidden))
+"""
+
+
+def time_import(module: str, repeats: int):
+    times = []
+    forbidden = set()
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", SNIPPET.format(
+                module=module, forbidden=FORBIDDEN
+            )],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        if len(out) > 1:
+            forbidden.update(out[1].split(","))
+    return statistics.median(times), sorted(forbidden)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget, e.g., for slower machines.",
+    )
+    args = parser.parse_args()
+    failed = False
+    print(f"{'module':<22}{'median (s)':>12}{'budget (s)':>12}")
+    for module, budget in BUDGETS.items():
+        budget = budget * args.scale
+        median, forbidden = time_import(module, args.repeats)
+        status = ""
+        if median > budget:
+            status = "  OVER BUDGET"
+            failed = True
+        if forbidden:
+            status += f"  imported {', '.join(forbidden)}"
+            failed = True
+        print(f"{module:<22}{median:>12.3f}{budget:>12.2f}{status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
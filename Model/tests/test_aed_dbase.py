@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from glmpy.nml.aed_dbase import DBaseTable, MacrophyteDataBlock
+
+CASE_STUDIES = os.path.join(os.path.dirname(__file__), "..", "case_studies")
+
+
+def test_add_group_without_like_rejects_nan_int_trait():
+    phyto = DBaseTable.from_csv(
+        os.path.join(CASE_STUDIES, "aed_phyto_pars.csv")
+    )
+    phyto.to_block()
+    new = phyto.add_group("new")
+    with pytest.raises(ValueError, match="ft_method.*'new'"):
+        new.to_block()
+
+
+def test_macrophyte_csv():
+    path = os.path.join(CASE_STUDIES, "aed_macrophyte_pars.csv")
+    with pytest.raises(ValueError, match="MacrophyteDataBlock"):
+        DBaseTable.from_csv(path)
+    macrophytes = DBaseTable.from_csv(path, block_type=MacrophyteDataBlock)
+    assert macrophytes.names == ["submerged", "emergent", "riparian"]
+    assert macrophytes.get("r_growth").tolist() == [3.3, 0.4, 0.3]
+    assert macrophytes.to_csv_text().startswith("'m_name','submerged'")
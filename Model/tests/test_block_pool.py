@@ -0,0 +1,25 @@
+import copy
+
+from glmpy.example_sims import SparklingSim
+from glmpy.nml.nml import BlockPool
+
+
+def test_shared_list_cannot_be_modified_in_place():
+    nml = SparklingSim().nml["glm"]
+    pool = BlockPool()
+    pool.intern_nml(nml)
+    a = copy.deepcopy(nml)
+    b = copy.deepcopy(nml)
+    shared = nml.blocks["morphometry"]
+    assert a.blocks["morphometry"] is shared
+    original = list(shared.params["A"].value)
+    areas = a.blocks["morphometry"].params["A"].value
+    areas[0] = 99.0
+    assert b.blocks["morphometry"].params["A"].value == original
+    assert shared.params["A"].value == original
+    shared.validate()
+
+    block = a.blocks.unshare("morphometry")
+    block.params["A"].value[0] = 99.0
+    assert block.params["A"].value[0] == 99.0
+    assert shared.params["A"].value == original
@@ -0,0 +1,68 @@
+import numpy as np
+
+from glmpy import dimensions
+
+
+def test_pyramid_morphometry_matches_class():
+    side_slopes = np.linspace(0.35, 1.0, 5)
+    elevations = np.array([-3.0, 0.0, 2.0, 6.0, 10.0])
+    heights, areas, volumes = dimensions.pyramid_morphometry(
+        height=6,
+        surface_length=40,
+        surface_width=50,
+        num_vals=7,
+        side_slope=side_slopes,
+        surface_elevation=elevations,
+    )
+    assert heights.shape == areas.shape == volumes.shape == (5, 7)
+    for i, (side_slope, elevation) in enumerate(zip(side_slopes, elevations)):
+        pyramid = dimensions.InvertedTruncatedPyramid(
+            height=6,
+            surface_length=40,
+            surface_width=50,
+            num_vals=7,
+            side_slope=side_slope,
+            surface_elevation=elevation,
+        )
+        np.testing.assert_allclose(heights[i], pyramid.get_heights())
+        np.testing.assert_allclose(
+            areas[i], pyramid.get_surface_areas(), rtol=1e-12
+        )
+        np.testing.assert_allclose(
+            volumes[i], pyramid.get_volumes(), rtol=1e-12
+        )
+
+
+def test_cone_morphometry_matches_class():
+    radii = np.array([15.0, 20.0, 30.0])
+    heights, areas, volumes = dimensions.cone_morphometry(
+        height=3, surface_radius=radii, num_vals=5, side_slope=1/3
+    )
+    for i, radius in enumerate(radii):
+        cone = dimensions.InvertedTruncatedCone(
+            surface_radius=radius,
+            height=3,
+            side_slope=1/3,
+            num_vals=5,
+            surface_elevation=0,
+        )
+        np.testing.assert_allclose(heights[i], cone.get_heights())
+        np.testing.assert_allclose(
+            areas[i], cone.get_surface_areas(), rtol=1e-12
+        )
+        np.testing.assert_allclose(volumes[i], cone.get_volumes(), rtol=1e-12)
+
+
+def test_morphometry_blocks_validate():
+    heights, areas, _ = dimensions.pyramid_morphometry(
+        height=6,
+        surface_length=40,
+        surface_width=40,
+        num_vals=7,
+        side_slope=[1/3, 1/2],
+        surface_elevation=6,
+    )
+    blocks = dimensions.morphometry_blocks(heights, areas)
+    assert len(blocks) == 2
+    for block in blocks:
+        block.validate()
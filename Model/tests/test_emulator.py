@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from glmpy import emulator
+
+
+def _fitted(num_inputs):
+    x = np.random.default_rng(0).uniform(0.0, 1.0, size=(20, num_inputs))
+    y = x.sum(axis=1)
+    return emulator.GaussianProcessEmulator().fit(x, y)
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        emulator._Emulator()
+
+
+def test_predict_rejects_1d_point_with_several_inputs():
+    gp = _fitted(2)
+    with pytest.raises(ValueError, match="reshape"):
+        gp.predict([0.5, 0.5])
+    assert gp.predict([[0.5, 0.5]]).shape == (1,)
+
+
+def test_predict_accepts_1d_points_with_one_input():
+    gp = _fitted(1)
+    assert gp.predict([0.2, 0.4, 0.6]).shape == (3,)
+
+
+def test_predict_rejects_wrong_number_of_inputs():
+    gp = _fitted(2)
+    with pytest.raises(ValueError, match="2 inputs"):
+        gp.predict([[0.5, 0.5, 0.5]])
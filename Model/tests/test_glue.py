@@ -0,0 +1,74 @@
+import pickle
+
+import numpy as np
+
+from glmpy.glue import GLUE, GLUEScorer, WeightedQuantileBands
+
+
+class StubSim:
+    """Stand-in for a GLMSim that does not call GLM."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def run(self, write_log, quiet, time_sim, glm_path):
+        pass
+
+    def get_sim_dir(self):
+        return f"/nonexistent/glue_{self.value}"
+
+    def rm_sim_dir(self):
+        pass
+
+
+class StubSampler:
+    def latin_hypercube(self, num_samples, seed=None):
+        return np.linspace(0.0, 1.0, num_samples)[:, None]
+
+    def get_sims(self, design, sim_name_prefix=None):
+        return (StubSim(row[0]) for row in design)
+
+
+def likelihood(glm_sim):
+    return glm_sim.value
+
+
+def output(glm_sim):
+    return np.full(3, glm_sim.value)
+
+
+def test_scorer_does_not_pickle_glue():
+    bands = WeightedQuantileBands(num_times=100_000, lower=0.0, upper=1.0)
+    glue = GLUE(StubSampler(), likelihood, bands, output=output)
+    scorer = glue.scorer()
+    assert isinstance(scorer, GLUEScorer)
+    assert len(pickle.dumps(scorer)) < 1000
+    assert scorer(StubSim(0.5))[0] == 0.5
+
+
+def test_run_scores_members():
+    bands = WeightedQuantileBands(num_times=3, lower=0.0, upper=1.0)
+    glue = GLUE(
+        StubSampler(), likelihood, bands, output=output, threshold=0.5
+    )
+    results = glue.run(num_samples=5, cpu_count=1)
+    np.testing.assert_allclose(
+        results["likelihoods"], [0.0, 0.25, 0.5, 0.75, 1.0]
+    )
+    np.testing.assert_array_equal(results["behavioural"], [2, 3, 4])
+    np.testing.assert_allclose(
+        results["weights"], np.array([0.5, 0.75, 1.0]) / 2.25
+    )
+    assert results["bands"].shape == (3, 3)
+
+
+def test_second_run_replaces_bands():
+    bands = WeightedQuantileBands(num_times=3, lower=0.0, upper=1.0)
+    glue = GLUE(
+        StubSampler(), likelihood, bands, output=output, threshold=0.5
+    )
+    first = glue.run(num_samples=5, cpu_count=1)
+    second = glue.run(num_samples=5, cpu_count=1)
+    assert bands.num_members == 3
+    np.testing.assert_allclose(bands.total_weight, 2.25)
+    np.testing.assert_allclose(second["bands"], first["bands"])
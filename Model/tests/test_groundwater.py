@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from glmpy.groundwater import (
+    DarcyFlows, GroundwaterBCBuilder, read_darcy_params, read_workbook
+)
+
+CATCHMENT = os.path.join(
+    os.path.dirname(__file__), "..", "richmond", "bcs", "catchment"
+)
+
+TIMES = pd.date_range("2001-01-01", periods=4, freq="D")
+
+
+def gw_columns():
+    # time is deliberately not the first column
+    return pd.DataFrame({
+        "temp": [20.0, 21.0, 22.0, 23.0],
+        "time": TIMES,
+        "flow": [0.1, 0.2, 0.3, 0.4],
+        "salt": [1.0, 1.1, 1.2, 1.3],
+    })
+
+
+def test_split_selects_columns_by_name():
+    darcy = DarcyFlows(hydraulic_conductivity=86400.0, area=1.0, length=1.0)
+    builder = GroundwaterBCBuilder(darcy, gw_columns())
+    level = np.array([0.0, 0.5, 1.5, 2.0])
+    bcs = builder.get_bcs(head=1.0, level=level)
+    gw_inflow = bcs["gw_inflow"]
+    assert list(gw_inflow.columns) == ["time", "flow", "temp", "salt"]
+    np.testing.assert_allclose(gw_inflow["flow"], [1.0, 0.5, 0.0, 0.0])
+    np.testing.assert_allclose(gw_inflow["temp"], [20.0, 21.0, 22.0, 23.0])
+    assert list(bcs["gw_outflow"].columns) == ["time", "flow"]
+    np.testing.assert_allclose(bcs["gw_outflow"]["flow"], [0.0, 0.0, 0.5, 1.0])
+
+
+def test_through_copies_inflow(tmp_path):
+    darcy = DarcyFlows(hydraulic_conductivity=50.0, area=4620.0, length=1000.0)
+    builder = GroundwaterBCBuilder(darcy, gw_columns(), outflow="through")
+    builder.write_bcs(str(tmp_path))
+    gw_inflow = pd.read_csv(tmp_path / "gw_inflow.csv")
+    gw_outflow = pd.read_csv(tmp_path / "gw_outflow.csv")
+    assert list(gw_inflow.columns) == ["time", "flow", "temp", "salt"]
+    pd.testing.assert_frame_equal(gw_inflow, gw_outflow)
+    np.testing.assert_allclose(gw_inflow["flow"], [0.1, 0.2, 0.3, 0.4])
+
+
+def test_head_and_level_given_together():
+    darcy = DarcyFlows(hydraulic_conductivity=50.0, area=4620.0, length=1000.0)
+    builder = GroundwaterBCBuilder(darcy, gw_columns())
+    with pytest.raises(ValueError, match="Both head and level"):
+        builder.get_gw_flows(head=1.0)
+    with pytest.raises(ValueError, match="outflow"):
+        GroundwaterBCBuilder(darcy, gw_columns(), outflow="net")
+
+
+@pytest.fixture
+def cache_root(tmp_path):
+    pytest.importorskip("openpyxl")
+    pytest.importorskip("pyarrow")
+    return str(tmp_path / "cache")
+
+
+def test_read_darcy_params(cache_root):
+    params = read_darcy_params(
+        os.path.join(CATCHMENT, "darcy.xlsx"), cache_root=cache_root
+    )
+    assert params["hydraulic_conductivity"] == 50.0
+    assert params["length"] == 1000.0
+    assert params["area"] == 4620.0
+    flows = DarcyFlows.from_workbook(
+        os.path.join(CATCHMENT, "darcy.xlsx"), cache_root=cache_root
+    ).get_flows(params["head_difference"], 0.0)
+    np.testing.assert_allclose(flows, 50.0 * 4620.0 * 0.3 / 1000.0 / 86400.0)
+
+
+def test_read_workbook_is_cached(cache_root):
+    path = os.path.join(CATCHMENT, "groundwater.xlsx")
+    sheet = read_workbook(path, "glm inflow", cache_root=cache_root)
+    cached = [
+        os.path.join(root, name)
+        for root, _, names in os.walk(cache_root) for name in names
+    ]
+    assert len(cached) == 1 and cached[0].endswith("glm inflow.0.parquet")
+    pd.testing.assert_frame_equal(
+        read_workbook(path, "glm inflow", cache_root=cache_root), sheet
+    )
+
+
+def test_through_reproduces_existing_bcs(cache_root, tmp_path):
+    builder = GroundwaterBCBuilder.from_workbooks(
+        groundwater_path=os.path.join(CATCHMENT, "groundwater.xlsx"),
+        darcy_path=os.path.join(CATCHMENT, "darcy.xlsx"),
+        cache_root=cache_root,
+        outflow="through",
+    )
+    out_dir = tmp_path / "bcs"
+    builder.write_bcs(str(out_dir))
+    for name in ("gw_inflow", "gw_outflow"):
+        new = pd.read_csv(out_dir / f"{name}.csv")
+        old = pd.read_csv(os.path.join(CATCHMENT, f"{name}.csv"))
+        assert list(new.columns) == list(old.columns)
+        assert new["time"].equals(old["time"])
+        # The existing CSVs were exported from Excel with rounded values
+        np.testing.assert_allclose(
+            new.iloc[:, 1:].to_numpy(), old.iloc[:, 1:].to_numpy(),
+            rtol=0.0, atol=5e-3,
+        )
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from glmpy.inflows import CatchmentRunoffInflows, MultiCatchmentRunoffInflows
+
+MET_DATA = pd.DataFrame({
+    "Date": pd.date_range(start="2000-01-01", periods=10, freq="24h"),
+    "Rain": np.linspace(0.0, 0.02, 10),
+})
+
+
+def test_multi_matches_single_catchments():
+    areas = [1000.0, 5000.0]
+    coefs = np.array([[0.5, 0.1], [0.2, 0.3]])
+    multi = MultiCatchmentRunoffInflows(
+        met_data=MET_DATA,
+        precip_col="Rain",
+        date_time_col="Date",
+        catchment_names=["urban_inflow", "rural_inflow"],
+        catchment_areas=areas,
+        runoff_coefs=coefs,
+        columns={"temp": 18.0},
+    )
+    assert not isinstance(multi, CatchmentRunoffInflows)
+    flows = multi.get_flows()
+    assert flows.shape == (2, 2, 10)
+    for scenario, bcs in enumerate(multi.iter_scenario_inflows()):
+        for i, name in enumerate(["urban_inflow", "rural_inflow"]):
+            single = CatchmentRunoffInflows(
+                met_data=MET_DATA,
+                precip_col="Rain",
+                date_time_col="Date",
+                catchment_area=areas[i],
+                runoff_coef=float(coefs[scenario, i]),
+            ).get_inflows()
+            np.testing.assert_array_equal(
+                flows[scenario, i], single["flow"].to_numpy()
+            )
+            np.testing.assert_array_equal(
+                bcs[name]["flow"].to_numpy(), single["flow"].to_numpy()
+            )
+            assert list(bcs[name].columns) == ["time", "flow", "temp"]
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from glmpy.metrics import ObservationSet
+
+
+def test_time_index_not_stale_after_in_place_edit():
+    obs = ObservationSet(pd.DataFrame({
+        "DateTime": pd.to_datetime(["2020-01-02", "2020-01-04"]),
+        "Reading": [1.0, 2.0],
+    }), tolerance="1h")
+    model_times = np.arange(
+        "2020-01-01", "2020-01-06", dtype="datetime64[D]"
+    ).astype("datetime64[ns]")
+    values = np.arange(5.0)
+    matched, _ = obs.match(model_times, values)
+    np.testing.assert_array_equal(matched, [1.0, 3.0])
+
+    model_times += np.timedelta64(1, "D")
+    matched, _ = obs.match(model_times, values)
+    np.testing.assert_array_equal(matched, [0.0, 2.0])
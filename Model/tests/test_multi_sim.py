@@ -0,0 +1,37 @@
+from glmpy.sim import MultiSim
+
+
+class StubSim:
+    """Stand-in for a GLMSim that does not call GLM."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def run(self, write_log, quiet, time_sim, glm_path):
+        self.value *= 2
+
+    def rm_sim_dir(self):
+        pass
+
+
+def sim_value(glm_sim):
+    return glm_sim.value
+
+
+def test_run_iter_over_generator():
+    multi_sim = MultiSim(StubSim(i) for i in range(10))
+    results = dict(
+        multi_sim.run_iter(
+            on_sim_end=sim_value, cpu_count=1, max_pending=3, time_sim=False
+        )
+    )
+    assert results == {i: 2 * i for i in range(10)}
+
+
+def test_run_over_list():
+    multi_sim = MultiSim([StubSim(i) for i in range(4)])
+    rvs = multi_sim.run(
+        on_sim_end=sim_value, cpu_count=1, time_sim=False,
+        time_multi_sim=False,
+    )
+    assert rvs == [0, 2, 4, 6]
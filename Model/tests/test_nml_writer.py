@@ -0,0 +1,54 @@
+import io
+import os
+
+import f90nml
+import pytest
+
+from glmpy.example_sims import SparklingSim
+from glmpy.nml.aed_nml import AEDNML
+from glmpy.nml.nml import NMLReader, NMLWriter
+
+MODEL = os.path.join(os.path.dirname(__file__), "..")
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+
+def golden(name):
+    # Written by the f90nml-based NMLWriter that the native writer replaced
+    with open(os.path.join(DATA, name)) as file:
+        return file.read()
+
+
+@pytest.mark.parametrize(
+    "nml_file, golden_name",
+    [
+        ("richmond/glm3.nml", "richmond_glm3.nml"),
+        ("richmond/aed.nml", "richmond_aed.nml"),
+    ],
+)
+def test_nml_file_matches_golden(nml_file, golden_name):
+    nml_dict = NMLReader(os.path.join(MODEL, nml_file)).to_dict()
+    assert NMLWriter(nml_dict).to_string() == golden(golden_name)
+
+
+def test_glm_nml_matches_golden(tmp_path):
+    nml_file = str(tmp_path / "glm3.nml")
+    SparklingSim().nml["glm"].write_nml(nml_file)
+    with open(nml_file) as file:
+        assert file.read() == golden("sparkling_glm3.nml")
+
+
+def test_aed_nml_matches_golden(tmp_path):
+    nml = NMLReader(
+        os.path.join(MODEL, "case_studies", "aed_case7.json")
+    ).to_nml_obj(AEDNML)
+    nml_file = str(tmp_path / "aed.nml")
+    nml.write_nml(nml_file)
+    with open(nml_file) as file:
+        assert file.read() == golden("aed_case7.nml")
+
+
+def test_nested_lists_fall_back_to_f90nml():
+    nml_dict = {"blk": {"a": [[1, 2], [3, 4]], "b": 1}}
+    stream = io.StringIO()
+    f90nml.Namelist(nml_dict)._writestream(stream)
+    assert NMLWriter(nml_dict).to_string() == stream.getvalue()
@@ -0,0 +1,42 @@
+import pytest
+
+from glmpy.example_sims import SparklingSim
+from glmpy.sampling import NMLSampler, SampledParam
+
+
+def test_int_param_rejects_fractional_bounds():
+    with pytest.raises(ValueError, match="whole number"):
+        NMLSampler(SparklingSim(), [
+            SampledParam("glm", "glm_setup", "max_layers", lower=100.5,
+                         upper=200)
+        ])
+
+
+def test_int_param_rejects_log():
+    with pytest.raises(ValueError, match="log sampling"):
+        NMLSampler(SparklingSim(), [
+            SampledParam("glm", "glm_setup", "max_layers", lower=100,
+                         upper=200, log=True)
+        ])
+
+
+def test_int_param_with_whole_bounds():
+    sampler = NMLSampler(SparklingSim(), [
+        SampledParam("glm", "glm_setup", "max_layers", lower=100.0,
+                     upper=200)
+    ])
+    design = sampler.latin_hypercube(8, seed=1)
+    values = [sampler.get_values(row)[0] for row in design]
+    assert all(isinstance(v, int) and 100 <= v <= 200 for v in values)
+
+
+def test_get_sims_validates_blocks():
+    glm_sim = SparklingSim()
+    glm_sim.nml["glm"].blocks["light"].params["light_mode"].value = 1
+    sampler = NMLSampler(glm_sim, [
+        SampledParam("glm", "light", "n_bands", values=[3, 4])
+    ])
+    sims = sampler.get_sims([[4.0], [3.0]])
+    assert next(sims).nml["glm"].blocks["light"].params["n_bands"].value == 4
+    with pytest.raises(ValueError, match="Row 1"):
+        next(sims)
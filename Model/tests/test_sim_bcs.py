@@ -0,0 +1,35 @@
+import os
+
+import pandas as pd
+
+from glmpy.nml.glm_nml import (
+    GLMNML, GLMSetupBlock, InflowBlock, MeteorologyBlock, OutflowBlock
+)
+from glmpy.sim import GLMSim
+
+MET = pd.DataFrame({"Date": ["2020-01-01"], "AirTemp": [20.0]})
+
+
+def make_sim(tmp_path, **blocks):
+    glm_nml = GLMNML(
+        glm_setup=GLMSetupBlock(sim_name="sim"),
+        meteorology=MeteorologyBlock(meteo_fl="bcs/met.csv"),
+        **blocks,
+    )
+    return GLMSim(glm_nml, bcs={"met": MET}, outputs_dir=str(tmp_path))
+
+
+def test_prepare_bcs_without_outlets(tmp_path):
+    glm_sim = make_sim(tmp_path, outflow=OutflowBlock(num_outlet=0))
+    glm_sim.prepare_bcs()
+    assert os.path.isfile(tmp_path / "sim" / "bcs" / "met.csv")
+
+
+def test_prepare_bcs_without_inflows(tmp_path):
+    glm_sim = make_sim(
+        tmp_path,
+        inflow=InflowBlock(num_inflows=0),
+        outflow=OutflowBlock(num_outlet=0),
+    )
+    glm_sim.prepare_bcs()
+    assert os.listdir(tmp_path / "sim" / "bcs") == ["met.csv"]
@@ -0,0 +1,45 @@
+import pickle
+
+import pytest
+
+from glmpy import sim_file
+from glmpy.example_sims import SparklingSim
+from glmpy.sim import GLMSim, SimTemplate
+
+
+def test_to_file_defaults_to_pickle(tmp_path):
+    path = str(tmp_path / "sparkling.glmpy")
+    glm_sim = SparklingSim()
+    glm_sim.to_file(path)
+    assert not sim_file.is_sim_file(path)
+    loaded = GLMSim.from_file(path)
+    assert loaded.nml["glm"].to_dict() == glm_sim.nml["glm"].to_dict()
+
+
+def test_v2_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "sparkling.glmpy")
+    glm_sim = SparklingSim()
+    glm_sim.to_file(path, version=2)
+    assert sim_file.is_sim_file(path)
+    loaded = GLMSim.from_file(path)
+    assert type(loaded) is type(glm_sim)
+    assert loaded.sim_name == glm_sim.sim_name
+    for nml_name in glm_sim.nml:
+        assert (
+            loaded.nml[nml_name].to_dict() == glm_sim.nml[nml_name].to_dict()
+        )
+    assert list(loaded.bcs) == list(glm_sim.bcs)
+    for bc_name, bc in glm_sim.bcs.items():
+        assert loaded.bcs[bc_name].equals(bc)
+
+
+def test_template_sim_rejects_v2(tmp_path):
+    template = SimTemplate(SparklingSim(), [("glm", "light", "Kw")])
+    member = next(template.get_sims([[0.5]], sim_name_prefix="sweep"))
+    with pytest.raises(ValueError, match="TemplateSim"):
+        member.to_file(str(tmp_path / "member.glmpy"), version=2)
+    path = str(tmp_path / "member.glmpy")
+    member.to_file(path)
+    with open(path, "rb") as f:
+        assert pickle.load(f).values == [0.5]